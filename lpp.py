@@ -6,14 +6,19 @@ Main entry point for all LeetPlusPlus operations
 Supports both direct command execution and interactive console mode.
 """
 
+import argparse
 import sys
 import subprocess
+import tempfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent / "tools"))
 
 from common import ColorPrinter, MetadataManager, Fore, Style
-from config import APP_VERSION, EXE_RELEASE_PATH, EXE_DEBUG_PATH
+from config import (
+    APP_VERSION, EXE_RELEASE_PATH, EXE_DEBUG_PATH, BENCH_TIME_MS, BENCH_WARMUP_RUNS, SCALING_CUTOFF_MS,
+    COMPLEXITY_TIME_LIMIT_MS
+)
 from ui_style import UIStyle
 
 
@@ -34,6 +39,10 @@ class CommandHandler:
             'update': self.update_metadata_command,
             'list': self.list_command,
             'run': self.run_command,
+            'test': self.test_command,
+            'bench': self.bench_command,
+            'scale': self.scale_command,
+            'complexity': self.complexity_command,
             'help': self.help_command,
             '--help': self.help_command,
             '-h': self.help_command,
@@ -55,7 +64,7 @@ class CommandHandler:
     def generate_command(self, args):
         """Generate solution file"""
         from generate_solution import main as generate_main
-        return generate_main()
+        return generate_main(args)
     
     def update_metadata_command(self, args):
         """Update problem metadata"""
@@ -101,18 +110,183 @@ class CommandHandler:
         print(UIStyle.footer(footer_msg))
         return 0
     
+    def find_executable(self):
+        """The built LeetPlusPlus binary (Release preferred), or None"""
+        for exe_path in (self.root_dir / EXE_RELEASE_PATH, self.root_dir / EXE_DEBUG_PATH):
+            if exe_path.exists():
+                return exe_path
+        ColorPrinter.error("LeetPlusPlus executable not found. Please build the project first.")
+        return None
+    
     def run_command(self, args):
         """Launch TUI application"""
-        exe_path = self.root_dir / EXE_RELEASE_PATH
-        if not exe_path.exists():
-            exe_path = self.root_dir / EXE_DEBUG_PATH
-        
-        if not exe_path.exists():
-            ColorPrinter.error("LeetPlusPlus executable not found. Please build the project first.")
+        exe_path = self.find_executable()
+        if not exe_path:
             return 1
         
         return subprocess.call([str(exe_path)], cwd=self.root_dir)
     
+    def test_command(self, args):
+        """Run tests without the TUI and summarize the binary's JSON records"""
+        parser = argparse.ArgumentParser(prog='lpp test')
+        parser.add_argument('problems', nargs='*', type=int, help="Problem numbers (default: every problem)")
+        parser.add_argument('--filter', help="Only problems whose name contains this text")
+        parser.add_argument('--json', action='store_true', help="Print the JSON records unchanged")
+        parser.add_argument('--jobs', type=int, default=0, help="Problems run at once (default: one per core)")
+        options = parser.parse_args(args)
+        
+        exe_path = self.find_executable()
+        if not exe_path:
+            return 1
+        
+        command = [str(exe_path), '--format', 'json', '--jobs', str(options.jobs)]
+        for number in options.problems:
+            command += ['--run', str(number)]
+        if not options.problems:
+            command.append('--run-all')
+        if options.filter:
+            command += ['--filter', options.filter]
+        if options.json:
+            return subprocess.call(command, cwd=self.root_dir)
+        
+        from test_results import print_results, read_results
+        process = subprocess.run(command, cwd=self.root_dir, capture_output=True, text=True)
+        if process.returncode not in (0, 1):
+            ColorPrinter.error(process.stderr.strip() or f"Test run failed with exit code {process.returncode}")
+            return process.returncode
+        try:
+            results = read_results(process.stdout.splitlines())
+        except ValueError as e:
+            ColorPrinter.error(str(e))
+            return 1
+        print_results(results)
+        return process.returncode
+    
+    def bench_command(self, args):
+        """Time every ASSERT_EQ of one problem (or all of them) in the built binary"""
+        parser = argparse.ArgumentParser(prog='lpp bench')
+        parser.add_argument('problem', nargs='?', help="Problem number (omit with --all)")
+        parser.add_argument('--all', action='store_true', help="Benchmark every registered problem")
+        parser.add_argument('--time', type=float, default=BENCH_TIME_MS, help="Sampling budget per call in ms")
+        parser.add_argument('--warmup', type=int, default=BENCH_WARMUP_RUNS, help="Untimed calls before sampling")
+        options = parser.parse_args(args)
+        if not options.all and not (options.problem and options.problem.isdigit()):
+            parser.error("give a problem number or --all")
+        
+        exe_path = self.find_executable()
+        if not exe_path:
+            return 1
+        
+        target = 'all' if options.all else options.problem
+        return subprocess.call([str(exe_path), '--bench', target, '--bench-time', str(options.time),
+                                '--bench-warmup', str(options.warmup)], cwd=self.root_dir)
+    
+    @staticmethod
+    def add_scaling_arguments(parser):
+        """Options shared by the commands that time a solution on generated inputs"""
+        parser.add_argument('problem', type=int, help="Problem number")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the generated inputs")
+        parser.add_argument('--sizes', help="Comma-separated sizes n (default 100 to 100000)")
+        parser.add_argument('--time', type=float, default=BENCH_TIME_MS, help="Sampling budget per size in ms")
+        parser.add_argument('--warmup', type=int, default=BENCH_WARMUP_RUNS, help="Untimed calls before sampling")
+        parser.add_argument('--cutoff', type=float, default=SCALING_CUTOFF_MS,
+                            help="Skip larger sizes once a call takes this many ms")
+    
+    def write_scaling_inputs(self, options):
+        """Write the stress inputs for options.problem, returning False if there are none"""
+        from stress_inputs import write_problem_scaling_data
+        try:
+            sizes = [int(n) for n in options.sizes.split(',')] if options.sizes else None
+            path, sizes, constrained = write_problem_scaling_data(options.problem, sizes, options.seed)
+        except ValueError as e:
+            ColorPrinter.error(str(e))
+            return False
+        if not sizes:
+            ColorPrinter.error(f"No input sizes fit the constraints of problem {options.problem}")
+            return False
+        if not constrained:
+            ColorPrinter.warning("No constraints recorded for this problem; using default ranges "
+                                 "(fetch it again to record them)")
+        ColorPrinter.info(f"Wrote inputs for n = {', '.join(map(str, sizes))} to {path.name}")
+        return True
+    
+    def run_scaling(self, exe_path, options, extra_args=()):
+        """Run the binary's scaling mode for options.problem"""
+        return subprocess.call([str(exe_path), '--scale', str(options.problem), '--bench-time', str(options.time),
+                                '--bench-warmup', str(options.warmup), '--scale-cutoff', str(options.cutoff),
+                                *extra_args], cwd=self.root_dir)
+    
+    def scale_command(self, args):
+        """Generate stress inputs from a problem's constraints and time it at each size"""
+        parser = argparse.ArgumentParser(prog='lpp scale')
+        self.add_scaling_arguments(parser)
+        parser.add_argument('--no-run', action='store_true', help="Only write the inputs")
+        options = parser.parse_args(args)
+        
+        if not self.write_scaling_inputs(options):
+            return 1
+        if options.no_run:
+            return 0
+        
+        exe_path = self.find_executable()
+        if not exe_path:
+            return 1
+        return self.run_scaling(exe_path, options)
+    
+    def complexity_command(self, args):
+        """Fit a solution's scaling run to a complexity class and project it to the largest input"""
+        from complexity import analyze, format_ns, read_scaling_csv
+        from stress_inputs import StressInputGenerator, load_problem_spec
+        
+        parser = argparse.ArgumentParser(prog='lpp complexity')
+        self.add_scaling_arguments(parser)
+        parser.add_argument('--limit', type=float, default=COMPLEXITY_TIME_LIMIT_MS,
+                            help="Time limit per call in ms at the largest input")
+        options = parser.parse_args(args)
+        
+        if not self.write_scaling_inputs(options):
+            return 1
+        exe_path = self.find_executable()
+        if not exe_path:
+            return 1
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = Path(temp_dir) / 'scaling.csv'
+            code = self.run_scaling(exe_path, options, ['--scale-output', str(csv_path)])
+            if code != 0:
+                return code
+            points = read_scaling_csv(csv_path)
+        
+        sig_data, constraints = load_problem_spec(options.problem)
+        max_n = StressInputGenerator(sig_data, constraints).max_size(cap=None)
+        try:
+            report = analyze(points, max_n, options.limit)
+        except ValueError as e:
+            ColorPrinter.error(f"{e}; raise --cutoff or pass smaller --sizes")
+            return 1
+        
+        print(UIStyle.section_header(f"Complexity of Problem #{options.problem}"))
+        print(f"  {'Model':<12}{'Error':>8}{'Confidence':>12}")
+        for fit in report.fits:
+            marker = "  <- best fit" if fit is report.best else ""
+            print(f"  {fit.model:<12}{fit.error:>8.1%}{fit.confidence:>12.0%}{marker}")
+        print()
+        
+        best = report.best
+        ColorPrinter.info(f"Best fit: {best.model} (confidence {best.confidence:.0%})")
+        if best.error > 0.25:
+            ColorPrinter.warning("The timings are noisy; a longer --time gives a more reliable fit")
+        projection = (f"Projected {format_ns(report.projected_ns)} per call at n = {max_n:,} "
+                      f"(limit {options.limit:g} ms)")
+        if report.exceeds_limit:
+            ColorPrinter.error(f"{projection}: likely Time Limit Exceeded")
+        else:
+            ColorPrinter.success(projection)
+        
+        entry = self.metadata_manager.get_problem_by_id(str(options.problem))
+        if entry:
+            self.metadata_manager.upsert(str(options.problem), {**entry, 'complexity': report.to_metadata()})
+        return 1 if report.exceeds_limit else 0
+    
     def help_command(self, args):
         """Show help information"""
         print_help()
@@ -164,9 +338,14 @@ def print_help():
         ("console, interactive, i", "Launch interactive console mode"),
         ("fetch <number|slug>", "Fetch a problem by number or slug"),
         ("generate <number>", "Generate solution file for existing problem"),
+        ("generate --all|--ids N-M", "Regenerate cached problems in parallel"),
         ("list", "List available problems"),
         ("run", "Launch the TUI application"),
-        ("update", "Update problem metadata from API"),
+        ("test [numbers...]", "Run tests without the TUI (--filter, --json)"),
+        ("bench <number>|--all", "Time each test call (min/median/p95)"),
+        ("scale <number>", "Time a solution on generated inputs, n = 10^2..10^5"),
+        ("complexity <number>", "Fit the scaling run to O(1)..O(2^n) and flag likely TLEs"),
+        ("update [--full]", "Update problem metadata from API"),
         ("help", "Show this help message"),
         ("version", "Show version information")
     ]
@@ -181,7 +360,8 @@ def print_help():
         ("lpp fetch 1", "Fetch problem #1 (Two Sum)"),
         ("lpp fetch two-sum", "Fetch by problem slug"),
         ("lpp list", "List all problems"),
-        ("lpp run", "Launch TUI application")
+        ("lpp run", "Launch TUI application"),
+        ("lpp bench 1 --time 500", "Benchmark problem #1 for 500 ms per call")
     ]
     
     for example, desc in examples:
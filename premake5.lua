@@ -202,6 +202,11 @@ workspace "LeetPlusPlus"
         value = "STRING",
         description = "Comma-separated list of topics"
     }
+    
+    newoption {
+        trigger = "no-pch",
+        description = "Build without the precompiled header (src/pch.h)"
+    }
 
     project "LeetPlusPlus"
         kind "ConsoleApp"
@@ -219,23 +224,55 @@ workspace "LeetPlusPlus"
             "src/**.cpp",
         }
         
-        -- Auto-generate main includes file for all problems
-        local problemFiles = os.matchfiles("src/Problems/*.h")
-        if #problemFiles > 0 then
-            local includesContent = "// Auto-generated includes for all problems\n"
-            includesContent = includesContent .. "#pragma once\n\n"
-            
-            for _, file in ipairs(problemFiles) do
-                local filename = path.getname(file)
-                includesContent = includesContent .. '#include "Problems/' .. filename .. '"\n'
+        -- Auto-generate main includes file for all problem headers, in the same
+        -- format as tools/generate_solution.py. It is only rewritten when its
+        -- content changes, since main.cpp includes it. Problems generated in the
+        -- source layout (LPP_PROBLEM_LAYOUT=source) are .cpp files picked up by
+        -- the src/**.cpp pattern above and compiled as separate translation
+        -- units, registering themselves through REGISTER_SOLUTION, so they are
+        -- left out of it
+        local problemFiles = {}
+        for _, file in ipairs(os.matchfiles("src/Problems/*.h")) do
+            local filename = path.getname(file)
+            if filename:match("^%d+_.*%.h$") then
+                table.insert(problemFiles, filename)
             end
-            
-            io.writefile("src/Problems/AllProblems.h", includesContent)
         end
+        table.sort(problemFiles, function(a, b)
+            local numberA, numberB = tonumber(a:match("^(%d+)_")), tonumber(b:match("^(%d+)_"))
+            if numberA ~= numberB then
+                return numberA < numberB
+            end
+            return a < b
+        end)
+        -- Written even when empty, so headers converted to sources drop out
+        local includesContent = "#pragma once\n\n"
+        includesContent = includesContent .. "// This file is automatically generated by LeetPlusPlus\n"
+        includesContent = includesContent .. "// It includes all problem solution headers\n\n"
+        
+        for _, filename in ipairs(problemFiles) do
+            includesContent = includesContent .. '#include "' .. filename .. '"\n'
+        end
+        
+        os.writefile_ifnotequal(includesContent, "src/Problems/AllProblems.h")
 
         includedirs { "%{wks.location}/src", "%{wks.location}/vendor" }
         
         defines { "USE_TUI" }
+        
+        -- src/pch.h is maintained by tools/generate_solution.py and holds every
+        -- library and framework header the problems include, so they are parsed
+        -- once instead of once per translation unit. gmake passes it to every
+        -- file with -include; MSVC builds it from pch.cpp and needs /FI for the
+        -- sources that don't include it themselves
+        if os.isfile("src/pch.h") and not _OPTIONS["no-pch"] then
+            pchheader "pch.h"
+            pchsource "src/pch.cpp"
+            
+            filter "action:vs*"
+                forceincludes { "pch.h" }
+            filter {}
+        end
 
         filter "configurations:Debug"
             runtime "Debug"
@@ -0,0 +1,322 @@
+#pragma once
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <tuple>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+struct BenchmarkSettings
+{
+    bool enabled = false;
+    int warmupRuns = 3;          // Untimed calls before sampling starts
+    double budgetMs = 100.0;     // Time spent sampling each call site
+    int minSamples = 10;         // Samples taken even if the budget runs out first
+    int64_t minSampleNs = 1000;  // Calls are batched until a sample takes at least this long
+    double scalingCutoffMs = 2000.0;  // A scaling run skips larger sizes once a call takes this long
+    size_t batchBytes = size_t(4) << 20;  // Prepared inputs a batch may hold at once (see Footprint)
+};
+
+// The bytes a value takes up, counting what its containers own, so a batch
+// of prepared inputs can be kept to BenchmarkSettings::batchBytes
+template<typename T>
+struct Footprint
+{
+    static size_t Of(const T&) { return sizeof(T); }
+};
+
+template<typename T>
+struct Footprint<std::vector<T>>
+{
+    static size_t Of(const std::vector<T>& value)
+    {
+        size_t bytes = sizeof(value) + (value.capacity() - value.size()) * sizeof(T);
+        for (const T& element : value)
+        {
+            bytes += Footprint<T>::Of(element);
+        }
+        return bytes;
+    }
+};
+
+template<>
+struct Footprint<std::string>
+{
+    static size_t Of(const std::string& value) { return sizeof(value) + value.capacity(); }
+};
+
+template<typename... Ts>
+struct Footprint<std::tuple<Ts...>>
+{
+    static size_t Of(const std::tuple<Ts...>& value)
+    {
+        return std::apply([](const auto&... parts) { return (sizeof(value) + ... + Footprint<Ts>::Of(parts)); },
+                          value);
+    }
+};
+
+struct BenchmarkResult
+{
+    std::string expression;
+    int line = 0;
+    uint64_t calls = 0;
+    double minNs = 0.0;
+    double medianNs = 0.0;
+    double p95Ns = 0.0;
+};
+
+// Times repeated calls of an expression with std::chrono::steady_clock.
+// Fast calls are run in batches so the clock's resolution doesn't dominate,
+// and each sample is the batch time divided by the batch size.
+class Benchmark
+{
+public:
+    using Clock = std::chrono::steady_clock;
+
+    static BenchmarkSettings& Settings()
+    {
+        static BenchmarkSettings settings;
+        return settings;
+    }
+
+    static bool Enabled() { return Settings().enabled; }
+
+    // Keeps the compiler from discarding a result nobody reads
+    template<typename T>
+    static void DoNotOptimize(const T& value)
+    {
+#if defined(__GNUC__) || defined(__clang__)
+        asm volatile("" : : "g"(&value) : "memory");
+#else
+        static_cast<void>(*reinterpret_cast<const volatile char*>(&value));
+#endif
+    }
+
+    // Calls the result of a call (or the call itself, if it returns nothing) can't be optimized away
+    template<typename Call>
+    static void Invoke(Call& call)
+    {
+        if constexpr (std::is_void_v<decltype(call())>)
+        {
+            call();
+        }
+        else
+        {
+            DoNotOptimize(call());
+        }
+    }
+
+    template<typename Call>
+    static BenchmarkResult Measure(Call&& call, const std::string& expr, int line)
+    {
+        return Sample([&](uint64_t batch) { return RunBatch(call, batch); }, expr, line, Settings().minSamples);
+    }
+
+    // Times run(input) on a fresh prepare() for every call, so solutions that
+    // change their arguments in place never see their own output. Preparing
+    // the inputs isn't timed. A batch's inputs all exist at once, so large
+    // inputs get smaller batches: at most batchBytes of them.
+    template<typename Prepare, typename Run>
+    static BenchmarkResult Measure(Prepare&& prepare, Run&& run, const std::string& expr, int line,
+                                   int minSamples)
+    {
+        const size_t inputBytes = Footprint<decltype(prepare())>::Of(prepare());
+        const uint64_t maxBatch = std::max<uint64_t>(1, Settings().batchBytes / std::max<size_t>(inputBytes, 1));
+        auto timeBatch = [&](uint64_t batch)
+        {
+            std::vector<decltype(prepare())> inputs;
+            inputs.reserve(batch);
+            for (uint64_t i = 0; i < batch; ++i)
+            {
+                inputs.push_back(prepare());
+            }
+            const auto start = Clock::now();
+            for (auto& input : inputs)
+            {
+                auto call = [&]() { return run(input); };
+                Invoke(call);
+            }
+            return ElapsedNs(start);
+        };
+        return Sample(timeBatch, expr, line, minSamples, maxBatch);
+    }
+
+    // Warms up, picks a batch size (up to maxBatch) and collects per-call
+    // samples from timeBatch(batch), which returns the nanoseconds a batch of
+    // calls took
+    template<typename TimeBatch>
+    static BenchmarkResult Sample(TimeBatch&& timeBatch, const std::string& expr, int line, int minSamples,
+                                  uint64_t maxBatch = uint64_t(1) << 20)
+    {
+        const BenchmarkSettings& settings = Settings();
+
+        const uint64_t warmupRuns = static_cast<uint64_t>(std::max(settings.warmupRuns, 0));
+        for (uint64_t done = 0; done < warmupRuns; done += maxBatch)
+        {
+            timeBatch(std::min(warmupRuns - done, maxBatch));
+        }
+
+        uint64_t batch = 1;
+        while (batch < maxBatch && timeBatch(batch) < settings.minSampleNs)
+        {
+            batch = std::min(batch * 2, maxBatch);
+        }
+
+        std::vector<double> samples;
+        const int64_t budgetNs = static_cast<int64_t>(settings.budgetMs * 1e6);
+        const auto start = Clock::now();
+        do
+        {
+            samples.push_back(static_cast<double>(timeBatch(batch)) / batch);
+        }
+        while (static_cast<int>(samples.size()) < minSamples || ElapsedNs(start) < budgetNs);
+
+        std::sort(samples.begin(), samples.end());
+        BenchmarkResult result;
+        result.expression = expr;
+        result.line = line;
+        result.calls = samples.size() * batch;
+        result.minNs = samples.front();
+        result.medianNs = Percentile(samples, 0.5);
+        result.p95Ns = Percentile(samples, 0.95);
+        return result;
+    }
+
+    // Linear interpolation between the closest ranks of a sorted sample
+    static double Percentile(const std::vector<double>& sorted, double fraction)
+    {
+        if (sorted.empty()) return 0.0;
+        double rank = fraction * (sorted.size() - 1);
+        size_t below = static_cast<size_t>(rank);
+        size_t above = std::min(below + 1, sorted.size() - 1);
+        return sorted[below] + (sorted[above] - sorted[below]) * (rank - below);
+    }
+
+    static int64_t ElapsedNs(Clock::time_point start)
+    {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - start).count();
+    }
+
+    static std::string FormatNs(double ns)
+    {
+        std::ostringstream out;
+        out << std::fixed << std::setprecision(ns < 10.0 ? 2 : 1);
+        if (ns < 1e3) out << ns << " ns";
+        else if (ns < 1e6) out << ns / 1e3 << " us";
+        else if (ns < 1e9) out << ns / 1e6 << " ms";
+        else out << ns / 1e9 << " s";
+        return out.str();
+    }
+
+    static void PrintTable(const std::vector<BenchmarkResult>& results, std::ostream& out = std::cout)
+    {
+        if (results.empty()) return;
+
+        const BenchmarkSettings& settings = Settings();
+        out << "\nBenchmark (" << settings.warmupRuns << " warmup runs, "
+            << settings.budgetMs << " ms per call site)\n";
+        out << std::left << std::setw(6) << "Line" << std::setw(12) << "Calls"
+            << std::setw(12) << "Min" << std::setw(12) << "Median" << std::setw(12) << "P95"
+            << "Expression\n";
+        for (const auto& result : results)
+        {
+            out << std::left << std::setw(6) << result.line << std::setw(12) << result.calls
+                << std::setw(12) << FormatNs(result.minNs) << std::setw(12) << FormatNs(result.medianNs)
+                << std::setw(12) << FormatNs(result.p95Ns) << result.expression << "\n";
+        }
+    }
+
+private:
+    template<typename Call>
+    static int64_t RunBatch(Call& call, uint64_t batch)
+    {
+        const auto start = Clock::now();
+        for (uint64_t i = 0; i < batch; ++i)
+        {
+            Invoke(call);
+        }
+        return ElapsedNs(start);
+    }
+};
+
+struct ScalingPoint
+{
+    long long n = 0;
+    BenchmarkResult result;
+};
+
+// Collects the time per call of one solution at growing input sizes; the
+// generated ScaleProblemN calls Measure once per size in its data file
+class ScalingRun
+{
+public:
+    explicit ScalingRun(std::ostream& out = std::cout) : m_out(out) {}
+
+    // Each row is printed as soon as it is measured, since large sizes of a
+    // slow solution take a while
+    template<typename Prepare, typename Run>
+    void Measure(long long n, Prepare&& prepare, Run&& run)
+    {
+        if (m_stoppedAt)
+        {
+            m_skipped.push_back(n);
+            return;
+        }
+        if (m_points.empty())
+        {
+            m_out << std::left << std::setw(10) << "n" << std::setw(10) << "Calls" << std::setw(12) << "Min"
+                  << std::setw(12) << "Median" << "P95\n";
+        }
+
+        ScalingPoint point;
+        point.n = n;
+        point.result = Benchmark::Measure(prepare, run, "n = " + std::to_string(n), 0, MinSamples);
+        m_points.push_back(point);
+        m_out << std::left << std::setw(10) << n << std::setw(10) << point.result.calls
+              << std::setw(12) << Benchmark::FormatNs(point.result.minNs)
+              << std::setw(12) << Benchmark::FormatNs(point.result.medianNs)
+              << Benchmark::FormatNs(point.result.p95Ns) << "\n" << std::flush;
+
+        if (point.result.medianNs > Benchmark::Settings().scalingCutoffMs * 1e6)
+        {
+            m_stoppedAt = n;
+        }
+    }
+
+    // Call after the run to report sizes left out by the cutoff
+    void Finish()
+    {
+        if (!m_skipped.empty())
+        {
+            m_out << "Skipped " << m_skipped.size() << " larger sizes: a call at n = " << m_stoppedAt
+                  << " took over " << Benchmark::Settings().scalingCutoffMs << " ms\n";
+        }
+    }
+
+    const std::vector<ScalingPoint>& Points() const { return m_points; }
+
+    // One "n,calls,min_ns,median_ns,p95_ns" row per measured size, read by `lpp complexity`
+    void WriteCsv(std::ostream& out) const
+    {
+        out << "n,calls,min_ns,median_ns,p95_ns\n";
+        for (const auto& point : m_points)
+        {
+            out << point.n << "," << point.result.calls << "," << point.result.minNs << ","
+                << point.result.medianNs << "," << point.result.p95Ns << "\n";
+        }
+    }
+
+private:
+    static constexpr int MinSamples = 3;  // Big sizes of slow solutions would otherwise take minutes
+
+    std::ostream& m_out;
+    std::vector<ScalingPoint> m_points;
+    std::vector<long long> m_skipped;
+    long long m_stoppedAt = 0;
+};
@@ -0,0 +1,112 @@
+#pragma once
+
+#include <iostream>
+#include <string>
+#include <vector>
+
+#include "SolutionRegistry.h"
+#include "TestReport.h"
+
+struct HeadlessOptions
+{
+    std::vector<int> numbers;    // --run N, in the order given
+    bool all = false;            // --run-all
+    std::string filter;          // --filter, applied to --run-all (or to every problem if nothing else is chosen)
+    bool json = false;           // --format json
+    unsigned jobs = 0;           // --jobs, worker threads (0 for one per core)
+};
+
+// Runs problems without the TUI, in parallel, reporting them in the order
+// chosen. The text format prints what the TUI would show; the json format
+// prints JsonReport records instead, so tools don't have to scrape
+// [PASS]/[FAIL] lines. What solutions print to std::cout isn't part of the
+// report: it goes to std::cerr, so stdout holds nothing but the report.
+class HeadlessRunner
+{
+public:
+    // Returns the process exit code: 0 if every chosen problem passed, 1 if
+    // any failed, 2 if a --run number isn't registered
+    static int Run(const HeadlessOptions& options)
+    {
+        auto& registry = SolutionRegistry::GetInstance();
+        std::vector<ProblemInfo> problems;
+        for (int number : options.numbers)
+        {
+            // Exactly this number: Find would also match names containing it
+            const ProblemInfo* problem = registry.FindByNumber(number);
+            if (!problem)
+            {
+                std::cerr << "Problem #" << number << " not found.\n";
+                return 2;
+            }
+            problems.push_back(*problem);
+        }
+        if (options.all || problems.empty())
+        {
+            for (const auto& problem : registry.Find(options.filter))
+            {
+                problems.push_back(problem);
+            }
+        }
+
+        CoutRedirect redirect;
+        std::ostream& out = redirect.Original();
+        std::vector<ProblemReport> reports;
+        const auto start = Benchmark::Clock::now();
+        registry.RunParallel(problems, options.jobs, [&](const ProblemReport& report)
+        {
+            if (options.json)
+            {
+                JsonReport::WriteProblem(report, out);
+            }
+            else
+            {
+                out << report.output << std::flush;
+            }
+            reports.push_back(report);
+        });
+        const int64_t wallNs = Benchmark::ElapsedNs(start);
+
+        if (options.json)
+        {
+            JsonReport::WriteSummary(reports, wallNs, out);
+        }
+        else
+        {
+            PrintSummary(reports, wallNs, out);
+        }
+
+        for (const auto& report : reports)
+        {
+            if (!report.Succeeded()) return 1;
+        }
+        return 0;
+    }
+
+private:
+    static void PrintSummary(const std::vector<ProblemReport>& reports, int64_t wallNs, std::ostream& out)
+    {
+        int passed = 0;
+        int total = 0;
+        std::string failed;
+        for (const auto& report : reports)
+        {
+            passed += report.passed;
+            total += report.total;
+            if (!report.Succeeded())
+            {
+                failed += " #" + std::to_string(report.number);
+            }
+        }
+        out << "\nRan " << reports.size() << " problems in " << Benchmark::FormatNs(static_cast<double>(wallNs))
+            << ": passed " << passed << "/" << total << " tests";
+        if (failed.empty())
+        {
+            out << "\n";
+        }
+        else
+        {
+            out << " - failed:" << failed << "\n";
+        }
+    }
+};
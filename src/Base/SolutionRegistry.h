@@ -1,11 +1,22 @@
 #pragma once
 
 #include <algorithm>
+#include <atomic>
+#include <cctype>
 #include <functional>
+#include <future>
+#include <iomanip>
 #include <iostream>
+#include <map>
+#include <sstream>
+#include <stdexcept>
 #include <string>
+#include <thread>
 #include <vector>
 
+#include "Benchmark.h"
+#include "TestReport.h"
+
 enum class Difficulty
 {
     Easy,
@@ -22,6 +33,31 @@ struct ProblemInfo
     std::function<void()> testFunction;
 };
 
+// Points std::cout at another buffer (std::cerr's by default) until the scope
+// ends. std::cout is shared by every thread, so while problems run in
+// parallel whatever solutions print to it goes there instead of into the
+// middle of the reports, which are written to Original(): the real stdout.
+class CoutRedirect
+{
+public:
+    explicit CoutRedirect(std::streambuf* target = std::cerr.rdbuf())
+        : m_original(std::cout.rdbuf(target)), m_out(m_original) {}
+    ~CoutRedirect()
+    {
+        m_out.flush();
+        std::cout.rdbuf(m_original);
+    }
+    
+    CoutRedirect(const CoutRedirect&) = delete;
+    CoutRedirect& operator=(const CoutRedirect&) = delete;
+    
+    std::ostream& Original() { return m_out; }
+
+private:
+    std::streambuf* m_original;
+    std::ostream m_out;
+};
+
 class SolutionRegistry
 {
 public:
@@ -39,16 +75,161 @@ public:
         m_problems.push_back({number, name, name, difficulty, testFunc});  // Use name as title for now
     }
     
-    void RunAll()
+    void RegisterScaling(int number, std::function<void(ScalingRun&)> scaleFunc)
     {
-        std::cout << "\nRunning all solutions...\n";
-        for (const auto& problem : GetSortedProblems())
+        m_scaling[number] = scaleFunc;
+    }
+    
+    bool HasScaling(int number) const { return m_scaling.count(number) > 0; }
+    
+    // Times problem `number` at every input size in its scaling data file
+    // (written by `lpp scale`), returning false if it couldn't run
+    bool RunScaling(int number, ScalingRun& run)
+    {
+        auto scaling = m_scaling.find(number);
+        if (scaling == m_scaling.end())
+        {
+            std::cout << "Problem #" << number << " has no scaling run. Regenerate it to add ScaleProblem"
+                      << number << ".\n";
+            return false;
+        }
+        
+        for (const auto& problem : m_problems)
+        {
+            if (problem.number == number)
+            {
+                std::cout << "\nScaling Problem #" << number << ": " << problem.name << "\n\n";
+            }
+        }
+        try
         {
-            ExecuteProblem(problem);
-            std::cout << "\n";
+            scaling->second(run);
+        }
+        catch (const std::exception& e)
+        {
+            std::cout << "Scaling run failed: " << e.what() << "\n";
+            std::cout << "Run 'lpp scale " << number << "' to generate its inputs.\n";
+            return false;
+        }
+        run.Finish();
+        return true;
+    }
+    
+    // Runs every problem on up to `jobs` threads (0 for one per core) and
+    // prints each one's output whole, in number order. Benchmarks run on one
+    // thread so problems don't compete for cores while being timed. What
+    // solutions print to std::cout goes to std::cerr (see CoutRedirect).
+    void RunAll(unsigned jobs = 0)
+    {
+        CoutRedirect redirect;
+        std::ostream& out = redirect.Original();
+        out << "\nRunning all solutions...\n";
+        std::vector<ProblemReport> reports;
+        RunParallel(GetSortedProblems(), Benchmark::Enabled() ? 1 : jobs, [&](const ProblemReport& report)
+        {
+            out << report.output << "\n" << std::flush;
+            reports.push_back(report);
+        });
+        
+        if (Benchmark::Enabled())
+        {
+            out << "\nBenchmark Summary\n";
+            out << std::left << std::setw(8) << "Problem" << std::setw(14) << "Test time" << "Name\n";
+            for (const auto& report : reports)
+            {
+                out << std::left << std::setw(8) << ("#" + std::to_string(report.number))
+                    << std::setw(14) << Benchmark::FormatNs(static_cast<double>(report.durationNs))
+                    << report.name << "\n";
+            }
         }
     }
     
+    // Runs the problems on a pool of `jobs` worker threads (0 for one per
+    // core), each problem with its own TestContext, and hands the reports to
+    // onReport on the calling thread in the order the problems were given
+    void RunParallel(const std::vector<ProblemInfo>& problems, unsigned jobs,
+                     const std::function<void(const ProblemReport&)>& onReport)
+    {
+        if (jobs == 0)
+        {
+            jobs = std::max(1u, std::thread::hardware_concurrency());
+        }
+        jobs = static_cast<unsigned>(std::min<size_t>(jobs, problems.size()));
+        if (jobs <= 1)
+        {
+            for (const auto& problem : problems)
+            {
+                onReport(RunProblem(problem));
+            }
+            return;
+        }
+        
+        std::vector<std::promise<ProblemReport>> results(problems.size());
+        std::vector<std::future<ProblemReport>> pending;
+        for (auto& result : results)
+        {
+            pending.push_back(result.get_future());
+        }
+        
+        std::atomic<size_t> next{0};
+        std::vector<std::thread> workers;
+        for (unsigned i = 0; i < jobs; ++i)
+        {
+            workers.emplace_back([&]()
+            {
+                for (size_t index = next++; index < problems.size(); index = next++)
+                {
+                    results[index].set_value(RunProblem(problems[index]));
+                }
+            });
+        }
+        for (auto& report : pending)
+        {
+            onReport(report.get());
+        }
+        for (auto& worker : workers)
+        {
+            worker.join();
+        }
+    }
+    
+    // Runs TestProblemN in a fresh TestContext whose output is buffered into
+    // the report; an exception ends the run and is kept as its error
+    ProblemReport RunProblem(const ProblemInfo& problem)
+    {
+        ProblemReport report;
+        report.number = problem.number;
+        report.name = problem.name;
+        
+        std::ostringstream output;
+        TestContext context(output);
+        {
+            TestContext::Scope scope(context);
+            try
+            {
+                report.durationNs = static_cast<int64_t>(ExecuteProblem(problem));
+            }
+            catch (const std::exception& e)
+            {
+                report.error = e.what();
+            }
+            catch (...)
+            {
+                report.error = "unknown exception";
+            }
+        }
+        if (!report.error.empty())
+        {
+            output << "[FAIL] Problem #" << problem.number << " threw: " << report.error << "\n";
+        }
+        
+        report.output = output.str();
+        report.passed = context.passed;
+        report.total = context.total;
+        report.assertions = std::move(context.records);
+        return report;
+    }
+    
     void RunByNumber(int number)
     {
         for (const auto& problem : m_problems)
@@ -74,23 +255,71 @@ public:
         std::cout << "\n";
     }
     
+    // Problems whose number equals the filter or whose name contains it
+    // (case-insensitive), in number order; an empty filter matches all
+    std::vector<ProblemInfo> Find(const std::string& filter) const
+    {
+        auto lower = [](std::string text)
+        {
+            std::transform(text.begin(), text.end(), text.begin(),
+                           [](unsigned char c) { return static_cast<char>(std::tolower(c)); });
+            return text;
+        };
+        const std::string needle = lower(filter);
+        
+        std::vector<ProblemInfo> found;
+        for (const auto& problem : GetSortedProblems())
+        {
+            if (filter.empty() || std::to_string(problem.number) == filter
+                || lower(problem.name).find(needle) != std::string::npos)
+            {
+                found.push_back(problem);
+            }
+        }
+        return found;
+    }
+    
+    // The problem registered under number, or nullptr
+    const ProblemInfo* FindByNumber(int number) const
+    {
+        for (const auto& problem : m_problems)
+        {
+            if (problem.number == number)
+            {
+                return &problem;
+            }
+        }
+        return nullptr;
+    }
+    
     size_t Count() const { return m_problems.size(); }
     
     std::vector<ProblemInfo> GetProblemList() const { return GetSortedProblems(); }
 
 private:
     std::vector<ProblemInfo> m_problems;
+    std::map<int, std::function<void(ScalingRun&)>> m_scaling;
     SolutionRegistry() = default;
     
-    void ExecuteProblem(const ProblemInfo& problem)
+    // Returns the time TestProblemN took in nanoseconds, including any
+    // benchmarking. Prints to the calling thread's TestContext.
+    double ExecuteProblem(const ProblemInfo& problem)
     {
-        std::cout << "\n========================================\n";
-        std::cout << "Problem #" << problem.number << ": " << problem.name << "\n";
-        std::cout << "========================================\n\n";
+        std::ostream& out = *TestContext::Current().out;
+        out << "\n========================================\n";
+        out << "Problem #" << problem.number << ": " << problem.name << "\n";
+        out << "========================================\n\n";
         
+        const auto start = Benchmark::Clock::now();
         problem.testFunction();
+        const double elapsed = static_cast<double>(Benchmark::ElapsedNs(start));
         
-        std::cout << "========================================\n";
+        if (Benchmark::Enabled())
+        {
+            out << "\nTest time: " << Benchmark::FormatNs(elapsed) << "\n";
+        }
+        out << "========================================\n";
+        return elapsed;
     }
     
     std::vector<ProblemInfo> GetSortedProblems() const
@@ -123,4 +352,15 @@ private:
             } \
         }; \
         static Problem##number##Registrar Problem##number##Instance; \
+    }
+
+// Registers the ScaleProblemN the generator writes next to TestProblemN
+#define REGISTER_SCALING(number, scaleFunc) \
+    namespace { \
+        struct Problem##number##ScalingRegistrar { \
+            Problem##number##ScalingRegistrar() { \
+                SolutionRegistry::GetInstance().RegisterScaling(number, scaleFunc); \
+            } \
+        }; \
+        static Problem##number##ScalingRegistrar Problem##number##ScalingInstance; \
     }
\ No newline at end of file
@@ -0,0 +1,174 @@
+#pragma once
+
+#include <cstdint>
+#include <cstdio>
+#include <iostream>
+#include <string>
+#include <vector>
+
+#include "Benchmark.h"
+
+// One checked assertion. Expected and actual are only kept for failures.
+struct AssertionRecord
+{
+    std::string testCase;
+    std::string expression;
+    int line = 0;                // 0 for assertions without a line (ASSERT, ASSERT_TRUE)
+    bool passed = false;
+    std::string expected;
+    std::string actual;
+    int64_t durationNs = -1;     // Time of the checked call, -1 if it wasn't timed
+};
+
+// The outcome of one TestProblemN run (SolutionRegistry::RunProblem)
+struct ProblemReport
+{
+    int number = 0;
+    std::string name;
+    int passed = 0;
+    int total = 0;
+    int64_t durationNs = 0;
+    std::string error;           // what() of an exception that ended the run early
+    std::string output;          // Everything the run printed
+    std::vector<AssertionRecord> assertions;
+
+    bool Succeeded() const { return error.empty() && passed == total; }
+};
+
+// The state of one test run: counters, records and where its output goes.
+// TestRunner works on the context bound to the calling thread (see Scope), so
+// several problems can run at once, each printing into its own buffer.
+// Threads without a bound context share one that prints to std::cout.
+struct TestContext
+{
+    explicit TestContext(std::ostream& output = std::cout) : out(&output) {}
+
+    std::ostream* out;
+    std::string testName;
+    std::string currentCase;
+    int passed = 0;
+    int total = 0;
+    int64_t pendingNs = -1;      // Time of the last evaluated call, taken by the next assertion
+    std::vector<BenchmarkResult> benchmarks;
+    std::vector<AssertionRecord> records;
+
+    static TestContext& Current()
+    {
+        static TestContext shared;
+        return t_current ? *t_current : shared;
+    }
+
+    // Binds a context to the calling thread until the scope ends
+    class Scope
+    {
+    public:
+        explicit Scope(TestContext& context) : m_previous(t_current) { t_current = &context; }
+        ~Scope() { t_current = m_previous; }
+
+        Scope(const Scope&) = delete;
+        Scope& operator=(const Scope&) = delete;
+
+    private:
+        TestContext* m_previous;
+    };
+
+private:
+    inline static thread_local TestContext* t_current = nullptr;
+};
+
+// Writes test results as JSON Lines: an "assertion" record per check, a
+// "problem" record after each problem and a final "summary" record. Problem
+// durations are their own run times; the summary also has the wall time.
+class JsonReport
+{
+public:
+    static std::string Escape(const std::string& text)
+    {
+        std::string escaped;
+        escaped.reserve(text.size() + 2);
+        escaped += '"';
+        for (unsigned char c : text)
+        {
+            switch (c)
+            {
+                case '"': escaped += "\\\""; break;
+                case '\\': escaped += "\\\\"; break;
+                case '\n': escaped += "\\n"; break;
+                case '\r': escaped += "\\r"; break;
+                case '\t': escaped += "\\t"; break;
+                default:
+                    if (c < 0x20)
+                    {
+                        char code[8];
+                        std::snprintf(code, sizeof(code), "\\u%04x", c);
+                        escaped += code;
+                    }
+                    else
+                    {
+                        escaped += static_cast<char>(c);
+                    }
+            }
+        }
+        escaped += '"';
+        return escaped;
+    }
+
+    static void WriteProblem(const ProblemReport& report, std::ostream& out = std::cout)
+    {
+        for (const auto& record : report.assertions)
+        {
+            out << "{\"type\":\"assertion\",\"problem\":" << report.number
+                << ",\"case\":" << Escape(record.testCase)
+                << ",\"line\":" << record.line
+                << ",\"expression\":" << Escape(record.expression)
+                << ",\"passed\":" << (record.passed ? "true" : "false")
+                << ",\"durationNs\":" << Duration(record.durationNs);
+            if (!record.passed)
+            {
+                out << ",\"expected\":" << Escape(record.expected) << ",\"actual\":" << Escape(record.actual);
+            }
+            out << "}\n";
+        }
+
+        out << "{\"type\":\"problem\",\"problem\":" << report.number
+            << ",\"name\":" << Escape(report.name)
+            << ",\"passed\":" << report.passed
+            << ",\"total\":" << report.total
+            << ",\"durationNs\":" << report.durationNs;
+        if (!report.error.empty())
+        {
+            out << ",\"error\":" << Escape(report.error);
+        }
+        out << "}\n" << std::flush;
+    }
+
+    static void WriteSummary(const std::vector<ProblemReport>& reports, int64_t wallNs, std::ostream& out = std::cout)
+    {
+        int passed = 0;
+        int total = 0;
+        int64_t durationNs = 0;
+        std::string failed;
+        for (const auto& report : reports)
+        {
+            passed += report.passed;
+            total += report.total;
+            durationNs += report.durationNs;
+            if (!report.Succeeded())
+            {
+                failed += (failed.empty() ? "" : ",") + std::to_string(report.number);
+            }
+        }
+        out << "{\"type\":\"summary\",\"problems\":" << reports.size()
+            << ",\"passed\":" << passed
+            << ",\"total\":" << total
+            << ",\"durationNs\":" << durationNs
+            << ",\"wallNs\":" << wallNs
+            << ",\"failedProblems\":[" << failed << "]}\n" << std::flush;
+    }
+
+private:
+    static std::string Duration(int64_t ns)
+    {
+        return ns < 0 ? "null" : std::to_string(ns);
+    }
+};
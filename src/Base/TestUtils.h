@@ -5,151 +5,240 @@
 #include <vector>
 #include <sstream>
 #include <iomanip>
+#include <array>
+#include <initializer_list>
+#include <type_traits>
+
+#include "Benchmark.h"
+#include "SolutionRegistry.h"
+#include "TestReport.h"
+
+// Converts a value stored in a test table (see TestRunner::RunCases) to the
+// type a solution takes; vectors are stored as nested initializer lists
+template<typename T>
+struct TableValue
+{
+    template<typename Stored>
+    static T Load(const Stored& value) { return T(value); }
+};
+
+template<typename T>
+struct TableValue<std::vector<T>>
+{
+    template<typename Stored>
+    static std::vector<T> Load(std::initializer_list<Stored> values)
+    {
+        std::vector<T> result;
+        result.reserve(values.size());
+        for (const Stored& value : values)
+        {
+            result.push_back(TableValue<T>::Load(value));
+        }
+        return result;
+    }
+};
 
 class TestRunner
 {
 public:
     static void Start(const std::string& testName)
     {
-        m_currentTest = testName;
-        m_passed = 0;
-        m_total = 0;
-        std::cout << "Testing " << testName << "...\n\n";
+        TestContext& context = Context();
+        context.testName = testName;
+        context.currentCase.clear();
+        context.passed = 0;
+        context.total = 0;
+        context.pendingNs = -1;
+        context.benchmarks.clear();
+        context.records.clear();
+        Out() << "Testing " << testName << "...\n\n";
+    }
+    
+    // The calling thread's test run (see TestContext::Scope) and its output
+    static TestContext& Context() { return TestContext::Current(); }
+    static std::ostream& Out() { return *Context().out; }
+    
+    // Starts a named group of assertions (TEST_CASE)
+    static void BeginCase(const std::string& description)
+    {
+        Context().currentCase = description;
+        Out() << "\nTest Case: " << description << "\n";
     }
     
     template<typename T>
     static bool AssertEqual(const T& actual, const T& expected, const char* expr, int line)
     {
-        m_total++;
         if (actual == expected)
         {
-            m_passed++;
-            std::cout << "[PASS] Line " << line << ": " << expr << " == " << expected << "\n";
-            return true;
-        }
-        else
-        {
-            std::cout << "[FAIL] Line " << line << ": " << expr << "\n";
-            std::cout << "       Expected: " << expected << "\n";
-            std::cout << "       Actual:   " << actual << "\n";
-            return false;
+            return Report(true, expr, line, std::string(expr) + " == " + Format(expected));
         }
+        return Report(false, expr, line, expr, Format(expected), Format(actual));
     }
     
     template<typename T>
     static bool AssertEqual(const std::vector<T>& actual, const std::vector<T>& expected, 
                           const char* expr, int line)
     {
-        m_total++;
         if (actual == expected)
         {
-            m_passed++;
-            std::cout << "[PASS] Line " << line << ": " << expr << " matches expected\n";
-            return true;
-        }
-        else
-        {
-            std::cout << "[FAIL] Line " << line << ": " << expr << "\n";
-            std::cout << "       Expected: [";
-            for (size_t i = 0; i < expected.size(); ++i)
-            {
-                if (i > 0) std::cout << ", ";
-                std::cout << expected[i];
-            }
-            std::cout << "]\n       Actual:   [";
-            for (size_t i = 0; i < actual.size(); ++i)
-            {
-                if (i > 0) std::cout << ", ";
-                std::cout << actual[i];
-            }
-            std::cout << "]\n";
-            return false;
+            return Report(true, expr, line, std::string(expr) + " matches expected");
         }
+        return Report(false, expr, line, expr, Format(expected), Format(actual));
     }
 
     template<typename T>
     static bool AssertEqual(T* actual, std::nullptr_t, const char* expr, int line)
     {
-        m_total++;
         if (actual == nullptr)
         {
-            m_passed++;
-            std::cout << "[PASS] Line " << line << ": " << expr << " == nullptr\n";
-            return true;
-        }
-        else
-        {
-            std::cout << "[FAIL] Line " << line << ": " << expr << "\n";
-            std::cout << "       Expected: nullptr\n";
-            std::cout << "       Actual:   " << actual << " (non-null pointer)\n";
-            return false;
+            return Report(true, expr, line, std::string(expr) + " == nullptr");
         }
+        return Report(false, expr, line, expr, "nullptr", Format(actual) + " (non-null pointer)");
     }
     
     template<typename T>
     static bool AssertEqual(std::nullptr_t, T* expected, const char* expr, int line)
     {
-        m_total++;
         if (expected == nullptr)
         {
-            m_passed++;
-            std::cout << "[PASS] Line " << line << ": " << expr << " == nullptr\n";
-            return true;
-        }
-        else
-        {
-            std::cout << "[FAIL] Line " << line << ": " << expr << "\n";
-            std::cout << "       Expected: " << expected << " (non-null pointer)\n";
-            std::cout << "       Actual:   nullptr\n";
-            return false;
+            return Report(true, expr, line, std::string(expr) + " == nullptr");
         }
+        return Report(false, expr, line, expr, Format(expected) + " (non-null pointer)", "nullptr");
     }
     
     // Custom assertion with description
     static bool Assert(bool condition, const std::string& description)
     {
-        m_total++;
-        if (condition)
+        return Report(condition, description, 0, description);
+    }
+    
+    // Counts an assertion, prints its [PASS]/[FAIL] line (prefixed with the
+    // line number, if any) and keeps its record. Expected and actual are
+    // printed and recorded for failures only.
+    static bool Report(bool passed, const std::string& expr, int line, const std::string& message,
+                       const std::string& expected = "", const std::string& actual = "")
+    {
+        TestContext& context = Context();
+        std::ostream& out = *context.out;
+        AssertionRecord record;
+        record.testCase = context.currentCase;
+        record.expression = expr;
+        record.line = line;
+        record.passed = passed;
+        record.durationNs = context.pendingNs;
+        context.pendingNs = -1;
+        
+        context.total++;
+        out << (passed ? "[PASS] " : "[FAIL] ");
+        if (line > 0)
         {
-            m_passed++;
-            std::cout << "[PASS] " << description << "\n";
-            return true;
+            out << "Line " << line << ": ";
         }
-        else
+        out << message << "\n";
+        if (passed)
+        {
+            context.passed++;
+        }
+        else if (!expected.empty() || !actual.empty())
+        {
+            out << "       Expected: " << expected << "\n";
+            out << "       Actual:   " << actual << "\n";
+            record.expected = expected;
+            record.actual = actual;
+        }
+        context.records.push_back(std::move(record));
+        return passed;
+    }
+    
+    // Prints a value the way assertion messages show it; vectors as [a, b]
+    template<typename T>
+    static std::string Format(const T& value)
+    {
+        std::ostringstream out;
+        out << value;
+        return out.str();
+    }
+    
+    template<typename T>
+    static std::string Format(const std::vector<T>& values)
+    {
+        std::string text = "[";
+        for (size_t i = 0; i < values.size(); ++i)
+        {
+            if (i > 0) text += ", ";
+            text += Format(values[i]);
+        }
+        return text + "]";
+    }
+    
+    // Evaluates the actual side of an assertion. In benchmark mode the call is
+    // then repeated and timed; the checked result is always the first one, made
+    // before any repetition could see inputs the solution modified in place.
+    // Pointer results (nodes the caller must free) are not repeated.
+    template<typename Call>
+    static auto Evaluate(Call&& call, const std::string& expr, int line)
+    {
+        const auto start = Benchmark::Clock::now();
+        auto result = call();
+        Context().pendingNs = Benchmark::ElapsedNs(start);
+        if constexpr (!std::is_pointer_v<decltype(result)> && !std::is_null_pointer_v<decltype(result)>)
+        {
+            if (Benchmark::Enabled())
+            {
+                Context().benchmarks.push_back(Benchmark::Measure(call, expr, line));
+            }
+        }
+        return result;
+    }
+    
+    // Builds a solution argument from the literal type a test table stores
+    // it as, e.g. std::vector<std::string> from std::initializer_list<const char*>
+    template<typename T, typename Stored>
+    static T Load(const Stored& value)
+    {
+        return TableValue<T>::Load(value);
+    }
+    
+    // Runs a table of test cases: call turns each row into a solution call and
+    // returns its result, which is checked against the row's expected member
+    template<typename Cases, typename Call>
+    static void RunCases(const Cases& cases, Call call, const char* expr, int line)
+    {
+        int index = 0;
+        for (const auto& test : cases)
         {
-            std::cout << "[FAIL] " << description << "\n";
-            return false;
+            BeginCase("Example " + std::to_string(++index));
+            std::string label = std::string(expr) + " [" + Context().currentCase + "]";
+            auto actual = Evaluate([&]() { return call(test); }, label, line);
+            AssertEqual(actual, Load<decltype(actual)>(test.expected), expr, line);
         }
     }
     
     static void PrintSummary()
     {
-        std::cout << "\nPassed " << m_passed << "/" << m_total << " tests";
-        if (m_passed == m_total)
+        const TestContext& context = Context();
+        std::ostream& out = *context.out;
+        out << "\nPassed " << context.passed << "/" << context.total << " tests";
+        if (context.passed == context.total)
         {
-            std::cout << " - All tests passed!\n";
+            out << " - All tests passed!\n";
         }
         else
         {
-            std::cout << " - " << (m_total - m_passed) << " tests failed\n";
+            out << " - " << (context.total - context.passed) << " tests failed\n";
         }
+        Benchmark::PrintTable(context.benchmarks, out);
     }
     
-    static int GetPassed() { return m_passed; }
-    static int GetTotal() { return m_total; }
-    static int GetFailed() { return m_total - m_passed; }
-
-private:
-    static int m_passed;
-    static int m_total;
-    static std::string m_currentTest;
+    static int GetPassed() { return Context().passed; }
+    static int GetTotal() { return Context().total; }
+    static int GetFailed() { return Context().total - Context().passed; }
+    static const std::vector<BenchmarkResult>& GetBenchmarks() { return Context().benchmarks; }
+    static const std::vector<AssertionRecord>& GetRecords() { return Context().records; }
 };
 
-int TestRunner::m_passed = 0;
-int TestRunner::m_total = 0;
-std::string TestRunner::m_currentTest = "";
-
-#define ASSERT_EQ(actual, expected) TestRunner::AssertEqual(actual, expected, #actual, __LINE__)
+#define ASSERT_EQ(actual, expected) \
+    TestRunner::AssertEqual(TestRunner::Evaluate([&]() { return actual; }, #actual, __LINE__), expected, #actual, __LINE__)
 
 #define ASSERT_TRUE(condition) TestRunner::Assert(condition, #condition " should be true")
 #define ASSERT_FALSE(condition) TestRunner::Assert(!(condition), #condition " should be false")
@@ -159,4 +248,4 @@ std::string TestRunner::m_currentTest = "";
 #define ASSERT_NOT_NULL(ptr) TestRunner::Assert((ptr) != nullptr, #ptr " should not be null")
 #define ASSERT_NULL(ptr) TestRunner::Assert((ptr) == nullptr, #ptr " should be null")
 
-#define TEST_CASE(description) std::cout << "\nTest Case: " << description << "\n";
+#define TEST_CASE(description) TestRunner::BeginCase(description);
@@ -0,0 +1,144 @@
+#include "TestHelpers.h"
+
+#include <cstdio>
+#include <cstdlib>
+
+// The mapping code lives here so the platform headers stay out of every
+// problem (and out of the precompiled header)
+#ifdef _WIN32
+    #ifndef WIN32_LEAN_AND_MEAN
+        #define WIN32_LEAN_AND_MEAN
+    #endif
+    #ifndef NOMINMAX
+        #define NOMINMAX
+    #endif
+    #include <windows.h>
+#else
+    #include <fcntl.h>
+    #include <sys/mman.h>
+    #include <sys/stat.h>
+    #include <unistd.h>
+#endif
+
+namespace TestHelpers {
+
+    namespace {
+        const size_t HeaderSize = 12;  // "LPPD", u32 version, u32 count
+        
+        std::string DirectoryOf(const char* file) {
+            std::string path = file ? file : "";
+            size_t slash = path.find_last_of("/\\");
+            return slash == std::string::npos ? "" : path.substr(0, slash + 1);
+        }
+        
+        bool FileExists(const std::string& path) {
+            std::FILE* file = std::fopen(path.c_str(), "rb");
+            if (!file) return false;
+            std::fclose(file);
+            return true;
+        }
+        
+        template<typename T>
+        T ReadAt(const unsigned char* data, size_t offset) {
+            T value;
+            std::memcpy(&value, data + offset, sizeof(T));
+            return value;
+        }
+    }
+    
+    TestData::TestData(const char* sourceFile, const std::string& name) {
+        std::vector<std::string> candidates;
+        if (const char* directory = std::getenv("LPP_TEST_DATA_DIR")) {
+            candidates.push_back(std::string(directory) + "/" + name);
+        }
+        candidates.push_back(DirectoryOf(sourceFile) + "Data/" + name);
+        candidates.push_back("src/Problems/Data/" + name);
+        
+        for (const auto& candidate : candidates) {
+            if (FileExists(candidate)) {
+                m_path = candidate;
+                break;
+            }
+        }
+        if (m_path.empty()) {
+            throw std::runtime_error("Test data file not found: " + name);
+        }
+        
+#ifdef _WIN32
+        HANDLE file = CreateFileA(m_path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr,
+                                  OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL | FILE_FLAG_SEQUENTIAL_SCAN, nullptr);
+        if (file != INVALID_HANDLE_VALUE) {
+            LARGE_INTEGER size;
+            if (GetFileSizeEx(file, &size)) {
+                m_size = static_cast<size_t>(size.QuadPart);
+            }
+            HANDLE mapping = m_size ? CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr) : nullptr;
+            if (mapping) {
+                // The view keeps the mapping and the file open
+                m_data = static_cast<const unsigned char*>(MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0));
+                CloseHandle(mapping);
+            }
+            CloseHandle(file);
+        }
+#else
+        int file = open(m_path.c_str(), O_RDONLY);
+        if (file >= 0) {
+            struct stat info;
+            if (fstat(file, &info) == 0) {
+                m_size = static_cast<size_t>(info.st_size);
+            }
+            if (m_size) {
+                // The mapping stays valid once the descriptor is closed
+                void* view = mmap(nullptr, m_size, PROT_READ, MAP_PRIVATE, file, 0);
+                if (view != MAP_FAILED) {
+                    m_data = static_cast<const unsigned char*>(view);
+                }
+            }
+            close(file);
+        }
+#endif
+        if (!m_data) {
+            throw std::runtime_error("Could not map test data file: " + m_path);
+        }
+        
+        if (m_size < HeaderSize || std::memcmp(m_data, "LPPD", 4) != 0 ||
+            ReadAt<uint32_t>(m_data, 4) != Data::Version) {
+            Unmap();
+            throw std::runtime_error("Not a version " + std::to_string(Data::Version) + " test data file: " + m_path);
+        }
+        m_count = ReadAt<uint32_t>(m_data, 8);
+        if (m_size < HeaderSize + m_count * sizeof(uint64_t)) {
+            Unmap();
+            throw std::runtime_error("Truncated test data file: " + m_path);
+        }
+    }
+    
+    TestData::~TestData() {
+        Unmap();
+    }
+    
+    void TestData::Unmap() {
+        if (!m_data) return;
+#ifdef _WIN32
+        UnmapViewOfFile(m_data);
+#else
+        munmap(const_cast<unsigned char*>(m_data), m_size);
+#endif
+        m_data = nullptr;
+    }
+    
+    const unsigned char* TestData::Record(size_t index, uint8_t type, int rank) const {
+        if (index >= m_count) {
+            throw std::runtime_error("Test data value " + std::to_string(index) + " out of range in " + m_path);
+        }
+        uint64_t offset = ReadAt<uint64_t>(m_data, HeaderSize + index * sizeof(uint64_t));
+        if (offset + 4 > m_size) {
+            throw std::runtime_error("Truncated test data file: " + m_path);
+        }
+        if (m_data[offset] != type || m_data[offset + 1] != rank) {
+            throw std::runtime_error("Test data value " + std::to_string(index) + " in " + m_path +
+                                     " doesn't match the type it is loaded as");
+        }
+        return m_data + offset + 4;
+    }
+}
@@ -5,7 +5,12 @@
 #include <queue>
 #include <algorithm>
 #include <climits>
+#include <cstdint>
+#include <cstring>
 #include <sstream>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
 
 namespace TestHelpers {
 
@@ -295,62 +300,163 @@ namespace TestHelpers {
         ss << "]";
         return ss.str();
     }
+    
+    // ============== Binary Test Data ==============
+    
+    /**
+     * Layout of the per-problem data files written by tools/test_data.py
+     * 
+     * All integers are little-endian. The file is "LPPD", u32 version,
+     * u32 count and u64 offsets[count], then one record per value: u8 type,
+     * u8 rank and u16 reserved, followed by the payload. A rank 0 payload is
+     * one element, rank N is u64 n followed by n rank N-1 payloads. Strings
+     * are u64 n followed by n bytes.
+     */
+    namespace Data {
+        enum Type : uint8_t { Int32 = 1, Int64 = 2, Float64 = 3, Char = 4, String = 5 };
+        
+        constexpr uint32_t Version = 1;
+        
+        template<typename T> inline constexpr uint8_t TypeOf = 0;
+        template<> inline constexpr uint8_t TypeOf<int> = Int32;
+        template<> inline constexpr uint8_t TypeOf<long long> = Int64;
+        template<> inline constexpr uint8_t TypeOf<double> = Float64;
+        template<> inline constexpr uint8_t TypeOf<char> = Char;
+        template<> inline constexpr uint8_t TypeOf<std::string> = String;
+        
+        inline uint64_t ReadLength(const unsigned char*& cursor) {
+            uint64_t length;
+            std::memcpy(&length, cursor, sizeof(length));
+            cursor += sizeof(length);
+            return length;
+        }
+        
+        /**
+         * Reads one payload of type T and advances the cursor past it
+         */
+        template<typename T>
+        struct Value {
+            static_assert(TypeOf<T> != 0, "Test data holds int, long long, double, char and string values");
+            static constexpr uint8_t type = TypeOf<T>;
+            static constexpr int rank = 0;
+            
+            static T Read(const unsigned char*& cursor) {
+                T value;
+                std::memcpy(&value, cursor, sizeof(T));
+                cursor += sizeof(T);
+                return value;
+            }
+        };
+        
+        template<>
+        struct Value<std::string> {
+            static constexpr uint8_t type = String;
+            static constexpr int rank = 0;
+            
+            static std::string Read(const unsigned char*& cursor) {
+                uint64_t length = ReadLength(cursor);
+                std::string value(reinterpret_cast<const char*>(cursor), length);
+                cursor += length;
+                return value;
+            }
+        };
+        
+        template<typename T>
+        struct Value<std::vector<T>> {
+            static constexpr uint8_t type = Value<T>::type;
+            static constexpr int rank = Value<T>::rank + 1;
+            
+            static std::vector<T> Read(const unsigned char*& cursor) {
+                uint64_t length = ReadLength(cursor);
+                std::vector<T> values;
+                if constexpr (std::is_arithmetic_v<T>) {
+                    // Elements are stored packed, so a flat array is a single copy
+                    values.resize(length);
+                    std::memcpy(values.data(), cursor, length * sizeof(T));
+                    cursor += length * sizeof(T);
+                } else {
+                    values.reserve(length);
+                    for (uint64_t i = 0; i < length; ++i) {
+                        values.push_back(Value<T>::Read(cursor));
+                    }
+                }
+                return values;
+            }
+        };
+    }
+    
+    /**
+     * Memory-mapped test data for a problem, for inputs too large to compile
+     * 
+     * The generator writes values whose literals would be huge to
+     * src/Problems/Data/<number>.bin and loads them through this class
+     * instead. The file is looked up in $LPP_TEST_DATA_DIR, then in Data/
+     * next to the source file, then in src/Problems/Data under the working
+     * directory. Failures throw std::runtime_error.
+     * @param sourceFile __FILE__ of the problem
+     * @param name File name, e.g. "42.bin"
+     */
+    class TestData {
+    public:
+        TestData(const char* sourceFile, const std::string& name);
+        ~TestData();
+        
+        TestData(const TestData&) = delete;
+        TestData& operator=(const TestData&) = delete;
+        
+        /**
+         * Copy value `index` out of the file, e.g. Get<std::vector<int>>(0)
+         */
+        template<typename T>
+        T Get(size_t index) const {
+            const unsigned char* cursor = Record(index, Data::Value<T>::type, Data::Value<T>::rank);
+            return Data::Value<T>::Read(cursor);
+        }
+        
+        size_t Count() const { return m_count; }
+        
+    private:
+        const unsigned char* m_data = nullptr;
+        size_t m_size = 0;
+        size_t m_count = 0;
+        std::string m_path;
+        
+        const unsigned char* Record(size_t index, uint8_t type, int rank) const;
+        void Unmap();
+    };
 }
 
 // ============== Specialized ASSERT Macros ==============
 
 #define ASSERT_LINKED_LISTS_EQ(actual, expected) \
     do { \
-        if (!TestHelpers::CompareLinkedLists(actual, expected)) { \
-            std::cout << "[FAIL] Line " << __LINE__ << ": Linked lists not equal\n"; \
-            std::cout << "       Expected: " << TestHelpers::LinkedListToString(expected) << "\n"; \
-            std::cout << "       Actual:   " << TestHelpers::LinkedListToString(actual) << "\n"; \
-            TestRunner::m_total++; \
-        } else { \
-            std::cout << "[PASS] Line " << __LINE__ << ": Linked lists match\n"; \
-            TestRunner::m_passed++; \
-            TestRunner::m_total++; \
-        } \
+        bool matched = TestHelpers::CompareLinkedLists(actual, expected); \
+        TestRunner::Report(matched, #actual, __LINE__, matched ? "Linked lists match" : "Linked lists not equal", \
+            matched ? "" : TestHelpers::LinkedListToString(expected), \
+            matched ? "" : TestHelpers::LinkedListToString(actual)); \
     } while(0)
 
 #define ASSERT_TREES_EQ(actual, expected) \
     do { \
-        if (!TestHelpers::CompareTrees(actual, expected)) { \
-            std::cout << "[FAIL] Line " << __LINE__ << ": Trees not equal\n"; \
-            std::cout << "       Expected: " << TestHelpers::TreeToString(expected) << "\n"; \
-            std::cout << "       Actual:   " << TestHelpers::TreeToString(actual) << "\n"; \
-            TestRunner::m_total++; \
-        } else { \
-            std::cout << "[PASS] Line " << __LINE__ << ": Trees match\n"; \
-            TestRunner::m_passed++; \
-            TestRunner::m_total++; \
-        } \
+        bool matched = TestHelpers::CompareTrees(actual, expected); \
+        TestRunner::Report(matched, #actual, __LINE__, matched ? "Trees match" : "Trees not equal", \
+            matched ? "" : TestHelpers::TreeToString(expected), \
+            matched ? "" : TestHelpers::TreeToString(actual)); \
     } while(0)
 
 #define ASSERT_UNORDERED_EQ(actual, expected) \
     do { \
-        if (!TestHelpers::CompareUnorderedVectors(actual, expected)) { \
-            std::cout << "[FAIL] Line " << __LINE__ << ": Vectors not equal (unordered)\n"; \
-            std::cout << "       Expected: " << TestHelpers::VectorToString(expected) << "\n"; \
-            std::cout << "       Actual:   " << TestHelpers::VectorToString(actual) << "\n"; \
-            TestRunner::m_total++; \
-        } else { \
-            std::cout << "[PASS] Line " << __LINE__ << ": Vectors match (unordered)\n"; \
-            TestRunner::m_passed++; \
-            TestRunner::m_total++; \
-        } \
+        bool matched = TestHelpers::CompareUnorderedVectors(actual, expected); \
+        TestRunner::Report(matched, #actual, __LINE__, \
+            matched ? "Vectors match (unordered)" : "Vectors not equal (unordered)", \
+            matched ? "" : TestHelpers::VectorToString(expected), \
+            matched ? "" : TestHelpers::VectorToString(actual)); \
     } while(0)
 
 #define ASSERT_FLOAT_EQ(actual, expected, epsilon) \
     do { \
-        if (!TestHelpers::CompareFloats(actual, expected, epsilon)) { \
-            std::cout << "[FAIL] Line " << __LINE__ << ": Floats not equal\n"; \
-            std::cout << "       Expected: " << expected << " (±" << epsilon << ")\n"; \
-            std::cout << "       Actual:   " << actual << "\n"; \
-            TestRunner::m_total++; \
-        } else { \
-            std::cout << "[PASS] Line " << __LINE__ << ": Floats match\n"; \
-            TestRunner::m_passed++; \
-            TestRunner::m_total++; \
-        } \
+        bool matched = TestHelpers::CompareFloats(actual, expected, epsilon); \
+        TestRunner::Report(matched, #actual, __LINE__, matched ? "Floats match" : "Floats not equal", \
+            matched ? "" : TestRunner::Format(expected) + " (±" + TestRunner::Format(epsilon) + ")", \
+            matched ? "" : TestRunner::Format(actual)); \
     } while(0)
\ No newline at end of file
@@ -1,14 +1,15 @@
-// Auto-generated includes for all problems
 #pragma once
 
-#include "Problems/12_Integer_To_Roman.h"
-#include "Problems/1_Two_Sum.h"
-#include "Problems/2_Add_Two_Numbers.h"
-#include "Problems/3096_Minimum_Levels_To_Gain_More_Points.h"
-#include "Problems/3_Longest_Substring_Without_Repeating_Characters.h"
-#include "Problems/4_Median_Of_Two_Sorted_Arrays.h"
-#include "Problems/5_Longest_Palindromic_Substring.h"
-#include "Problems/66_Plus_One.h"
-#include "Problems/68_Text_Justification.h"
-#include "Problems/7_Reverse_Integer.h"
-#include "Problems/AllProblems.h"
+// This file is automatically generated by LeetPlusPlus
+// It includes all problem solution headers
+
+#include "1_Two_Sum.h"
+#include "2_Add_Two_Numbers.h"
+#include "3_Longest_Substring_Without_Repeating_Characters.h"
+#include "4_Median_Of_Two_Sorted_Arrays.h"
+#include "5_Longest_Palindromic_Substring.h"
+#include "7_Reverse_Integer.h"
+#include "12_Integer_To_Roman.h"
+#include "66_Plus_One.h"
+#include "68_Text_Justification.h"
+#include "3096_Minimum_Levels_To_Gain_More_Points.h"
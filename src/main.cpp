@@ -1,4 +1,4 @@
-﻿/**
+/**
 * ██╗     ███████╗███████╗████████╗                                 
 * ██║     ██╔════╝██╔════╝╚══██╔══╝                                 
 * ██║     █████╗  █████╗     ██║                                    
@@ -14,14 +14,147 @@
 * ╚═╝     ╚══════╝ ╚═════╝ ╚══════╝╚═╝     ╚══════╝ ╚═════╝ ╚══════╝
 */
 
+#include <algorithm>
 #include <iostream>
 #include <string>
 #include <limits>
+#include <cstdlib>
+#include <fstream>
 
+#include "Base/HeadlessRunner.h"
 #include "Base/SolutionRegistry.h"
 #include "Problems/AllProblems.h"
 #include "UI/Application.h"
 
+static const char* Usage =
+    "Usage: LeetPlusPlus [--run <number>]... [--run-all] [--filter TEXT] [--format text|json]\n"
+    "                    [--jobs N]\n"
+    "       LeetPlusPlus --bench <number|all> [--bench-time MS] [--bench-warmup N]\n"
+    "       LeetPlusPlus --scale <number> [--bench-time MS] [--bench-warmup N] [--scale-cutoff MS]\n"
+    "                    [--scale-output FILE]\n";
+
+// --bench runs the tests with every ASSERT_EQ timed; --scale times a problem's
+// ScaleProblemN at every size in its scaling data, optionally saving the
+// timings as CSV. Both skip the TUI.
+static int RunBenchmarks(int argc, char* argv[])
+{
+    auto& settings = Benchmark::Settings();
+    std::string target;
+    std::string scaleOutput;
+    bool scaling = false;
+    
+    for (int i = 1; i < argc; ++i)
+    {
+        std::string arg = argv[i];
+        bool hasValue = i + 1 < argc;
+        if ((arg == "--bench" || arg == "--scale") && hasValue)
+        {
+            scaling = arg == "--scale";
+            target = argv[++i];
+        }
+        else if (arg == "--scale-cutoff" && hasValue)
+        {
+            settings.scalingCutoffMs = std::atof(argv[++i]);
+        }
+        else if (arg == "--scale-output" && hasValue)
+        {
+            scaleOutput = argv[++i];
+        }
+        else if (arg == "--bench-time" && hasValue)
+        {
+            settings.budgetMs = std::atof(argv[++i]);
+        }
+        else if (arg == "--bench-warmup" && hasValue)
+        {
+            settings.warmupRuns = std::atoi(argv[++i]);
+        }
+        else
+        {
+            std::cerr << "Unknown or incomplete argument: " << arg << "\n" << Usage;
+            return 2;
+        }
+    }
+    
+    auto& registry = SolutionRegistry::GetInstance();
+    if (scaling)
+    {
+        ScalingRun run;
+        if (!registry.RunScaling(std::atoi(target.c_str()), run))
+        {
+            return 1;
+        }
+        if (!scaleOutput.empty())
+        {
+            std::ofstream out(scaleOutput);
+            run.WriteCsv(out);
+            if (!out)
+            {
+                std::cerr << "Could not write " << scaleOutput << "\n";
+                return 1;
+            }
+        }
+        return 0;
+    }
+    
+    settings.enabled = true;
+    if (target.empty() || target == "all")
+    {
+        registry.RunAll();
+    }
+    else
+    {
+        registry.RunByNumber(std::atoi(target.c_str()));
+    }
+    return 0;
+}
+
+// --run, --run-all and --filter run the tests without the TUI, on --jobs
+// threads; --format json prints one JSON record per assertion and problem
+// (see TestReport.h)
+static int RunHeadless(int argc, char* argv[])
+{
+    HeadlessOptions options;
+    
+    for (int i = 1; i < argc; ++i)
+    {
+        std::string arg = argv[i];
+        bool hasValue = i + 1 < argc;
+        if (arg == "--run" && hasValue)
+        {
+            options.numbers.push_back(std::atoi(argv[++i]));
+        }
+        else if (arg == "--run-all")
+        {
+            options.all = true;
+        }
+        else if (arg == "--filter" && hasValue)
+        {
+            options.filter = argv[++i];
+        }
+        else if (arg == "--jobs" && hasValue)
+        {
+            options.jobs = static_cast<unsigned>(std::max(0, std::atoi(argv[++i])));
+        }
+        else if (arg == "--format" && hasValue)
+        {
+            std::string format = argv[++i];
+            if (format != "text" && format != "json")
+            {
+                std::cerr << "Unknown format: " << format << "\n" << Usage;
+                return 2;
+            }
+            options.json = format == "json";
+        }
+        else
+        {
+            std::cerr << "Unknown or incomplete argument: " << arg << "\n" << Usage;
+            return 2;
+        }
+    }
+    
+    return HeadlessRunner::Run(options);
+}
+
 int main(int argc, char* argv[])
 {
     auto& registry = SolutionRegistry::GetInstance();
@@ -31,6 +164,19 @@ int main(int argc, char* argv[])
         std::cout << "No solutions registered. Please add some LeetCode problems.\n";
         return 0;
     }
+    
+    for (int i = 1; i < argc; ++i)
+    {
+        std::string arg = argv[i];
+        if (arg == "--bench" || arg == "--scale")
+        {
+            return RunBenchmarks(argc, argv);
+        }
+        if (arg == "--run" || arg == "--run-all" || arg == "--filter" || arg == "--format" || arg == "--jobs")
+        {
+            return RunHeadless(argc, argv);
+        }
+    }
 
     UI::Application app;
     if (app.Initialize())
@@ -0,0 +1,2 @@
+// Builds the precompiled header for MSVC; see pchsource in premake5.lua
+#include "pch.h"
@@ -0,0 +1,15 @@
+#pragma once
+
+// This file is automatically generated by LeetPlusPlus
+// It includes every library and framework header used by the problems,
+// so premake5.lua can precompile them once for all translation units
+
+#include <algorithm>
+#include <iostream>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "Base/SolutionRegistry.h"
+#include "Base/TestUtils.h"
+#include "Common/Structures.h"
+#include "Common/TestHelpers.h"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Batch importer for LeetPlusPlus
+Pipelines rate-limited concurrent fetching with parsing and code generation
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from common import ColorPrinter, TokenBucket
+from config import BATCH_IMPORT_WORKERS, BATCH_IMPORT_RATE, BATCH_IMPORT_BURST
+from generate_solution import GenerationSession, generate_solution
+from leetcode_fetcher_simple import LeetCodeAPI, parse_problem_data
+from ui_style import UIStyle
+
+
+class BatchImporter:
+    """
+    Imports many problems as a fetch -> parse -> generate pipeline
+    
+    Fetches run on a small thread pool and are paced by a token bucket
+    instead of a fixed sleep. Parsing and generation happen on the calling
+    thread as each fetch completes, so file generation overlaps with the
+    requests still in flight. Cached responses skip the rate limiter.
+    Metadata, AllProblems.h and the project files are written once at the
+    end through a GenerationSession.
+    
+    Threads rather than asyncio, since HTTPClient is blocking. Its
+    ConnectionPool is one pool shared by every thread, keeping up to
+    HTTP_POOL_SIZE idle connections per host, so workers reuse keep-alive
+    sockets as long as there are no more of them than that.
+    """
+    
+    STAGES = ('fetch', 'parse', 'generate')
+    
+    def __init__(self, api: LeetCodeAPI, workers: int = BATCH_IMPORT_WORKERS,
+                 rate: float = BATCH_IMPORT_RATE, burst: int = BATCH_IMPORT_BURST,
+                 force: bool = False):
+        self.api = api
+        self.workers = max(1, workers)
+        self.limiter = TokenBucket(rate, burst)
+        self.force = force
+        self.stage_times = {stage: 0.0 for stage in self.STAGES}
+        self.counts = {'generated': 0, 'existing': 0, 'paid': 0, 'failed': 0}
+        self.failed = []  # Slugs that failed, so they can be imported again
+    
+    def _fetch(self, slug: str):
+        """Fetch one problem (runs on a worker thread)"""
+        start = time.perf_counter()
+        try:
+            data = self.api.fetch_problem(slug)
+        except Exception as e:
+            ColorPrinter.error(f"Failed to fetch {slug}: {e}")
+            data = None
+        return data, time.perf_counter() - start
+    
+    def _process(self, problem_data: Dict) -> Optional[str]:
+        """Parse and generate one fetched problem, returning the filename"""
+        start = time.perf_counter()
+        parsed = parse_problem_data(problem_data)
+        self.stage_times['parse'] += time.perf_counter() - start
+        
+        if not parsed['signature']:
+            raise ValueError("could not extract C++ signature")
+        
+        start = time.perf_counter()
+        try:
+            return generate_solution(
+                problem_number=int(parsed['problem_id']),
+                title=parsed['title'],
+                signature=parsed['signature'],
+                difficulty=parsed['difficulty'],
+                topics=parsed['topics'],
+                companies=[],  # API doesn't provide company info
+                test_cases_data=parsed['test_cases_data'],
+                force=self.force
+            )
+        finally:
+            self.stage_times['generate'] += time.perf_counter() - start
+    
+    def run(self, problems: List[Dict]) -> int:
+        """Import a list of problems from the /problems endpoint, returning the success count"""
+        candidates = []
+        for problem in problems:
+            # Skip paid problems in batch import
+            if problem.get("isPaidOnly", False):
+                self.counts['paid'] += 1
+            elif problem.get("titleSlug"):
+                candidates.append(problem)
+        
+        previous_limiter = self.api.rate_limiter
+        self.api.rate_limiter = self.limiter
+        started = time.perf_counter()
+        
+        try:
+            with GenerationSession(), ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self._fetch, p["titleSlug"]): p for p in candidates}
+                for done, future in enumerate(as_completed(futures), 1):
+                    problem = futures[future]
+                    label = f"[{done}/{len(candidates)}] {problem.get('title', problem['titleSlug'])}"
+                    problem_data, fetch_time = future.result()
+                    self.stage_times['fetch'] += fetch_time
+                    
+                    if not problem_data:
+                        self.counts['failed'] += 1
+                        self.failed.append(problem['titleSlug'])
+                        ColorPrinter.error(f"{label}: fetch failed")
+                        continue
+                    
+                    try:
+                        filename = self._process(problem_data)
+                        self.counts['generated'] += 1
+                        ColorPrinter.success(f"{label} -> {filename}")
+                    except ValueError as e:
+                        if "already exists" in str(e):
+                            self.counts['existing'] += 1
+                            ColorPrinter.warning(f"{label}: already exists")
+                        else:
+                            self.counts['failed'] += 1
+                            self.failed.append(problem['titleSlug'])
+                            ColorPrinter.error(f"{label}: {e}")
+                    except Exception as e:
+                        self.counts['failed'] += 1
+                        self.failed.append(problem['titleSlug'])
+                        ColorPrinter.error(f"{label}: {e}")
+        finally:
+            self.api.rate_limiter = previous_limiter
+        
+        self.print_summary(len(problems), time.perf_counter() - started)
+        return self.counts['generated']
+    
+    def print_summary(self, total: int, wall_time: float):
+        """Print counts, throughput and time spent per stage"""
+        processed = self.counts['generated'] + self.counts['existing'] + self.counts['failed']
+        throughput = processed / wall_time if wall_time > 0 else 0
+        
+        print(UIStyle.section_header("Batch Import Summary"))
+        print(f"  Generated: {self.counts['generated']}/{total}"
+              f"  Existing: {self.counts['existing']}"
+              f"  Failed: {self.counts['failed']}"
+              f"  Paid-only skipped: {self.counts['paid']}")
+        print(f"  Wall time: {wall_time:.2f}s  Throughput: {throughput:.2f} problems/s")
+        if self.failed:
+            shown = ', '.join(self.failed[:10]) + (' ...' if len(self.failed) > 10 else '')
+            print(f"  Failed after retries: {shown}")
+            print("  Run the import again to retry them (imported problems are skipped)")
+        
+        print(UIStyle.section_header("Time per Stage"))
+        for stage in self.STAGES:
+            stage_time = self.stage_times[stage]
+            per_problem = stage_time / processed * 1000 if processed else 0
+            print(f"  {stage:<10} {stage_time:>8.2f}s  {per_problem:>8.1f} ms/problem")
+        print("  (fetch time is summed across workers and includes rate limiting)")
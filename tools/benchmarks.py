@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for LeetPlusPlus tools
+Times the code-generation hot paths against their previous implementations
+
+Usage:
+    python benchmarks.py signature [--repeat N]
+    python benchmarks.py types [--repeat N]
+    python benchmarks.py examples [--repeat N] [--synthetic N]
+    python benchmarks.py build [--jobs N] [--compiler CXX]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from common import ColorPrinter
+from config import CACHE_DIR, PROJECT_ROOT, STL_TYPES
+from cpp_types import CppType, CppTypeConverter, _normalize_cached, _parse_type_cached
+from generate_solution import find_problem_files, problem_includes, render_precompiled_header
+import cpp_signature
+from example_extractor import extract_examples, format_output
+from ui_style import UIStyle
+
+
+# Representative LeetCode C++ signatures, covering the common type shapes
+COMMON_SIGNATURES = [
+    "vector<int> twoSum(vector<int>& nums, int target)",
+    "ListNode* addTwoNumbers(ListNode* l1, ListNode* l2)",
+    "int lengthOfLongestSubstring(string s)",
+    "double findMedianSortedArrays(vector<int>& nums1, vector<int>& nums2)",
+    "bool isValid(string s)",
+    "int maxDepth(TreeNode* root)",
+    "vector<vector<int>> threeSum(vector<int>& nums)",
+    "vector<vector<string>> groupAnagrams(vector<string>& strs)",
+    "int numIslands(vector<vector<char>>& grid)",
+    "TreeNode* buildTree(vector<int>& preorder, vector<int>& inorder)",
+    "long long countSubarrays(vector<int>& nums, long long k)",
+    "vector<long long> minOperations(vector<int>& nums, vector<int>& queries)",
+    "string longestCommonPrefix(vector<string>& strs)",
+    "void rotate(vector<vector<int>>& matrix)",
+    "Node* copyRandomList(Node* head)",
+    "vector<vector<pair<int, int>>> buildGraph(int n, vector<vector<int>>& edges)",
+    "int networkDelayTime(vector<vector<int>>& times, int n, int k)",
+    "unsigned long long countWays(const vector<int>& a, unsigned int mod)",
+    "bool canFinish(int numCourses, vector<vector<int>>& prerequisites)",
+    "vector<TreeNode*> generateTrees(int n)",
+    "int reverseBits(uint32_t n)",
+    "char findTheDifference(string s, string t)",
+]
+
+
+def _legacy_normalize_cpp_type(type_str: str) -> str:
+    """The per-call regex normalizer CppType replaced, kept as a baseline"""
+    type_str = re.sub(r'\s+', ' ', type_str).strip()
+    type_str = re.sub(r'\s*<\s*', '<', type_str)
+    type_str = re.sub(r'\s*>\s*', '>', type_str)
+    type_str = re.sub(r'(\w|>)\s+(\*+)', r'\1\2', type_str)
+    while re.search(r'\*\s+\*', type_str):
+        type_str = re.sub(r'\*\s+\*', '**', type_str)
+    type_str = re.sub(r'(\w|>)\s+(&)', r'\1\2', type_str)
+    type_str = re.sub(r'const(\w)', r'const \1', type_str)
+    if 'std::' not in type_str:
+        for stl_type in STL_TYPES:
+            type_str = re.sub(rf'\b(?<!::){stl_type}(?=\s*<|\b)', f'std::{stl_type}', type_str)
+    return type_str
+
+
+def _legacy_extract_signature(cpp_snippet: str) -> Optional[str]:
+    """The regex-based extractor the tokenizer replaced, kept as a baseline"""
+    class_match = re.search(r'class\s+Solution\s*\{[^}]*public:\s*([^}]+)\}', cpp_snippet, re.DOTALL)
+    if not class_match:
+        return None
+    pattern = r'((?:(?:const|unsigned|signed|long|short|static|virtual)\s+)*\w+(?:\s*::\s*\w+)*(?:\s*<(?:[^<>]|<[^>]*>)*>)?(?:\s+\w+)*?)\s*((?:\*\s*)*(?:&\s*)?)\s*(\w+)\s*\(([^)]*)\)'
+    full_match = re.search(pattern, class_match.group(1))
+    if not full_match:
+        return None
+    return_type = _legacy_normalize_cpp_type(full_match.group(1).strip())
+    pointers_refs = re.sub(r'\s+', '', full_match.group(2).strip())
+    method_name = CppTypeConverter.to_pascal_case(full_match.group(3).strip())
+    params = full_match.group(4).strip()
+    if params:
+        params = ', '.join(_legacy_normalize_cpp_type(p.strip())
+                           for p in re.split(r',(?![^<>]*>)', params) if p.strip())
+    return f"{return_type}{pointers_refs} {method_name}({params})"
+
+
+def _extract_signature(cpp_snippet: str) -> Optional[str]:
+    signature = cpp_signature.find_method(cpp_snippet)
+    if signature is None:
+        return None
+    return signature.format(CppTypeConverter.to_pascal_case(signature.name))
+
+
+def _legacy_parse_input_string(input_str: str) -> List[str]:
+    """The character-by-character argument splitter the example extractor replaced"""
+    input_str = re.sub(r'<[^>]+>', '', input_str)
+    parts = []
+    current = ''
+    bracket_depth = 0
+    in_quotes = False
+    for char in input_str:
+        if char == '"' and (not current or current[-1] != '\\'):
+            in_quotes = not in_quotes
+        elif not in_quotes:
+            if char in '[{(':
+                bracket_depth += 1
+            elif char in ']})':
+                bracket_depth -= 1
+            elif char == ',' and bracket_depth == 0:
+                if current.strip():
+                    parts.append(current.strip())
+                current = ''
+                continue
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return [part.split('=', 1)[1].strip() if '=' in part else part for part in parts]
+
+
+def _legacy_extract_examples(content: str) -> List[dict]:
+    """The <pre> regex scan the streaming example extractor replaced, kept as a baseline"""
+    examples = []
+    patterns = [
+        (r'<strong>Input:</strong>\s*([^<]+?)\s*(?:<br\s*/?>|\n)\s*<strong>Output:</strong>\s*([^<]+?)(?:\s*(?:<br\s*/?>|\n|$))', re.IGNORECASE),
+        (r'Input:\s*([^\n]+?)\s*\n\s*Output:\s*([^\n]+?)(?:\s*(?:\n|$))', 0),
+        (r'<b>Input:</b>\s*([^<]+?)\s*(?:<br\s*/?>|\n)\s*<b>Output:</b>\s*([^<]+?)(?:\s*(?:<br\s*/?>|\n|$))', re.IGNORECASE),
+    ]
+    for block in re.findall(r'<pre>(.*?)</pre>', content, re.DOTALL | re.IGNORECASE):
+        block = block.strip()
+        for pattern, flags in patterns:
+            match = re.search(pattern, block, flags)
+            if match:
+                inputs = _legacy_parse_input_string(match.group(1).strip())
+                output = format_output(re.sub(r'<[^>]+>', '', match.group(2).strip()))
+                if inputs and output:
+                    examples.append({'inputs': inputs, 'output': output})
+                break
+    return examples
+
+
+def _as_snippet(signature: str) -> str:
+    """Wrap a signature in the class LeetCode serves as its C++ starter code"""
+    return f"class Solution {{\npublic:\n    {signature} {{\n        \n    }}\n}};"
+
+
+def signature_corpus() -> List[Tuple[str, str]]:
+    """(source, snippet) pairs: cached API responses, generated problems and common shapes"""
+    corpus = []
+    if CACHE_DIR.exists():
+        for path in CACHE_DIR.glob("*/*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if entry.get('endpoint') != 'select':
+                continue
+            for snippet in (entry.get('payload') or {}).get('codeSnippets') or []:
+                if snippet.get('langSlug') == 'cpp':
+                    corpus.append(('cache', snippet.get('code', '')))
+
+    for path in find_problem_files():
+        number = path.name.split('_', 1)[0]
+        signature = cpp_signature.find_method(path.read_text(encoding='utf-8'), f"Solution{number}")
+        if signature:
+            corpus.append(('problems', _as_snippet(str(signature))))
+
+    corpus.extend(('common', _as_snippet(signature)) for signature in COMMON_SIGNATURES)
+    return corpus
+
+
+def pathological_inputs() -> List[Tuple[str, str]]:
+    """Inputs that defeat or slow down the regex extractor"""
+    cases = []
+    for depth in (3, 8, 32):
+        nested = 'vector<' * depth + 'int' + '>' * depth
+        cases.append((f"nesting depth {depth}", _as_snippet(f"{nested} f({nested}& a)")))
+    params = ', '.join(f"vector<pair<int, int>>& p{i}" for i in range(200))
+    cases.append(("200 parameters", _as_snippet(f"int f({params})")))
+    for width in (1000, 4000):
+        cases.append((f"{width}-space run", "class Solution {\npublic:\n    int" + ' ' * width + "x\n};"))
+    cases.append(("2000 bare words", "class Solution {\npublic:\n    " + 'a ' * 2000 + "\n};"))
+    return cases
+
+
+def _time_per_call(func: Callable, inputs: List[str], repeat: int) -> float:
+    """Best-of-repeat seconds per input"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in inputs:
+            func(text)
+        best = min(best, (time.perf_counter() - start) / max(1, len(inputs)))
+    return best
+
+
+def bench_signature(repeat: int = 5) -> int:
+    """Compare the tokenizer/parser against the legacy regexes"""
+    corpus = signature_corpus()
+    snippets = [snippet for _, snippet in corpus]
+    sources = sorted({source for source, _ in corpus})
+
+    print(UIStyle.section_header("Signature Extraction"))
+    print(f"  Corpus: {len(snippets)} snippets ({', '.join(sources)})")
+
+    new_time = _time_per_call(_extract_signature, snippets, repeat)
+    old_time = _time_per_call(_legacy_extract_signature, snippets, repeat)
+    print(f"  {'parser':<10} {new_time * 1e6:>9.1f} us/snippet")
+    print(f"  {'regex':<10} {old_time * 1e6:>9.1f} us/snippet  ({old_time / new_time:.1f}x)")
+
+    differences = []
+    failures = 0
+    for snippet in snippets:
+        new, old = _extract_signature(snippet), _legacy_extract_signature(snippet)
+        if new is None:
+            failures += 1
+        elif new != old:
+            differences.append((old, new))
+    print(f"  Parsed: {len(snippets) - failures}/{len(snippets)}  "
+          f"Differs from regex: {len(differences)}")
+    for old, new in differences[:5]:
+        print(f"    regex:  {old}\n    parser: {new}")
+
+    print(UIStyle.section_header("Pathological Inputs"))
+    for label, snippet in pathological_inputs():
+        new_time = _time_per_call(_extract_signature, [snippet], 1)
+        old_time = _time_per_call(_legacy_extract_signature, [snippet], 1)
+        parsed = 'parsed' if _extract_signature(snippet) else 'rejected'
+        print(f"  {label:<20} parser {new_time * 1e3:>8.2f} ms ({parsed:<8})  regex {old_time * 1e3:>9.2f} ms")
+
+    if failures:
+        ColorPrinter.warning(f"{failures} corpus snippet(s) could not be parsed")
+    return 0
+
+
+def _legacy_type_queries(type_str: str) -> tuple:
+    """The substring checks test_parser used to make for every value"""
+    return ('ListNode' in type_str or 'TreeNode' in type_str, 'vector' in type_str,
+            'string' in type_str, type_str == 'bool')
+
+
+def _type_queries(type_str: str) -> tuple:
+    cpp_type = CppType.of(type_str)
+    return (cpp_type.is_list_node or cpp_type.is_tree_node, cpp_type.is_vector,
+            cpp_type.is_string, cpp_type.is_a('bool'))
+
+
+def bench_types(repeat: int = 5) -> int:
+    """Compare memoized CppType normalization and queries against the regex normalizer"""
+    types = []
+    for _, snippet in signature_corpus():
+        signature = cpp_signature.find_method(snippet)
+        if signature:
+            types.append(str(signature.return_type))
+            types.extend(str(p.type) for p in signature.params)
+    # Generation normalizes the same few types over and over; spell them the way snippets do
+    raw = [t.replace('std::', '').replace('&', ' &').replace(',', ' ,') for t in types]
+    workload = raw * 20
+
+    print(UIStyle.section_header("Type Normalization"))
+    print(f"  Workload: {len(workload)} calls over {len(set(raw))} distinct type strings")
+
+    def cold(text):
+        _normalize_cached.cache_clear()
+        _parse_type_cached.cache_clear()
+        return CppTypeConverter.normalize_cpp_type(text)
+
+    legacy_time = _time_per_call(_legacy_normalize_cpp_type, workload, repeat)
+    cold_time = _time_per_call(cold, raw, repeat)
+    CppTypeConverter.normalize_cpp_type(raw[0])
+    warm_time = _time_per_call(CppTypeConverter.normalize_cpp_type, workload, repeat)
+    print(f"  {'regex':<16} {legacy_time * 1e6:>8.2f} us/call")
+    print(f"  {'parse (cold)':<16} {cold_time * 1e6:>8.2f} us/call")
+    print(f"  {'memoized':<16} {warm_time * 1e6:>8.2f} us/call  ({legacy_time / warm_time:.0f}x)")
+
+    mismatches = [t for t in set(raw)
+                  if _legacy_normalize_cpp_type(t).replace(',', ', ').replace(',  ', ', ')
+                  != CppTypeConverter.normalize_cpp_type(t)]
+    print(f"  Differs from regex: {len(mismatches)}")
+    for text in mismatches[:5]:
+        print(f"    {text!r}: regex {_legacy_normalize_cpp_type(text)!r}, "
+              f"parser {CppTypeConverter.normalize_cpp_type(text)!r}")
+
+    print(UIStyle.section_header("Type Queries"))
+    legacy_time = _time_per_call(_legacy_type_queries, workload, repeat)
+    query_time = _time_per_call(_type_queries, workload, repeat)
+    wrong = [t for t in set(raw) if _legacy_type_queries(t) != _type_queries(t)]
+    print(f"  {'substring':<16} {legacy_time * 1e6:>8.2f} us/call")
+    print(f"  {'structural':<16} {query_time * 1e6:>8.2f} us/call")
+    print(f"  Answers differ for: {', '.join(sorted(wrong)) or 'none'}")
+    return 0
+
+
+def statement_corpus(synthetic: int) -> List[Tuple[str, str]]:
+    """(source, content) pairs: cached problem statements plus synthetic replay statements"""
+    corpus = []
+    if CACHE_DIR.exists():
+        for path in CACHE_DIR.glob("*/*.json"):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            payload = entry.get('payload') or {}
+            if entry.get('endpoint') == 'select' and payload.get('question'):
+                corpus.append(('cache', payload['question']))
+
+    if synthetic:
+        from replay_server import ReplayData
+        data = ReplayData.synthetic(synthetic)
+        for problem in data.problems:
+            corpus.append(('synthetic', data.question(problem['titleSlug'])['question']))
+    return corpus
+
+
+def large_statements() -> List[Tuple[str, str]]:
+    """Statements whose examples carry big arrays and strings"""
+    cases = []
+    for size in (1000, 10000, 100000):
+        nums = '[' + ','.join(str(i % 997) for i in range(size)) + ']'
+        grid = '[' + ','.join('[' + ','.join('1' * 10) + ']' for _ in range(size // 10)) + ']'
+        text = '&quot;' + 'ab' * (size // 2) + '&quot;'
+        example = (f"<pre>\n<strong>Input:</strong> nums = {nums}, grid = {grid}, s = {text}, k = 3\n"
+                   f"<strong>Output:</strong> {nums}\n<strong>Explanation:</strong> See above.\n</pre>\n")
+        cases.append((f"{size}-element example", "<p>Statement</p>\n" + example * 3))
+    return cases
+
+
+def bench_examples(repeat: int = 5, synthetic: int = 500) -> int:
+    """Compare the streaming example extractor against the legacy regex scan"""
+    corpus = statement_corpus(synthetic)
+    statements = [content for _, content in corpus]
+    sources = sorted({source for source, _ in corpus})
+
+    print(UIStyle.section_header("Example Extraction"))
+    print(f"  Corpus: {len(statements)} statements ({', '.join(sources) or 'empty'})")
+    if not statements:
+        ColorPrinter.warning("No statements to benchmark (pass --synthetic N or fetch some problems)")
+        return 1
+
+    new_time = _time_per_call(extract_examples, statements, repeat)
+    old_time = _time_per_call(_legacy_extract_examples, statements, repeat)
+    print(f"  {'streaming':<10} {new_time * 1e6:>9.1f} us/statement")
+    print(f"  {'regex':<10} {old_time * 1e6:>9.1f} us/statement  ({old_time / new_time:.2f}x)")
+
+    found = sum(len(extract_examples(content)) for content in statements)
+    legacy_found = sum(len(_legacy_extract_examples(content)) for content in statements)
+    differences = []
+    for content in statements:
+        new = [(ex['inputs'], ex['output']) for ex in extract_examples(content)]
+        old = [(ex['inputs'], ex['output']) for ex in _legacy_extract_examples(content)]
+        if new != old:
+            differences.append((old, new))
+    print(f"  Examples: {found} (regex found {legacy_found})  Statements that differ: {len(differences)}")
+    for old, new in differences[:3]:
+        print(f"    regex:     {old}\n    streaming: {new}")
+
+    print(UIStyle.section_header("Large Examples"))
+    for label, content in large_statements():
+        new_time = _time_per_call(extract_examples, [content], repeat)
+        old_time = _time_per_call(_legacy_extract_examples, [content], repeat)
+        print(f"  {label:<24} streaming {new_time * 1e3:>8.2f} ms  regex {old_time * 1e3:>8.2f} ms"
+              f"  ({old_time / new_time:.1f}x)")
+    return 0
+
+
+def _find_compiler(compiler: Optional[str]) -> Optional[str]:
+    """A gcc or clang driver: --compiler, then $CXX, then whichever is on PATH"""
+    for candidate in (compiler, os.environ.get('CXX'), 'g++', 'clang++'):
+        if candidate and shutil.which(candidate):
+            return candidate
+    return None
+
+
+def _compile(command: List[str]) -> Tuple[bool, float, str]:
+    """Run one compiler invocation, returning (succeeded, seconds, stderr)"""
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    return result.returncode == 0, time.perf_counter() - start, result.stderr
+
+
+def _build(sources: List[Path], flags: List[str], obj_dir: Path, jobs: int) -> Tuple[float, float, int]:
+    """Compile every source as its own translation unit, returning (wall, summed, failures)"""
+    commands = [flags + ['-c', '-x', 'c++', str(source), '-o', str(obj_dir / f"{index}.o")]
+                for index, source in enumerate(sources)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(_compile, commands))
+    wall = time.perf_counter() - start
+    return wall, sum(seconds for _, seconds, _ in results), sum(not ok for ok, _, _ in results)
+
+
+def bench_build(jobs: int = 0, compiler: Optional[str] = None) -> int:
+    """Time a full build of the problem files with and without the precompiled header"""
+    cxx = _find_compiler(compiler)
+    if not cxx:
+        ColorPrinter.error("No C++ compiler found (pass --compiler or set CXX; gcc and clang are supported)")
+        return 1
+    is_clang = 'clang' in subprocess.run([cxx, '--version'], capture_output=True, text=True).stdout.lower()
+    sources = find_problem_files()
+    if not sources:
+        ColorPrinter.warning("No problems in src/Problems to build")
+        return 1
+    jobs = jobs or os.cpu_count() or 1
+
+    # Each problem is compiled as its own translation unit, as in the source
+    # layout; the header layout compiles them all in main.cpp instead
+    flags = [cxx, '-std=c++20', '-O0', '-w',
+             '-I', str(PROJECT_ROOT / 'src'), '-I', str(PROJECT_ROOT / 'vendor')]
+    includes = problem_includes(sources)
+
+    print(UIStyle.section_header("Full Build"))
+    print(f"  Compiler: {cxx}  Jobs: {jobs}  Translation units: {len(sources)}")
+    print(f"  Precompiled header: {len(includes)} includes used by the problems")
+
+    with tempfile.TemporaryDirectory(prefix='lpp-build-') as tmp:
+        tmp_dir = Path(tmp)
+        header = tmp_dir / 'pch.h'
+        header.write_text(render_precompiled_header(includes), encoding='utf-8')
+        compiled = tmp_dir / ('pch.h.pch' if is_clang else 'pch.h.gch')
+        ok, pch_time, errors = _compile(flags + ['-x', 'c++-header', str(header), '-o', str(compiled)])
+        if not ok:
+            ColorPrinter.error(f"Precompiled header failed to build:\n{errors.strip()}")
+            return 1
+
+        plain_wall, plain_total, plain_failed = _build(sources, flags, tmp_dir, jobs)
+        # gcc picks up pch.h.gch next to the header given to -include
+        use_pch = ['-include-pch', str(compiled)] if is_clang else ['-include', str(header)]
+        pch_wall, pch_total, pch_failed = _build(sources, flags + use_pch, tmp_dir, jobs)
+
+    per_unit = 1000 / len(sources)
+    print(f"  {'without pch':<12} {plain_wall:>8.2f}s wall  {plain_total * per_unit:>8.1f} ms/unit")
+    print(f"  {'with pch':<12} {pch_wall + pch_time:>8.2f}s wall  {pch_total * per_unit:>8.1f} ms/unit"
+          f"  (pch {pch_time:.2f}s, {plain_wall / (pch_wall + pch_time):.2f}x)")
+    if plain_failed or pch_failed:
+        ColorPrinter.warning(f"{max(plain_failed, pch_failed)} problem file(s) failed to compile; "
+                             "their time is still included")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LeetPlusPlus micro-benchmarks')
+    subparsers = parser.add_subparsers(dest='command')
+    signature_parser = subparsers.add_parser('signature', help='C++ signature extraction')
+    signature_parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is kept)')
+    types_parser = subparsers.add_parser('types', help='C++ type normalization and queries')
+    types_parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is kept)')
+    examples_parser = subparsers.add_parser('examples', help='example extraction from problem statements')
+    examples_parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is kept)')
+    examples_parser.add_argument('--synthetic', type=int, default=500,
+                                 help='synthetic replay statements to add to the corpus')
+    build_parser = subparsers.add_parser('build', help='full build of the problems with and without pch.h')
+    build_parser.add_argument('--jobs', '-j', type=int, default=0, help='parallel compiles (default: one per core)')
+    build_parser.add_argument('--compiler', help='C++ compiler driver (default: $CXX, g++ or clang++)')
+    args = parser.parse_args()
+
+    if args.command == 'signature':
+        return bench_signature(args.repeat)
+    if args.command == 'types':
+        return bench_types(args.repeat)
+    if args.command == 'examples':
+        return bench_examples(args.repeat, args.synthetic)
+    if args.command == 'build':
+        return bench_build(args.jobs, args.compiler)
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,29 @@ Common utilities for LeetPlusPlus tools
 Provides shared functionality for API management, metadata handling, and more
 """
 
+import gzip
+import http.client
 import json
 import os
+import random
+import socket
 import subprocess
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Mapping, Union
+from urllib.parse import urlencode, urlsplit
+
+from config import (
+    METADATA_FILE, METADATA_DB_FILE, METADATA_BACKEND, HTTP_POOL_SIZE, HTTP_ACCEPT_GZIP,
+    HTTP_RETRIES, HTTP_RETRY_BASE_DELAY, HTTP_RETRY_MAX_DELAY, HTTP_BREAKER_THRESHOLD, HTTP_BREAKER_COOLDOWN,
+    API_START_WAIT_TIME, API_PROBE_TIMEOUT, API_PROBE_INITIAL_DELAY, API_PROBE_MAX_DELAY,
+    API_HEALTH_TTL, API_SERVER_RECORD, API_SERVER_LOG, API_BACKEND
+)
+from metadata_store import create_store, JsonMetadataStore
 
 try:
     from colorama import init, Fore, Back, Style
@@ -53,26 +67,155 @@ class ColorPrinter:
 class APIServerManager:
     """Manages the AlfaLeetCode API server"""
     
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    # Process-wide "known healthy until" deadlines, keyed by base URL
+    _healthy_until: Dict[str, float] = {}
+    
+    def __init__(self, base_url: str = "http://localhost:3000", backend: str = API_BACKEND):
         self.base_url = base_url
+        self.backend = backend  # "node" or "replay"
         self.root_dir = Path(__file__).parent.parent
         self.api_dir = self.root_dir / "vendor" / "AlfaLeetCode"
+        self.record_file = API_SERVER_RECORD
+    
+    def _mark_healthy(self):
+        APIServerManager._healthy_until[self.base_url] = time.monotonic() + API_HEALTH_TTL
     
-    def check_available(self) -> bool:
-        """Check if API server is running"""
+    def check_available(self, use_cache: bool = True) -> bool:
+        """Check if API server is running (trusts a recent successful probe)"""
+        if use_cache and APIServerManager._healthy_until.get(self.base_url, 0) > time.monotonic():
+            return True
         try:
-            with urllib.request.urlopen(f"{self.base_url}/", timeout=2) as response:
-                return response.status == 200
-        except:
+            HTTPClient.request(f"{self.base_url}/", timeout=API_PROBE_TIMEOUT)
+        except HTTPError:
+            pass  # Any HTTP response means the server is up
+        except Exception:
+            APIServerManager._healthy_until.pop(self.base_url, None)
+            return False
+        self._mark_healthy()
+        self._write_record(healthy=True)
+        return True
+    
+    def wait_until_ready(self, timeout: float = API_START_WAIT_TIME,
+                         process: Optional[subprocess.Popen] = None) -> bool:
+        """Probe with exponential backoff (starting at a few ms) until the server answers"""
+        deadline = time.monotonic() + timeout
+        delay = API_PROBE_INITIAL_DELAY
+        while True:
+            if self.check_available(use_cache=False):
+                return True
+            if process is not None and process.poll() is not None:
+                return False  # The candidate command exited without serving
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, API_PROBE_MAX_DELAY)
+    
+    def _read_record(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.record_file, 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if record.get('base_url') == self.base_url else None
+    
+    def _write_record(self, pid: Optional[int] = None, healthy: bool = False):
+        """Remember the server (pid, URL, last healthy time) for later invocations"""
+        record = self._read_record() or {'base_url': self.base_url}
+        if pid is not None:
+            record['pid'] = pid
+            record['started'] = time.time()
+        if healthy:
+            record['last_healthy'] = time.time()
+        try:
+            ensure_directory(self.record_file.parent)
+            with open(self.record_file, 'w') as f:
+                json.dump(record, f)
+        except OSError:
+            pass
+    
+    def _clear_record(self):
+        try:
+            self.record_file.unlink()
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        if os.name == 'nt':
+            return False  # os.kill would terminate the process on Windows
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+    
+    def reuse_recorded_server(self) -> bool:
+        """Trust a server recorded by an earlier invocation if its process is alive and was healthy recently"""
+        record = self._read_record()
+        if not record or not record.get('pid') or not record.get('last_healthy'):
+            return False
+        if not self._pid_alive(record['pid']):
+            self._clear_record()
+            return False
+        if time.time() - record['last_healthy'] > API_HEALTH_TTL:
             return False
+        self._mark_healthy()
+        return True
     
     def validate_path(self, path: Path) -> bool:
         """Validate path to prevent shell injection"""
         path_str = str(path)
         return not any(char in path_str for char in ['&', '|', ';', '$', '`', '\n', '\r'])
     
+    def _spawn(self, cmd: List[str], cwd: Path) -> Optional[subprocess.Popen]:
+        """Start a detached server process and wait for it to answer, or None if it never does"""
+        env = dict(os.environ)
+        port = urlsplit(self.base_url).port
+        if port:
+            env['PORT'] = str(port)
+        
+        ensure_directory(API_SERVER_LOG.parent)
+        # Detach so the server outlives this invocation and can be reused
+        with open(API_SERVER_LOG, 'ab') as log:
+            process = subprocess.Popen(
+                cmd,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=(os.name != 'nt')
+            )
+        if self.wait_until_ready(process=process):
+            self._write_record(pid=process.pid, healthy=True)
+            return process
+        if process.poll() is None:
+            process.terminate()
+        return None
+    
+    def start_replay_server(self) -> Optional[subprocess.Popen]:
+        """Start the stdlib replay server (tools/replay_server.py) in place of the Node API"""
+        parts = urlsplit(self.base_url)
+        cmd = [sys.executable, str(Path(__file__).parent / "replay_server.py"),
+               "--host", parts.hostname or "127.0.0.1", "--port", str(parts.port or 80)]
+        try:
+            return self._spawn(cmd, self.root_dir)
+        except OSError as e:
+            ColorPrinter.error(f"Failed to start replay server: {e}")
+            return None
+    
     def start_server(self, auto_mode: bool = True) -> Optional[subprocess.Popen]:
         """Start the API server"""
+        if self.backend == "replay":
+            if auto_mode:
+                ColorPrinter.info("Starting replay API server automatically...")
+            return self.start_replay_server()
+        
         if not self.api_dir.exists():
             ColorPrinter.error("AlfaLeetCode directory not found!")
             return None
@@ -98,11 +241,9 @@ class APIServerManager:
                 
                 # Wait for server to start
                 ColorPrinter.info("Waiting for API server to start...")
-                for i in range(10):
-                    time.sleep(1)
-                    if self.check_available():
-                        ColorPrinter.success("API server started successfully!")
-                        return None
+                if self.wait_until_ready():
+                    ColorPrinter.success("API server started successfully!")
+                    return None
             else:
                 # For Linux/Mac, try different approaches
                 npm_commands = [
@@ -113,14 +254,8 @@ class APIServerManager:
                 
                 for cmd in npm_commands:
                     try:
-                        process = subprocess.Popen(
-                            cmd,
-                            cwd=self.api_dir,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        time.sleep(3)
-                        if self.check_available():
+                        process = self._spawn(cmd, self.api_dir)
+                        if process is not None:
                             return process
                     except (FileNotFoundError, OSError):
                         continue
@@ -132,7 +267,7 @@ class APIServerManager:
     
     def ensure_running(self) -> bool:
         """Ensure the API server is running, start if needed"""
-        if self.check_available():
+        if self.reuse_recorded_server() or self.check_available():
             return True
         
         ColorPrinter.warning("API server not running. Starting automatically...")
@@ -142,88 +277,534 @@ class APIServerManager:
         return self.check_available()
 
 
+class MetadataSnapshot:
+    """Read-only, decoded view of one metadata store at a point in time"""
+    
+    def __init__(self, metadata: Dict[str, Any], stamp: Optional[tuple]):
+        self.stamp = stamp
+        entries = {}
+        problems = []
+        for problem_id, problem_data in sorted(metadata.items(), key=lambda x: int(x[0])):
+            entries[problem_id] = MappingProxyType(problem_data)
+            problems.append(MappingProxyType(dict(problem_data, id=problem_id)))
+        self.metadata: Mapping[str, Mapping[str, Any]] = MappingProxyType(entries)
+        self.problems = tuple(problems)
+
+
+class MetadataCache:
+    """
+    Process-wide metadata cache shared by all MetadataManager instances
+    
+    Snapshots are keyed on the store's file path and revalidated with a stat
+    (mtime/size) on every access, so a session decodes the store once and
+    picks up changes made by other processes.
+    """
+    
+    _snapshots: Dict[str, MetadataSnapshot] = {}
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _stamp(path: Path) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    @classmethod
+    def lookup(cls, path: Path) -> Optional[MetadataSnapshot]:
+        """Get the cached snapshot for a path if it is still current"""
+        key = str(path)
+        with cls._lock:
+            snapshot = cls._snapshots.get(key)
+        if snapshot is not None and snapshot.stamp == cls._stamp(path):
+            return snapshot
+        return None
+    
+    @classmethod
+    def load(cls, path: Path, loader) -> MetadataSnapshot:
+        """Get the snapshot for a path, calling loader() to rebuild it if stale"""
+        snapshot = cls.lookup(path)
+        if snapshot is not None:
+            return snapshot
+        
+        # Stamp before reading so a concurrent write forces a later reload
+        stamp = cls._stamp(path)
+        snapshot = MetadataSnapshot(loader(), stamp)
+        with cls._lock:
+            cls._snapshots[str(path)] = snapshot
+        return snapshot
+    
+    @classmethod
+    def invalidate(cls, path: Optional[Path] = None):
+        """Drop the snapshot for a path (or all snapshots)"""
+        with cls._lock:
+            if path is None:
+                cls._snapshots.clear()
+            else:
+                cls._snapshots.pop(str(path), None)
+
+
 class MetadataManager:
     """Handles problem metadata loading and saving"""
     
-    def __init__(self, metadata_file: Optional[Path] = None):
+    def __init__(self, metadata_file: Optional[Path] = None, backend: Optional[str] = None):
         if metadata_file is None:
-            self.metadata_file = Path(__file__).parent.parent / "metadata.json"
+            self.metadata_file = METADATA_FILE
+            db_file = METADATA_DB_FILE
         else:
             self.metadata_file = metadata_file
+            db_file = metadata_file.with_suffix('.db')
+        self.store = create_store(backend or METADATA_BACKEND, self.metadata_file, db_file)
     
-    def load(self) -> Dict[str, Any]:
-        """Load metadata from file"""
-        if not self.metadata_file.exists():
-            return {}
-        
+    def _snapshot(self) -> Optional[MetadataSnapshot]:
+        """Get the shared snapshot of this store, loading it if needed"""
         try:
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
+            return MetadataCache.load(self.store.storage_path, self.store.load_all)
         except Exception as e:
             ColorPrinter.error(f"Failed to load metadata: {e}")
-            return {}
+            return None
+    
+    def load(self) -> Mapping[str, Mapping[str, Any]]:
+        """Load metadata as a read-only mapping shared across the process"""
+        snapshot = self._snapshot()
+        return snapshot.metadata if snapshot else MappingProxyType({})
     
     def save(self, metadata: Dict[str, Any]) -> bool:
-        """Save metadata to file"""
-        try:
-            # Sort by problem number for readability
-            sorted_metadata = dict(sorted(metadata.items(), key=lambda x: int(x[0])))
-            
-            with open(self.metadata_file, 'w') as f:
-                json.dump(sorted_metadata, f, indent=2)
-            
+        """Replace all metadata in the store"""
+        try:
+            self.store.save_all(metadata)
             return True
         except Exception as e:
             ColorPrinter.error(f"Failed to save metadata: {e}")
             return False
+        finally:
+            MetadataCache.invalidate(self.store.storage_path)
     
-    def get_problem_by_id(self, problem_id: str) -> Optional[Dict[str, Any]]:
+    def upsert(self, problem_id: str, problem_data: Dict[str, Any]) -> bool:
+        """Insert or replace a single problem entry"""
+        try:
+            self.store.upsert(str(problem_id), problem_data)
+            return True
+        except Exception as e:
+            ColorPrinter.error(f"Failed to save metadata: {e}")
+            return False
+        finally:
+            MetadataCache.invalidate(self.store.storage_path)
+    
+    def merge(self, entries: Dict[str, Dict[str, Any]]) -> bool:
+        """Insert or replace many problem entries in one write"""
+        try:
+            self.store.upsert_many({str(k): v for k, v in entries.items()})
+            return True
+        except Exception as e:
+            ColorPrinter.error(f"Failed to save metadata: {e}")
+            return False
+        finally:
+            MetadataCache.invalidate(self.store.storage_path)
+    
+    def get_state(self, key: str) -> Optional[Any]:
+        """Read a bookkeeping value (e.g. sync state) kept alongside the metadata"""
+        try:
+            return self.store.get_state(key)
+        except Exception as e:
+            ColorPrinter.error(f"Failed to read metadata state: {e}")
+            return None
+    
+    def set_state(self, key: str, value: Any) -> bool:
+        """Write a bookkeeping value kept alongside the metadata"""
+        try:
+            self.store.set_state(key, value)
+            return True
+        except Exception as e:
+            ColorPrinter.error(f"Failed to write metadata state: {e}")
+            return False
+        finally:
+            MetadataCache.invalidate(self.store.storage_path)
+    
+    def get_problem_by_id(self, problem_id: str) -> Optional[Mapping[str, Any]]:
         """Get a specific problem by ID"""
-        metadata = self.load()
-        return metadata.get(str(problem_id))
+        snapshot = MetadataCache.lookup(self.store.storage_path)
+        if snapshot is None and self.store.name == "json":
+            # Without an index a lookup costs a full read anyway, so keep it
+            snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot.metadata.get(str(problem_id))
+        
+        try:
+            return self.store.get(str(problem_id))
+        except Exception as e:
+            ColorPrinter.error(f"Failed to load metadata: {e}")
+            return None
     
-    def get_problems_list(self) -> list:
-        """Get list of all problems with IDs included"""
-        metadata = self.load()
-        problems_list = []
+    def get_problem_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get a specific problem by title slug (includes its ID)"""
+        try:
+            return self.store.get_by_slug(slug)
+        except Exception as e:
+            ColorPrinter.error(f"Failed to load metadata: {e}")
+            return None
+    
+    def query(self, difficulty: Optional[str] = None, topic: Optional[str] = None) -> list:
+        """Get problems matching an exact difficulty and/or topic, with IDs included"""
+        try:
+            return self.store.query(difficulty=difficulty, topic=topic)
+        except Exception as e:
+            ColorPrinter.error(f"Failed to load metadata: {e}")
+            return []
+    
+    def get_problems_list(self) -> tuple:
+        """Get read-only list of all problems with IDs included, sorted by ID"""
+        snapshot = self._snapshot()
+        return snapshot.problems if snapshot else ()
+    
+    def import_json(self, json_file: Optional[Path] = None) -> bool:
+        """Replace stored metadata with the contents of a metadata.json file"""
+        json_file = json_file or self.metadata_file
+        if not json_file.exists():
+            ColorPrinter.error(f"Metadata file not found: {json_file}")
+            return False
+        try:
+            return self.save(JsonMetadataStore(json_file).load_all())
+        except Exception as e:
+            ColorPrinter.error(f"Failed to import metadata: {e}")
+            return False
+    
+    def export_json(self, json_file: Optional[Path] = None) -> bool:
+        """Write all stored metadata to a metadata.json file"""
+        json_file = json_file or self.metadata_file
+        try:
+            metadata = {problem_id: dict(data) for problem_id, data in self.load().items()}
+            JsonMetadataStore(json_file).save_all(metadata)
+            return True
+        except Exception as e:
+            ColorPrinter.error(f"Failed to export metadata: {e}")
+            return False
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent keep-alive HTTP connections
+    
+    Idle connections are kept per (scheme, host, port) and handed out through
+    connection(), so concurrent fetchers share sockets instead of opening a
+    new TCP connection for every request.
+    """
+    
+    def __init__(self, max_idle_per_host: int = HTTP_POOL_SIZE):
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+    
+    def _checkout(self, key: tuple, timeout: float):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
         
-        for problem_id, problem_data in metadata.items():
-            problem_with_id = problem_data.copy()
-            problem_with_id['id'] = problem_id
-            problems_list.append(problem_with_id)
+        if conn is None:
+            scheme, host, port = key
+            conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = conn_class(host, port, timeout=timeout)
+            conn.reused = False
+        else:
+            conn.reused = True
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+    
+    def _checkin(self, key: tuple, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+    
+    @contextmanager
+    def connection(self, url: str, timeout: float = 10):
+        """Check out a connection for the URL's host; it is returned on success"""
+        parts = urlsplit(url)
+        default_port = 443 if parts.scheme == 'https' else 80
+        key = (parts.scheme or 'http', parts.hostname, parts.port or default_port)
+        
+        conn = self._checkout(key, timeout)
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        
+        if getattr(conn, 'keep_alive', True):
+            self._checkin(key, conn)
+        else:
+            conn.close()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+
+class RequestError(Exception):
+    """
+    Failed request, classified by kind
+    
+    kind is one of 'timeout', 'connection', 'server' (5xx/429), 'client'
+    (other 4xx), 'decode' (truncated or malformed body) or 'circuit_open'.
+    Only retryable errors are retried by HTTPClient.fetch_json.
+    """
+    
+    def __init__(self, message: str, kind: str, retryable: bool):
+        super().__init__(message)
+        self.kind = kind
+        self.retryable = retryable
+
+
+class HTTPError(RequestError):
+    """Non-2xx response from the server"""
+    
+    RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+    
+    def __init__(self, status: int, reason: str, retry_after: Optional[float] = None):
+        retryable = status in self.RETRYABLE_STATUSES
+        kind = 'server' if status >= 500 or status == 429 else 'client'
+        super().__init__(f"HTTP Error {status}: {reason}", kind, retryable)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RequestError):
+    """Request refused locally because the endpoint's circuit is open"""
+    
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint} (retry in {retry_in:.1f}s)", 'circuit_open', False)
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def classify_error(error: BaseException) -> RequestError:
+    """Wrap a low-level exception from a request in a RequestError"""
+    if isinstance(error, RequestError):
+        return error
+    if isinstance(error, (socket.timeout, TimeoutError)):
+        return RequestError(f"Timed out: {error}", 'timeout', True)
+    if isinstance(error, (http.client.IncompleteRead, EOFError, gzip.BadGzipFile, ValueError)):
+        return RequestError(f"Truncated or malformed response: {error}", 'decode', True)
+    if isinstance(error, (OSError, http.client.HTTPException)):
+        return RequestError(f"URL Error: {error}", 'connection', True)
+    return RequestError(f"Request failed: {error}", 'unknown', False)
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker
+    
+    After `threshold` consecutive failures an endpoint's circuit opens and
+    requests to it fail fast for `cooldown` seconds. Then a single trial
+    request is let through (half-open): success closes the circuit, failure
+    opens it again. A 4xx answer counts as success, since the server
+    responded.
+    """
+    
+    def __init__(self, threshold: int = HTTP_BREAKER_THRESHOLD, cooldown: float = HTTP_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Circuit key for a URL: host, port and path without the query"""
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path or '/'}"
+    
+    def before_request(self, endpoint: str) -> bool:
+        """
+        Raise CircuitOpenError if the endpoint's circuit is open
         
-        # Sort by problem ID numerically
-        problems_list.sort(key=lambda p: int(p['id']))
-        return problems_list
+        Returns True if this request is the half-open trial; the caller must
+        then call end_trial once it's done, whatever the outcome.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return False
+            remaining = opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or self._trial.get(endpoint):
+                raise CircuitOpenError(endpoint, max(remaining, 0))
+            self._trial[endpoint] = True  # Half-open: let this one request through
+            return True
+    
+    def end_trial(self, endpoint: str):
+        """Let another trial through, if the last one ended without recording an outcome"""
+        with self._lock:
+            self._trial.pop(endpoint, None)
+    
+    def record_success(self, endpoint: str):
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+            self._trial.pop(endpoint, None)
+    
+    def record_failure(self, endpoint: str):
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if self._trial.pop(endpoint, False) or failures >= self.threshold:
+                self._opened_at[endpoint] = time.monotonic()
+    
+    def is_open(self, endpoint: str) -> bool:
+        with self._lock:
+            return endpoint in self._opened_at
+    
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._opened_at.clear()
+            self._trial.clear()
 
 
 class HTTPClient:
-    """Wrapper for urllib with consistent error handling"""
+    """Pooled keep-alive HTTP client with retries, circuit breaking and consistent error handling"""
+    
+    pool = ConnectionPool()
+    breaker = CircuitBreaker()
+    _decoder = json.JSONDecoder()
     
     @staticmethod
-    def get(url: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
-        """Make GET request and return JSON response"""
-        try:
-            with urllib.request.urlopen(url, timeout=timeout) as response:
-                data = response.read()
-                return json.loads(data.decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            ColorPrinter.error(f"HTTP Error {e.code}: {e.reason}")
-            return None
-        except urllib.error.URLError as e:
-            ColorPrinter.error(f"URL Error: {e.reason}")
-            return None
-        except Exception as e:
-            ColorPrinter.error(f"Request failed: {e}")
+    def request(url: str, timeout: float = 10, accept_gzip: bool = HTTP_ACCEPT_GZIP) -> bytes:
+        """Make GET request over a pooled connection and return the decoded body bytes"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        
+        headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if accept_gzip:
+            headers['Accept-Encoding'] = 'gzip'
+        
+        # A reused socket may have been closed by the server while idle;
+        # retry exactly once on a fresh connection in that case
+        for attempt in range(2):
+            try:
+                with HTTPClient.pool.connection(url, timeout) as conn:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    body = response.read()
+                    conn.keep_alive = not response.will_close
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if attempt == 0 and getattr(conn, 'reused', False):
+                    continue
+                raise
+            break
+        
+        if response.getheader('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        if response.status >= 400:
+            retry_after = response.getheader('Retry-After')
+            raise HTTPError(response.status, response.reason,
+                            float(retry_after) if retry_after and retry_after.isdigit() else None)
+        return body
+    
+    @staticmethod
+    def backoff_delay(attempt: int, error: Optional[RequestError] = None) -> float:
+        """Full-jitter exponential backoff, honoring a server's Retry-After"""
+        ceiling = min(HTTP_RETRY_MAX_DELAY, HTTP_RETRY_BASE_DELAY * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, HTTP_RETRY_MAX_DELAY))
+        return delay
+    
+    @staticmethod
+    def fetch_json(url: str, timeout: float = 10, retries: int = HTTP_RETRIES) -> Any:
+        """
+        GET a JSON document, retrying transient failures
+        
+        Timeouts, connection errors, 5xx/429 responses and truncated bodies
+        are retried up to `retries` times with jittered exponential backoff.
+        Raises RequestError (or CircuitOpenError) once the request gives up.
+        """
+        endpoint = CircuitBreaker.endpoint(url)
+        attempt = 0
+        while True:
+            trial = HTTPClient.breaker.before_request(endpoint)
+            try:
+                body = HTTPClient.request(url, timeout)
+                result = HTTPClient._decoder.decode(body.decode('utf-8'))
+            except Exception as e:
+                error = classify_error(e)
+                if error.kind == 'client':
+                    # The server answered; the endpoint is healthy
+                    HTTPClient.breaker.record_success(endpoint)
+                    raise error
+                HTTPClient.breaker.record_failure(endpoint)
+                if not error.retryable or attempt >= retries:
+                    raise error
+                time.sleep(HTTPClient.backoff_delay(attempt, error))
+                attempt += 1
+                continue
+            else:
+                HTTPClient.breaker.record_success(endpoint)
+                return result
+            finally:
+                if trial:
+                    HTTPClient.breaker.end_trial(endpoint)
+    
+    @staticmethod
+    def get(url: str, timeout: int = 10, retries: int = HTTP_RETRIES) -> Optional[Dict[str, Any]]:
+        """Make GET request and return JSON response (None once retries are exhausted)"""
+        try:
+            return HTTPClient.fetch_json(url, timeout, retries)
+        except RequestError as e:
+            ColorPrinter.error(str(e))
             return None
     
     @staticmethod
-    def get_with_params(base_url: str, params: Dict[str, str], timeout: int = 10) -> Optional[Dict[str, Any]]:
+    def get_with_params(base_url: str, params: Dict[str, str], timeout: int = 10,
+                        retries: int = HTTP_RETRIES) -> Optional[Dict[str, Any]]:
         """Make GET request with query parameters"""
-        from urllib.parse import urlencode
         query_string = urlencode(params)
         url = f"{base_url}?{query_string}"
-        return HTTPClient.get(url, timeout)
+        return HTTPClient.get(url, timeout, retries)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    
+    Allows short bursts of up to `burst` requests, then sustains `rate`
+    requests per second. acquire() blocks until a token is available.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """Take one token, returning how long the caller waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
 
 
 def get_project_root() -> Path:
@@ -238,4 +819,39 @@ def ensure_directory(path: Path) -> bool:
         return True
     except Exception as e:
         ColorPrinter.error(f"Failed to create directory {path}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def write_if_changed(path: Path, content: Union[str, bytes]) -> bool:
+    """
+    Atomically write text (or bytes) to a file unless it already holds exactly that
+    
+    Returns True if the file was written. An unchanged file keeps its mtime,
+    so make/MSBuild don't recompile what includes it. New content goes to a
+    temporary file that then replaces the target, so a reader never sees a
+    half-written header. Text is written as UTF-8 with newlines as-is ('\n'
+    on every platform), matching what premake writes for the same files.
+    """
+    path = Path(path)
+    data = content if isinstance(content, bytes) else content.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return True
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Empirical complexity for LeetPlusPlus
+Fits the timings of a scaling run (`lpp scale`) against common growth rates
+
+Each model is fitted as t(n) = a + b * f(n), with a and b non-negative, by
+least squares on relative error, so the 100 ns points at small n count as
+much as the 100 ms points at large n. The best model is the one with the
+smallest relative error, except that a simpler model within the timing noise
+of it wins. Its confidence is its share of the models' likelihoods under that
+noise: near 1 when every other model fits clearly worse, near 1/k when k
+models fit about as well. The fitted curve is then projected to the largest
+input the constraints allow and compared with a time limit.
+"""
+
+import csv
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def _exp2(n: float) -> float:
+    return math.ldexp(1.0, int(n))
+
+
+# Simplest first; ties go to the simpler model
+MODELS: List[Tuple[str, Callable[[float], float]]] = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log2(max(n, 1))),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log2(max(n, 1))),
+    ('O(n^2)', lambda n: float(n) * n),
+    ('O(2^n)', _exp2),
+]
+
+MIN_POINTS = 4          # Fewer sizes can't tell the models apart
+NOISE = 0.05            # Relative error expected from timing noise alone
+SIMPLER_MARGIN = 0.02   # A simpler model this close to the best error is preferred
+
+
+@dataclass
+class Fit:
+    """One model fitted to the timings"""
+    model: str
+    constant_ns: float      # a
+    coefficient_ns: float   # b, per unit of f(n) / f(largest measured n)
+    scale: float            # f(largest measured n)
+    error: float            # Root mean square relative error
+    confidence: float = 0.0
+
+    def predict_ns(self, n: float) -> float:
+        """The fitted time per call at n (inf if f(n) overflows)"""
+        function = dict(MODELS)[self.model]
+        try:
+            return self.constant_ns + self.coefficient_ns * (function(n) / self.scale)
+        except OverflowError:
+            return math.inf
+
+
+@dataclass
+class ComplexityReport:
+    points: List[Tuple[int, float]]
+    fits: List[Fit]         # Every model that could be fitted, best first
+    best: Fit
+    max_n: int
+    projected_ns: float
+    time_limit_ms: float
+
+    @property
+    def exceeds_limit(self) -> bool:
+        return self.projected_ns > self.time_limit_ms * 1e6
+
+    def to_metadata(self) -> Dict:
+        """The summary kept in the problem's metadata entry"""
+        return {
+            'model': self.best.model,
+            'confidence': round(self.best.confidence, 3),
+            'max_n': self.max_n,
+            'projected_ms': round(self.projected_ns / 1e6, 3) if math.isfinite(self.projected_ns) else None,
+            'time_limit_ms': self.time_limit_ms,
+            'exceeds_limit': self.exceeds_limit,
+        }
+
+
+def format_ns(ns: float) -> str:
+    """A duration in the units `lpp bench` prints"""
+    if not math.isfinite(ns):
+        return "inf"
+    for unit, size in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if ns >= size:
+            return f"{ns / size:.1f} {unit}"
+    return f"{ns:.1f} ns"
+
+
+def read_scaling_csv(path: Path) -> List[Tuple[int, float]]:
+    """
+    (n, ns per call) for every size in the CSV written by `LeetPlusPlus --scale-output`
+
+    The fastest sample is used rather than the median: it carries the least
+    scheduler and cache noise, which matters more for the shape of the curve
+    than the typical time does.
+    """
+    with open(path, newline='') as f:
+        return [(int(row['n']), float(row['min_ns'])) for row in csv.DictReader(f)]
+
+
+def _fit_model(model: str, function: Callable[[float], float],
+               points: List[Tuple[int, float]]) -> Optional[Fit]:
+    try:
+        values = [function(n) for n, _ in points]
+    except OverflowError:
+        return None
+    scale = max(values) or 1.0
+    g = [v / scale for v in values]
+    t = [time for _, time in points]
+    w = [1.0 / (time * time) for time in t]
+
+    # Weighted least squares for t = a + b * g, weights 1 / t^2
+    sw = sum(w)
+    sg = sum(wi * gi for wi, gi in zip(w, g))
+    sgg = sum(wi * gi * gi for wi, gi in zip(w, g))
+    st = sum(wi * ti for wi, ti in zip(w, t))
+    sgt = sum(wi * gi * ti for wi, gi, ti in zip(w, g, t))
+    det = sw * sgg - sg * sg
+    a, b = st / sw, 0.0
+    if model != 'O(1)' and det > 1e-12 * sw * sgg:
+        b = (sw * sgt - sg * st) / det
+        a = (st - b * sg) / sw
+        if b < 0:
+            # Time falls as n grows: no better than a constant
+            a, b = st / sw, 0.0
+        elif a < 0:
+            a, b = 0.0, sgt / sgg
+
+    error = math.sqrt(sum(((a + b * gi) - ti) ** 2 / (ti * ti) for gi, ti in zip(g, t)) / len(t))
+    return Fit(model, a, b, scale, error)
+
+
+def fit_complexity(points: List[Tuple[int, float]]) -> List[Fit]:
+    """Fit every model to (n, ns per call) points, best first, with confidences filled in"""
+    points = sorted((n, time) for n, time in points if n > 0 and time > 0)
+    if len({n for n, _ in points}) < MIN_POINTS:
+        raise ValueError(f"Need timings at {MIN_POINTS} or more sizes, got {len(points)}")
+
+    fits = [_fit_model(model, function, points) for model, function in MODELS]
+    fits = [fit for fit in fits if fit is not None]
+    lowest = min(fit.error for fit in fits)
+
+    # Likelihood of each model's residuals, with the noise at least NOISE
+    sigma = max(lowest, NOISE)
+    weights = [math.exp(-len(points) * (fit.error ** 2 - lowest ** 2) / (2 * sigma ** 2)) for fit in fits]
+    total = sum(weights)
+    for fit, weight in zip(fits, weights):
+        fit.confidence = weight / total
+
+    best = next(fit for fit in fits if fit.error <= lowest + SIMPLER_MARGIN)
+    return [best] + sorted((fit for fit in fits if fit is not best), key=lambda fit: fit.error)
+
+
+def analyze(points: List[Tuple[int, float]], max_n: int, time_limit_ms: float) -> ComplexityReport:
+    """Fit the timings and project the best model to max_n"""
+    fits = fit_complexity(points)
+    best = fits[0]
+    return ComplexityReport(points=sorted(points), fits=fits, best=best, max_n=max_n,
+                            projected_ns=best.predict_ns(max_n), time_limit_ms=time_limit_ms)
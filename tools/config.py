@@ -4,6 +4,7 @@ Configuration settings for LeetPlusPlus
 Centralizes all configuration values used across the tools
 """
 
+import os
 from pathlib import Path
 
 
@@ -15,18 +16,61 @@ BIN_DIR = PROJECT_ROOT / "bin"
 
 
 METADATA_FILE = PROJECT_ROOT / "metadata.json"
+METADATA_DB_FILE = PROJECT_ROOT / "metadata.db"
+METADATA_BACKEND = "sqlite"  # "sqlite" (indexed) or "json" (legacy single document)
 ALL_PROBLEMS_HEADER = PROBLEMS_DIR / "AllProblems.h"
+TEST_DATA_DIR = PROBLEMS_DIR / "Data"  # Binary test data, one <number>.bin per problem
+PRECOMPILED_HEADER = PROJECT_ROOT / "src" / "pch.h"  # Union of the includes used by the local problems
 TEMPLATE_FILE = TOOLS_DIR / "template.h"
+PROBLEM_LAYOUT = os.environ.get("LPP_PROBLEM_LAYOUT", "header")  # "header" (included via AllProblems.h) or "source" (one .cpp translation unit per problem)
+TEST_CASE_STYLE = os.environ.get("LPP_TEST_CASE_STYLE", "unrolled")  # "unrolled" (statements per example) or "table" (rows run by TestRunner::RunCases)
+TEST_DATA_INLINE_LIMIT = int(os.environ.get("LPP_TEST_DATA_INLINE_LIMIT", "4096"))  # Values with longer literals are loaded from TEST_DATA_DIR
+SCALING_SIZES = [100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000]  # Input sizes n timed by `lpp scale`
+STRESS_MAX_SIZE = 100000  # Length used when a constraint gives no upper bound
+STRESS_VALUE_RANGE = (-10000, 10000)  # Element range used when a constraint gives none
 
 
-API_BASE_URL = "http://localhost:3000"
+API_BACKEND = os.environ.get("LPP_API_BACKEND", "node")  # "node" (vendor/AlfaLeetCode) or "replay" (tools/replay_server.py)
+API_BASE_URL = os.environ.get("LPP_API_URL", "http://localhost:3000")
 API_TIMEOUT = 10  # seconds
 API_START_WAIT_TIME = 10  # seconds to wait for API to start
+API_PROBE_TIMEOUT = 0.5  # seconds per readiness probe of the local server
+API_PROBE_INITIAL_DELAY = 0.005  # first backoff between readiness probes, doubles each time
+API_PROBE_MAX_DELAY = 0.5  # cap on the backoff between readiness probes
+API_HEALTH_TTL = 30  # seconds a successful probe is trusted before probing again
+HTTP_POOL_SIZE = 8  # Idle keep-alive connections kept per host
+HTTP_ACCEPT_GZIP = True  # Ask the API for gzip-compressed responses
+HTTP_RETRIES = 3  # Retries for timeouts, connection errors, 5xx/429 and truncated bodies
+HTTP_RETRY_BASE_DELAY = 0.1  # seconds; backoff ceiling doubles per retry, actual delay is jittered
+HTTP_RETRY_MAX_DELAY = 2.0  # seconds
+HTTP_BREAKER_THRESHOLD = 5  # Consecutive failures that open an endpoint's circuit
+HTTP_BREAKER_COOLDOWN = 10  # seconds an open circuit fails fast before a trial request
 
 
 ALFA_LEETCODE_DIR = VENDOR_DIR / "AlfaLeetCode"
 
 
+CACHE_DIR = PROJECT_ROOT / ".cache" / "responses"
+API_SERVER_RECORD = PROJECT_ROOT / ".cache" / "api_server.json"  # pid/URL of an auto-started server
+API_SERVER_LOG = PROJECT_ROOT / ".cache" / "api_server.log"
+
+
+# Replay server (offline stand-in for the API, see tools/replay_server.py)
+REPLAY_FIXTURES_DIR = CACHE_DIR  # Recorded responses to replay; synthetic data if empty
+REPLAY_SYNTHETIC_COUNT = 3500  # Problems in the synthetic corpus
+REPLAY_SEED = 42
+REPLAY_LATENCY_MS = 0  # Added to every response
+REPLAY_JITTER_MS = 0  # Random extra latency, uniform in [0, jitter]
+REPLAY_ERROR_RATE = 0.0  # Fraction of requests answered with a 503
+REPLAY_DROP_RATE = 0.0  # Fraction of connections closed without a response
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU eviction threshold for cached responses
+CACHE_TTLS = {  # seconds before a cached response is refetched, per endpoint
+    "select": 30 * 24 * 3600,
+    "problems": 24 * 3600,
+    "daily": 3600,
+}
+
+
 APP_NAME = "LeetPlusPlus"
 APP_VERSION = "1.1.1"
 APP_GITHUB = "github.com/t3mps/LeetPlusPlus"
@@ -34,10 +78,21 @@ APP_GITHUB = "github.com/t3mps/LeetPlusPlus"
 
 EXE_RELEASE_PATH = BIN_DIR / "Release" / "x64" / f"{APP_NAME}.exe"
 EXE_DEBUG_PATH = BIN_DIR / "Debug" / "x64" / f"{APP_NAME}.exe"
+BENCH_TIME_MS = 100  # Sampling budget per timed ASSERT_EQ in `lpp bench`
+BENCH_WARMUP_RUNS = 3  # Untimed calls before sampling starts
+SCALING_CUTOFF_MS = 2000  # `lpp scale` skips larger sizes once a call takes this long
+COMPLEXITY_TIME_LIMIT_MS = 1000  # `lpp complexity` flags solutions projected to take longer per call at the largest input
 
 
 BATCH_FETCH_LIMIT = 100  # Number of problems to fetch at once
 BATCH_FETCH_DELAY = 0.5  # Delay between API calls in batch mode
+BATCH_FETCH_WORKERS = 8  # Concurrent page requests during metadata update
+BATCH_FETCH_RETRIES = 3  # Retries per page before a metadata update gives up
+BATCH_IMPORT_WORKERS = 4  # Concurrent problem fetches during batch import
+BATCH_IMPORT_RATE = 4.0  # Sustained API requests per second during batch import
+BATCH_IMPORT_BURST = 4  # Requests allowed back-to-back before the rate applies
+GENERATE_WORKERS = min(os.cpu_count() or 1, 61)  # Processes rendering headers in `lpp generate --all` (61 is the Windows limit)
+GENERATE_CHUNK_SIZE = 8  # Cached payloads handed to a generate worker at a time
 
 
 LEETCODE_TO_CPP_TYPES = {
@@ -53,12 +108,31 @@ LEETCODE_TO_CPP_TYPES = {
 }
 
 
+CPP_TYPE_CACHE_SIZE = 4096  # Memoized type-string -> CppType parses
+
+
 STL_TYPES = {
     'vector', 'string', 'map', 'unordered_map', 'set', 'unordered_set',
     'pair', 'queue', 'stack', 'priority_queue', 'deque', 'list'
 }
 
 
+STL_INCLUDES = {
+    'vector': '<vector>',
+    'string': '<string>',
+    'map': '<map>',
+    'unordered_map': '<unordered_map>',
+    'set': '<set>',
+    'unordered_set': '<unordered_set>',
+    'pair': '<utility>',
+    'queue': '<queue>',
+    'priority_queue': '<queue>',
+    'stack': '<stack>',
+    'deque': '<deque>',
+    'list': '<list>',
+}
+
+
 TOPIC_INCLUDES = {
     'Hash Table': '<unordered_map>',
     'Binary Tree': '<queue>',
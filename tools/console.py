@@ -15,7 +15,7 @@ from typing import List, Optional
 sys.path.append(str(Path(__file__).parent))
 from leetcode_fetcher_simple import LeetCodeAPI, generate_from_api_data
 from metadata_updater import MetadataUpdater
-from generate_solution import generate_solution
+from generate_solution import find_problem_files, generate_solution
 from common import ColorPrinter, APIServerManager, MetadataManager, Fore, Style
 from config import (
     APP_NAME, APP_VERSION, APP_GITHUB, API_BASE_URL, 
@@ -173,12 +173,16 @@ class LeetPlusPlusConsole(cmd.Cmd):
     def do_fetch(self, arg):
         """Fetch a LeetCode problem by number or slug
         
-        Usage: fetch <number|slug> [--force] [--interactive]
+        Usage: fetch <number|slug> [--force] [--interactive] [--offline] [--refresh]
+        
+        Responses are cached on disk; --offline serves only from the cache
+        and --refresh ignores it. See 'cache' for statistics.
         
         Examples:
             fetch 1                 # Fetch problem #1 (Two Sum)
             fetch two-sum          # Fetch by slug
             fetch 1 --force        # Overwrite existing solution
+            fetch 1 --offline      # Regenerate from the cached response
             fetch daily            # Fetch today's daily problem
         """
         args = shlex.split(arg)
@@ -189,9 +193,11 @@ class LeetPlusPlusConsole(cmd.Cmd):
         identifier = args[0]
         force = '--force' in args
         interactive = '--interactive' in args
+        api = LeetCodeAPI(offline='--offline' in args, refresh='--refresh' in args,
+                          cache=self.api.cache)
         
         # Check API availability and try to start if needed
-        if not self.api_manager.ensure_running():
+        if not api.offline and not self.api_manager.ensure_running():
             ColorPrinter.error("Cannot fetch problems - API server could not be started")
             return
         
@@ -199,7 +205,7 @@ class LeetPlusPlusConsole(cmd.Cmd):
             # Check if fetching daily problem
             if identifier.lower() == 'daily':
                 self._print_info("Fetching daily problem...")
-                problem_data = self.api.fetch_daily()
+                problem_data = api.fetch_daily()
                 if problem_data:
                     generate_from_api_data(problem_data, interactive_mode=interactive)
                     self._print_success("Daily problem fetched successfully!", banner=True)
@@ -231,17 +237,16 @@ class LeetPlusPlusConsole(cmd.Cmd):
                         return
                     
                     self._print_info(f"Found problem #{identifier}: {problem_info.get('title', 'Unknown')}")
-                    problem_data = self.api.fetch_problem(slug)
+                    problem_data = api.fetch_problem(slug)
                 else:
                     # Fetch by slug
-                    problem_data = self.api.fetch_problem(identifier)
+                    problem_data = api.fetch_problem(identifier)
                 
                 if problem_data:
                     try:
                         # Check if problem already exists
                         problem_id = problem_data.get('questionFrontendId', problem_data.get('questionId'))
-                        problems_dir = self.root_dir / "src" / "Problems"
-                        existing_files = list(problems_dir.glob(f"{problem_id}_*.h")) if problems_dir.exists() else []
+                        existing_files = find_problem_files(problem_id)
                         
                         if existing_files and not force:
                             # Problem exists, ask user what to do
@@ -444,7 +449,10 @@ class LeetPlusPlusConsole(cmd.Cmd):
     def do_update(self, arg):
         """Update problem metadata from LeetCode API
         
-        Usage: update
+        Usage: update [--full]
+        
+        Only problems added since the last update are fetched and merged.
+        Use --full to re-download the whole problem list.
         """
         # Check API availability and try to start if needed
         if not self.api_manager.ensure_running():
@@ -453,7 +461,7 @@ class LeetPlusPlusConsole(cmd.Cmd):
             
         try:
             self._print_info("Updating metadata from LeetCode API...")
-            self.metadata_updater.run()
+            self.metadata_updater.run(full='--full' in shlex.split(arg))
             self._load_metadata()  # Reload metadata
             ColorPrinter.success("Metadata update process completed")
         except Exception as e:
@@ -539,7 +547,7 @@ class LeetPlusPlusConsole(cmd.Cmd):
         print(UIStyle.section_header("Local Solutions"))
         problems_dir = self.root_dir / "src" / "Problems"
         if problems_dir.exists():
-            solution_files = list(problems_dir.glob("*.h"))
+            solution_files = find_problem_files()
             print(f"  Solution files: {len(solution_files)}")
             
             # Show progress bar
@@ -582,7 +590,7 @@ class LeetPlusPlusConsole(cmd.Cmd):
         
         # Pick random problem
         problem = random.choice(problems)
-        problem_id = problem.get('frontendQuestionId')
+        problem_id = problem.get('id')
         
         self._print_info(f"Selected problem #{problem_id}: {problem.get('title')} ({problem.get('difficulty')})")
         
@@ -604,6 +612,69 @@ class LeetPlusPlusConsole(cmd.Cmd):
         except Exception as e:
             self._print_error(f"Failed to regenerate AllProblems.h: {e}")
     
+    def do_cache(self, arg):
+        """Show or clear the API response cache
+        
+        Usage: cache [stats | clear [select|problems|daily]]
+        
+        Examples:
+            cache                  # Show cache statistics
+            cache clear            # Delete every cached response
+            cache clear daily      # Delete only cached daily challenges
+        """
+        args = shlex.split(arg)
+        cache = self.api.cache
+        
+        if args and args[0] == 'clear':
+            removed = cache.clear(args[1] if len(args) > 1 else None)
+            self._print_success(f"Removed {removed} cached responses")
+            return
+        
+        if args and args[0] != 'stats':
+            self._print_error("Usage: cache [stats | clear [endpoint]]")
+            return
+        
+        stats = cache.stats()
+        print(UIStyle.header("Response Cache", stats['directory']))
+        print(UIStyle.section_header("Entries"))
+        for endpoint, bucket in sorted(stats['endpoints'].items()):
+            print(f"  /{endpoint:<12} {bucket['entries']:>6}  {bucket['bytes'] / 1024:>10.1f} KB")
+        print(f"  {'Total':<13} {stats['entries']:>6}  {stats['bytes'] / 1024:>10.1f} KB"
+              f" of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+        if stats['expired']:
+            print(f"  {Fore.YELLOW}Expired:{Style.RESET_ALL} {stats['expired']} (kept for --offline)")
+        
+        print(UIStyle.section_header("This Session"))
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = (stats['hits'] / lookups * 100) if lookups else 0
+        print(f"  Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {hit_rate:.0f}%")
+        print(UIStyle.footer())
+    
+    def do_metadata(self, arg):
+        """Import or export metadata.json
+        
+        Usage: metadata <import|export> [path]
+        
+        Examples:
+            metadata export                # Write the store to metadata.json
+            metadata export backup.json    # Write the store to another file
+            metadata import                # Replace the store with metadata.json
+        """
+        args = shlex.split(arg)
+        if not args or args[0] not in ('import', 'export'):
+            self._print_error("Usage: metadata <import|export> [path]")
+            return
+        
+        json_file = Path(args[1]) if len(args) > 1 else None
+        
+        if args[0] == 'export':
+            if self.metadata_manager.export_json(json_file):
+                self._print_success(f"Metadata exported to: {json_file or self.metadata_manager.metadata_file}")
+        else:
+            if self.metadata_manager.import_json(json_file):
+                self._load_metadata()
+                self._print_success(f"Imported {len(self.metadata)} problems")
+    
     def do_clear(self, arg):
         """Clear the console screen
         
@@ -677,6 +748,8 @@ class LeetPlusPlusConsole(cmd.Cmd):
                 ("run", "Launch the TUI application"),
                 ("update", "Update problem metadata from API"),
                 ("status", "Show API server status and statistics"),
+                ("metadata", "Import or export metadata.json"),
+                ("cache [stats|clear]", "Show or clear the API response cache"),
                 ("api-start", "Instructions to start API server"),
                 ("clear", "Clear the console screen")
             ]
@@ -738,7 +811,7 @@ class LeetPlusPlusConsole(cmd.Cmd):
     # Tab completion support
     def complete_fetch(self, text, line, begidx, endidx):
         """Tab completion for fetch command"""
-        options = ['daily', '--force', '--interactive']
+        options = ['daily', '--force', '--interactive', '--offline', '--refresh']
         return [opt for opt in options if opt.startswith(text)]
     
     def complete_list(self, text, line, begidx, endidx):
@@ -746,6 +819,16 @@ class LeetPlusPlusConsole(cmd.Cmd):
         options = ['--difficulty', '--topic', '--limit', 'easy', 'medium', 'hard']
         return [opt for opt in options if opt.startswith(text)]
     
+    def complete_cache(self, text, line, begidx, endidx):
+        """Tab completion for cache command"""
+        options = ['stats', 'clear', 'select', 'problems', 'daily']
+        return [opt for opt in options if opt.startswith(text)]
+    
+    def complete_metadata(self, text, line, begidx, endidx):
+        """Tab completion for metadata command"""
+        options = ['import', 'export']
+        return [opt for opt in options if opt.startswith(text)]
+    
     def complete_random(self, text, line, begidx, endidx):
         """Tab completion for random command"""
         options = ['easy', 'medium', 'hard']
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Constraint parsing for LeetPlusPlus
+Turns a statement's "Constraints:" list into a per-parameter spec
+
+Each list item is flattened to text (10<sup>4</sup> becomes 10^4) and read
+as either a comparison chain ("1 <= nums.length <= 10^4"), an alias
+("n == matrix[i].length"), a range phrase ("The number of nodes in the
+list is in the range [0, 100]") or a description ("s consists of lowercase
+English letters"). The result maps each parameter name to a dict with any of:
+
+    length        [lo, hi] elements of a vector or string, or nodes of a list/tree
+    inner_length  [lo, hi] elements of each row of a 2D vector (or each string)
+    value         [lo, hi] the scalar itself, or every element
+    charset       characters a string (or char element) is made of
+    sorted        "asc" or "desc"
+    distinct      True if elements are unique
+
+Bounds are numbers, or the text of the bound when it refers to another
+value ("nums.length", "n - 1"); evaluate() resolves those once sizes are known.
+"""
+
+import ast
+import html
+import operator
+import re
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+from cpp_types import CppType
+
+
+_HEADING_RE = re.compile(r'Constraints\s*:?', re.IGNORECASE)
+_LIST_RE = re.compile(r'<ul\b[^>]*>(.*?)</ul\s*>', re.IGNORECASE | re.DOTALL)
+_ITEM_RE = re.compile(r'<li\b[^>]*>(.*?)</li\s*>', re.IGNORECASE | re.DOTALL)
+_SUP_RE = re.compile(r'<sup\b[^>]*>(.*?)</sup\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+_COMPARISON_RE = re.compile(r'\s*(<=|>=|==|<|>)\s*')
+_SUBJECT_RE = re.compile(r'^([A-Za-z_]\w*)((?:\[\w+\])*)(?:\.(length|size\(\)|val))?$')
+_RANGE_RE = re.compile(r'^(.+?)\s+(?:is|are)\s+in\s+the\s+range\s*\[(.+?),\s*(.+?)\]', re.IGNORECASE)
+_NODE_COUNT_RE = re.compile(r'number of nodes\b.*?\brange\s*\[(.+?),\s*(.+?)\]', re.IGNORECASE)
+_QUOTED_CHAR_RE = re.compile(r"'(.)'")
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_]\w*(?:\[\w+\])*(?:\.(?:length|size\(\)|val))?')
+
+_OPERATORS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Pow: operator.pow,
+    ast.USub: operator.neg, ast.UAdd: operator.pos,
+}
+
+# Keywords in a description and the characters they allow, checked in order
+_CHARSETS = [
+    ('lowercase', string.ascii_lowercase),
+    ('uppercase', string.ascii_uppercase),
+    ('digit', string.digits),
+    ('space', ' '),
+    ('symbol', string.punctuation),
+    ('punctuation', string.punctuation),
+]
+
+
+def constraint_lines(content: str) -> List[str]:
+    """The items of the list following the "Constraints:" heading, as plain text"""
+    heading = _HEADING_RE.search(content or '')
+    if not heading:
+        return []
+    block = _LIST_RE.search(content, heading.end())
+    if not block:
+        return []
+    lines = []
+    for item in _ITEM_RE.findall(block.group(1)):
+        text = html.unescape(_TAG_RE.sub('', _SUP_RE.sub(r'^\1', item)))
+        text = text.replace('≤', '<=').replace('≥', '>=').replace('×', '*')
+        text = ' '.join(text.split()).rstrip('.')
+        if text:
+            lines.append(text)
+    return lines
+
+
+def evaluate(expression: Any, env: Optional[Dict[str, float]] = None) -> Optional[float]:
+    """
+    The value of a bound such as "10^4", "2^31 - 1" or "nums.length - 1"
+
+    Names are looked up in env (keys like "nums.length" or "n"). Returns
+    None if the expression uses a name env doesn't have, or isn't arithmetic.
+    """
+    if isinstance(expression, (int, float)):
+        return expression
+    if not isinstance(expression, str):
+        return None
+    text = expression.replace('^', '**')
+    if env:
+        text = _IDENTIFIER_RE.sub(lambda m: str(env.get(m.group(), m.group())), text)
+    # "10,000" is a number, not a tuple
+    text = re.sub(r'(?<=\d),(?=\d{3}\b)', '', text)
+    try:
+        value = _evaluate_node(ast.parse(text.strip(), mode='eval').body)
+    except (SyntaxError, ValueError, TypeError, ZeroDivisionError, OverflowError):
+        return None
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def _evaluate_node(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        left, right = _evaluate_node(node.left), _evaluate_node(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > 64:
+            raise ValueError("exponent too large")
+        return _OPERATORS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPERATORS:
+        return _OPERATORS[type(node.op)](_evaluate_node(node.operand))
+    raise ValueError("not an arithmetic expression")
+
+
+class ConstraintParser:
+    """Builds the spec for one signature from its constraint lines"""
+
+    def __init__(self, params: List[Tuple[str, CppType]]):
+        self.types = {name: CppType.of(cpp_type) for name, cpp_type in params}
+        self.aliases = {}  # "n" -> [(param, field)]
+        self.spec = {}
+
+    def parse(self, lines: List[str]) -> Dict[str, Dict[str, Any]]:
+        for line in lines:
+            if not (self._parse_node_count(line) or self._parse_range(line) or self._parse_comparison(line)):
+                self._parse_description(line)
+        return {name: self.spec[name] for name in self.types if name in self.spec}
+
+    def _bound(self, text: str) -> Any:
+        """A number if the text is one, otherwise the text with aliases spelled out ("n" -> "nums.length")"""
+        value = evaluate(text)
+        if value is not None:
+            return value
+        return _IDENTIFIER_RE.sub(lambda m: self._subject_text(m.group()), text.strip())
+
+    def _subject_text(self, name: str) -> str:
+        targets = self.aliases.get(name)
+        if not targets:
+            return name
+        param, field = targets[0]
+        return {'length': f'{param}.length', 'inner_length': f'{param}[i].length'}.get(field, param)
+
+    def _set(self, targets: List[Tuple[str, str]], index: int, bound: Any):
+        for param, field in targets:
+            self.spec.setdefault(param, {}).setdefault(field, [None, None])[index] = bound
+
+    def _nodes(self) -> List[str]:
+        return [name for name, t in self.types.items() if t.is_list_node or t.is_tree_node]
+
+    def _resolve(self, subject: str) -> List[Tuple[str, str]]:
+        """The (param, field) pairs a subject such as "nums[i]" or "grid.length" constrains"""
+        subject = subject.strip()
+        if subject in self.aliases:
+            return self.aliases[subject]
+        match = _SUBJECT_RE.match(subject)
+        if not match:
+            return []
+        name, indexes, attribute = match.group(1), match.group(2), match.group(3)
+        depth = indexes.count('[')
+        if attribute == 'val':
+            return [(param, 'value') for param in self._nodes()] if name.lower() == 'node' or name in self._nodes() else []
+        if name not in self.types:
+            return []
+        if attribute:
+            if depth == 0:
+                return [(name, 'length')]
+            return [(name, 'inner_length')] if depth == 1 else []
+        cpp_type = self.types[name]
+        if depth or not (cpp_type.is_vector or cpp_type.is_string or cpp_type.is_pointer):
+            return [(name, 'value')]
+        return []
+
+    def _subjects(self, text: str) -> List[Tuple[str, str]]:
+        """Resolve "m, n" style lists of subjects"""
+        return [target for part in text.split(',') for target in self._resolve(part)]
+
+    def _parse_node_count(self, line: str) -> bool:
+        match = _NODE_COUNT_RE.search(line)
+        if not match:
+            return False
+        targets = [(param, 'length') for param in self._nodes()]
+        self._set(targets, 0, self._bound(match.group(1)))
+        self._set(targets, 1, self._bound(match.group(2)))
+        return True
+
+    def _parse_range(self, line: str) -> bool:
+        match = _RANGE_RE.match(line)
+        if not match:
+            return False
+        targets = self._subjects(match.group(1))
+        self._set(targets, 0, self._bound(match.group(2)))
+        self._set(targets, 1, self._bound(match.group(3)))
+        return bool(targets)
+
+    def _parse_comparison(self, line: str) -> bool:
+        parts = _COMPARISON_RE.split(line)
+        if len(parts) == 5 and parts[1] in ('<', '<=') and parts[3] in ('<', '<='):
+            # lo <= subject <= hi
+            targets = self._subjects(parts[2])
+            self._set(targets, 0, self._strict(self._bound(parts[0]), parts[1] == '<', 1))
+            self._set(targets, 1, self._strict(self._bound(parts[4]), parts[3] == '<', -1))
+            return bool(targets)
+        if len(parts) != 3:
+            return False
+
+        left, op, right = parts
+        if op == '==':
+            # "n == nums.length" or "nums.length == n" names a size for later lines
+            for alias, subject in ((left.strip(), right), (right.strip(), left)):
+                targets = self._resolve(subject)
+                if targets and re.fullmatch(r'[A-Za-z_]\w*', alias) and alias not in self.aliases:
+                    # A parameter named like the alias is bound by the same lines
+                    self.aliases[alias] = targets + self._resolve(alias)
+                    return True
+            return False
+
+        # One-sided: whichever side isn't a number is the subject
+        if evaluate(left) is not None and evaluate(right) is None:
+            left, right = right, left
+            op = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}[op]
+        targets = self._subjects(left)
+        if op in ('<', '<='):
+            self._set(targets, 1, self._strict(self._bound(right), op == '<', -1))
+        else:
+            self._set(targets, 0, self._strict(self._bound(right), op == '>', 1))
+        return bool(targets)
+
+    @staticmethod
+    def _strict(bound: Any, strict: bool, step: int) -> Any:
+        if not strict:
+            return bound
+        return bound + step if isinstance(bound, (int, float)) else f"{bound} {'+' if step > 0 else '-'} 1"
+
+    def _parse_description(self, line: str):
+        subject = None
+        for match in _IDENTIFIER_RE.finditer(line):
+            name = match.group().split('[')[0].split('.')[0]
+            if name in self.types:
+                subject = name
+                break
+        if subject is None:
+            return
+        lowered = line.lower()
+
+        if any(word in lowered for word in ('consist', ' is ', ' are ', 'only', 'either', 'one of')):
+            characters = ''.join(_QUOTED_CHAR_RE.findall(line))
+            for keyword, allowed in _CHARSETS:
+                if keyword in lowered:
+                    characters += allowed
+            if 'letter' in lowered and 'lowercase' not in lowered and 'uppercase' not in lowered:
+                characters += string.ascii_letters
+            if characters:
+                existing = self.spec.get(subject, {}).get('charset', '')
+                self.spec.setdefault(subject, {})['charset'] = ''.join(dict.fromkeys(existing + characters))
+
+        if 'sorted' in lowered or 'increasing order' in lowered or 'decreasing order' in lowered:
+            descending = 'descending' in lowered or ('decreasing' in lowered and 'non-decreasing' not in lowered)
+            self.spec.setdefault(subject, {})['sorted'] = 'desc' if descending else 'asc'
+        if 'unique' in lowered or 'distinct' in lowered:
+            self.spec.setdefault(subject, {})['distinct'] = True
+
+
+def parse_constraints(content: str, sig_data: Dict) -> Dict[str, Dict[str, Any]]:
+    """The constraint spec for a statement's parameters ({} if it has no constraints list)"""
+    params = [(p['name'], p.get('cpp_type') or p['type']) for p in sig_data.get('params', [])]
+    return ConstraintParser(params).parse(constraint_lines(content))
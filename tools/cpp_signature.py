@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+C++ signature parser for LeetPlusPlus
+Tokenizes C++ declarations once and parses them with a recursive-descent parser
+
+Replaces the nested regexes that used to extract and re-split signatures.
+The tokenizer is a single linear scan, and the parser builds a small typed
+AST (Signature -> Param -> CppType) that any depth of template nesting
+round-trips through, e.g. vector<vector<pair<int, int>>>.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from config import STL_TYPES
+from cpp_types import CppType
+
+
+# One alternation per token kind; every branch consumes at least one
+# character and none can backtrack across tokens, so scanning is linear
+_TOKEN_RE = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*(?:\*/|\Z))
+    | (?P<ident>[A-Za-z_]\w*)
+    | (?P<number>\d+)
+    | (?P<scope>::)
+    | (?P<op>&&|[<>(),*&{}\[\];:=~])
+    | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Words that combine into a single builtin type name (unsigned long long ...)
+_BUILTIN_WORDS = {'unsigned', 'signed', 'short', 'long', 'int', 'char', 'double', 'float'}
+_SIZE_WORDS = {'unsigned', 'signed', 'short', 'long'}
+# Declaration specifiers that don't belong to the type itself
+_SPECIFIERS = {'static', 'virtual', 'inline', 'explicit', 'constexpr', 'friend'}
+_CV = {'const', 'volatile'}
+
+Token = Tuple[str, str]
+
+
+class SignatureError(ValueError):
+    """Raised when text is not a valid declaration"""
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split C++ source into (kind, text) tokens, dropping whitespace and comments"""
+    return [(m.lastgroup, m.group()) for m in _TOKEN_RE.finditer(text)
+            if m.lastgroup not in ('space', 'comment')]
+
+
+class Param:
+    """A function parameter"""
+
+    __slots__ = ('type', 'name')
+
+    def __init__(self, type_node: CppType, name: str):
+        self.type = type_node
+        self.name = name
+
+    def __str__(self) -> str:
+        return f"{self.type} {self.name}"
+
+
+class Signature:
+    """A parsed function declaration"""
+
+    __slots__ = ('return_type', 'name', 'params')
+
+    def __init__(self, return_type: CppType, name: str, params: List[Param]):
+        self.return_type = return_type
+        self.name = name
+        self.params = params
+
+    @property
+    def params_str(self) -> str:
+        return ', '.join(str(p) for p in self.params)
+
+    def format(self, name: Optional[str] = None) -> str:
+        """Render as 'ReturnType name(params)', optionally renaming the method"""
+        return f"{self.return_type} {name or self.name}({self.params_str})"
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+class _Parser:
+    """Recursive-descent parser over a token list"""
+
+    def __init__(self, tokens: List[Token], pos: int = 0):
+        self.tokens = tokens
+        self.pos = pos
+
+    def peek(self, offset: int = 0) -> str:
+        index = self.pos + offset
+        return self.tokens[index][1] if index < len(self.tokens) else ''
+
+    def peek_kind(self, offset: int = 0) -> str:
+        index = self.pos + offset
+        return self.tokens[index][0] if index < len(self.tokens) else ''
+
+    def advance(self) -> str:
+        text = self.peek()
+        self.pos += 1
+        return text
+
+    def accept(self, text: str) -> bool:
+        if self.peek() == text:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, text: str):
+        if not self.accept(text):
+            raise SignatureError(f"expected '{text}' but found '{self.peek() or 'end of input'}'")
+
+    def ident(self) -> str:
+        if self.peek_kind() != 'ident':
+            raise SignatureError(f"expected a name but found '{self.peek() or 'end of input'}'")
+        return self.advance()
+
+    def parse_type(self) -> CppType:
+        """type := cv* core cv* ('*' cv*)* ('&' | '&&')?"""
+        const = False
+        while self.peek() in _CV or self.peek() in _SPECIFIERS:
+            const |= self.advance() == 'const'
+
+        if self.peek_kind() == 'number':
+            return CppType.make(self.advance())  # Non-type template argument, e.g. array<int, 26>
+
+        args = None
+        if self.peek() in _SIZE_WORDS:
+            words = []
+            while self.peek() in _BUILTIN_WORDS:
+                words.append(self.advance())
+            name = ' '.join(words)
+        else:
+            name, args = self.parse_name()
+
+        while self.peek() in _CV:
+            const |= self.advance() == 'const'
+
+        pointers = 0
+        while self.accept('*'):
+            pointers += 1
+            while self.peek() in _CV:
+                self.advance()  # cv on the pointer itself (int* const) isn't tracked
+        ref = self.advance() if self.peek() in ('&', '&&') else ''
+        return CppType.make(name, args, const, pointers, ref)
+
+    def parse_name(self) -> Tuple[str, Optional[tuple]]:
+        """name := '::'? ident ('::' ident)* template_args?"""
+        parts = []
+        self.accept('::')
+        parts.append(self.ident())
+        while self.peek() == '::':
+            self.advance()
+            parts.append(self.ident())
+
+        if len(parts) == 1 and parts[0] in STL_TYPES:
+            parts.insert(0, 'std')
+        args = self.parse_template_args() if self.accept('<') else None
+        return '::'.join(parts), args
+
+    def parse_template_args(self) -> tuple:
+        """template_args := '<' (type (',' type)*)? '>'  (the '<' is already consumed)"""
+        args = []
+        if self.accept('>'):
+            return ()
+        while True:
+            args.append(self.parse_type())
+            if self.accept('>'):
+                return tuple(args)
+            self.expect(',')
+
+    def parse_param(self, index: int) -> Param:
+        """param := type name? ('[' ']')* ('=' default)?"""
+        param_type = self.parse_type()
+        name = self.advance() if self.peek_kind() == 'ident' else f"arg{index}"
+        while self.accept('['):
+            self.expect(']')
+            param_type = param_type.replace(pointers=param_type.pointers + 1)  # T a[] decays to T*
+        if self.accept('='):
+            self.skip_expression()
+        return Param(param_type, name)
+
+    def skip_expression(self):
+        """Skip a default argument up to the next ',' or ')' at nesting depth 0"""
+        depth = 0
+        while self.pos < len(self.tokens):
+            text = self.peek()
+            if depth == 0 and text in (',', ')'):
+                return
+            if text in ('(', '[', '{'):
+                depth += 1
+            elif text in (')', ']', '}'):
+                depth -= 1
+            self.advance()
+
+    def parse_declaration(self) -> Signature:
+        """declaration := type name '(' (param (',' param)*)? ')'"""
+        return_type = self.parse_type()
+        name = self.ident()
+        self.expect('(')
+        params = []
+        if not self.accept(')'):
+            while True:
+                params.append(self.parse_param(len(params)))
+                if self.accept(')'):
+                    break
+                self.expect(',')
+        return Signature(return_type, name, params)
+
+
+def parse_type(text: str) -> CppType:
+    """Parse a single type such as 'vector<vector<int>>&'"""
+    parser = _Parser(tokenize(text))
+    node = parser.parse_type()
+    if parser.pos != len(parser.tokens):
+        raise SignatureError(f"unexpected '{parser.peek()}' after type")
+    return node
+
+
+def parse_signature(text: str) -> Signature:
+    """Parse a declaration such as 'int maxDepth(TreeNode* root)'"""
+    parser = _Parser(tokenize(text))
+    signature = parser.parse_declaration()
+    parser.accept(';')
+    if parser.pos != len(parser.tokens):
+        raise SignatureError(f"unexpected '{parser.peek()}' after declaration")
+    return signature
+
+
+def _skip_statement(tokens: List[Token], pos: int) -> int:
+    """Index just past the statement or brace block starting at pos"""
+    depth = 0
+    while pos < len(tokens):
+        text = tokens[pos][1]
+        pos += 1
+        if text == '{':
+            depth += 1
+        elif text == '}':
+            depth -= 1
+            if depth <= 0:
+                return pos
+        elif text == ';' and depth == 0:
+            return pos
+    return pos
+
+
+def find_method(code: str, class_name: str = 'Solution') -> Optional[Signature]:
+    """Find the first public method declared in `class <class_name> { ... }`"""
+    tokens = tokenize(code)
+    pos = 0
+    while pos + 2 < len(tokens):
+        if (tokens[pos][1] in ('class', 'struct') and tokens[pos + 1][1] == class_name
+                and tokens[pos + 2][1] == '{'):
+            break
+        pos += 1
+    else:
+        return None
+
+    # Start of the class body, or after 'public:' if the class has one
+    body = pos + 3
+    pos = body
+    depth = 0
+    while pos < len(tokens):
+        text = tokens[pos][1]
+        if text == '{':
+            depth += 1
+        elif text == '}':
+            if depth == 0:
+                break
+            depth -= 1
+        elif depth == 0 and text == 'public' and pos + 1 < len(tokens) and tokens[pos + 1][1] == ':':
+            body = pos + 2
+            break
+        pos += 1
+
+    pos = body
+    while pos < len(tokens) and tokens[pos][1] != '}':
+        if tokens[pos][1] in ('public', 'private', 'protected') and pos + 1 < len(tokens) \
+                and tokens[pos + 1][1] == ':':
+            pos += 2
+            continue
+        parser = _Parser(tokens, pos)
+        try:
+            signature = parser.parse_declaration()
+            if signature.name != class_name:  # Constructors have no return type
+                return signature
+        except SignatureError:
+            pass
+        pos = _skip_statement(tokens, pos)
+    return None
@@ -5,8 +5,129 @@ Handles type conversions and normalization for C++ code generation
 """
 
 import re
-from typing import List, Dict, Optional
-from config import LEETCODE_TO_CPP_TYPES, STL_TYPES
+import weakref
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Union
+from config import LEETCODE_TO_CPP_TYPES, STL_TYPES, CPP_TYPE_CACHE_SIZE
+
+
+SCALAR_TYPES = {'int', 'bool', 'double', 'float', 'char'}
+
+
+class CppType:
+    """
+    Canonical, immutable C++ type
+    
+    Instances are interned: equal types are the same object, so they can be
+    compared with `is` and used as dict keys cheaply. Use CppType.make() to
+    build one and CppType.of() to get one from a type string (memoized).
+    """
+    
+    __slots__ = ('name', 'args', 'const', 'pointers', 'ref', 'base', '_text', '__weakref__')
+    
+    _interned = weakref.WeakValueDictionary()
+    
+    def __setattr__(self, key, value):
+        raise AttributeError("CppType is immutable")
+    
+    @classmethod
+    def make(cls, name: str, args: Optional[tuple] = None, const: bool = False,
+             pointers: int = 0, ref: str = '') -> 'CppType':
+        """Get the interned type (args is None for non-templates, a tuple of CppType otherwise)"""
+        key = (name, args, const, pointers, ref)
+        instance = cls._interned.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            for field, value in zip(('name', 'args', 'const', 'pointers', 'ref'), key):
+                object.__setattr__(instance, field, value)
+            object.__setattr__(instance, 'base', name.rsplit('::', 1)[-1])  # 'vector' for std::vector<int>&
+            object.__setattr__(instance, '_text', None)
+            instance = cls._interned.setdefault(key, instance)
+        return instance
+    
+    @staticmethod
+    def of(type_ref: Union['CppType', str]) -> 'CppType':
+        """The canonical type for a CppType or type string (unparsable text becomes an opaque name)"""
+        if isinstance(type_ref, CppType):
+            return type_ref
+        return _parse_type_cached(type_ref)
+    
+    def __str__(self) -> str:
+        if self._text is None:
+            text = self.name
+            if self.args is not None:
+                text += '<' + ', '.join(str(arg) for arg in self.args) + '>'
+            if self.const:
+                text = 'const ' + text
+            object.__setattr__(self, '_text', text + '*' * self.pointers + self.ref)
+        return self._text
+    
+    def __repr__(self) -> str:
+        return f"CppType({str(self)!r})"
+    
+    def __reduce__(self):
+        return (CppType.make, (self.name, self.args, self.const, self.pointers, self.ref))
+    
+    def replace(self, **changes) -> 'CppType':
+        fields = {'name': self.name, 'args': self.args, 'const': self.const,
+                  'pointers': self.pointers, 'ref': self.ref}
+        fields.update(changes)
+        return CppType.make(**fields)
+    
+    def value_type(self) -> 'CppType':
+        """The type without top-level const and reference, as used for a local variable"""
+        return self.replace(const=self.const and self.pointers > 0, ref='')
+    
+    def walk(self) -> Iterator['CppType']:
+        """This type and every template argument, depth first"""
+        yield self
+        for arg in self.args or ():
+            yield from arg.walk()
+    
+    def contains(self, base: str) -> bool:
+        """True if this type or any nested template argument has the given base name"""
+        return any(t.base == base for t in self.walk())
+    
+    @property
+    def is_pointer(self) -> bool:
+        return self.pointers > 0
+    
+    @property
+    def is_reference(self) -> bool:
+        return bool(self.ref)
+    
+    @property
+    def is_vector(self) -> bool:
+        return self.base == 'vector' and not self.pointers
+    
+    @property
+    def is_string(self) -> bool:
+        return self.base == 'string' and not self.pointers
+    
+    @property
+    def is_list_node(self) -> bool:
+        return self.base == 'ListNode' and self.pointers == 1
+    
+    @property
+    def is_tree_node(self) -> bool:
+        return self.base == 'TreeNode' and self.pointers == 1
+    
+    def is_a(self, name: str) -> bool:
+        """True for a non-pointer, non-template type with exactly this name (references allowed)"""
+        return self.name == name and not self.pointers and self.args is None
+    
+    @property
+    def is_scalar(self) -> bool:
+        return self.name in SCALAR_TYPES and not self.pointers and not self.ref and self.args is None
+
+
+@lru_cache(maxsize=CPP_TYPE_CACHE_SIZE)
+def _parse_type_cached(text: str) -> CppType:
+    from cpp_signature import parse_type, SignatureError
+    try:
+        return parse_type(text)
+    except SignatureError:
+        return CppType.make(text.strip())
 
 
 class CppTypeConverter:
@@ -16,11 +137,16 @@ class CppTypeConverter:
     def normalize_cpp_type(type_str: str) -> str:
         """
         Normalize C++ type string by fixing spacing and adding std:: prefixes
-        Combines functionality of normalize_cpp_type and add_std_prefix
+        Parses into a canonical CppType (memoized); text that isn't a plain type
+        goes through the regex normalizer instead
         """
         if not type_str:
             return type_str
-        
+        return _normalize_cached(type_str)
+    
+    @staticmethod
+    def _normalize_with_regex(type_str: str) -> str:
+        """Regex normalization for text the type parser rejects (e.g. 'int x')"""
         # Step 1: Clean up whitespace
         type_str = re.sub(r'\s+', ' ', type_str).strip()
         
@@ -42,10 +168,7 @@ class CppTypeConverter:
         
         # Step 6: Add std:: prefix to STL types if not present
         if 'std::' not in type_str:
-            for stl_type in STL_TYPES:
-                # Match STL type followed by template bracket or word boundary
-                pattern = rf'\b(?<!::){stl_type}(?=\s*<|\b)'
-                type_str = re.sub(pattern, f'std::{stl_type}', type_str)
+            type_str = _STL_PATTERN.sub(r'std::\1', type_str)
         
         return type_str
     
@@ -74,88 +197,55 @@ class CppTypeConverter:
     @staticmethod
     def parse_signature(signature: str) -> Optional[Dict]:
         """Parse a C++ function signature into components"""
-        match = re.match(r'^\s*(.+?)\s+(\w+)\s*\((.*)\)\s*$', signature)
-        if not match:
+        from cpp_signature import parse_signature, SignatureError
+        try:
+            parsed = parse_signature(signature)
+        except SignatureError:
             return None
-        
-        raw_return_type = match.group(1).strip()
-        method_name = match.group(2).strip()
-        raw_params = match.group(3).strip()
-        
-        # Normalize types
-        return_type = CppTypeConverter.normalize_cpp_type(raw_return_type)
-        method_name = CppTypeConverter.to_pascal_case(method_name)
-        
-        # Parse parameters
-        params = []
-        params_str = ""
-        
-        if raw_params:
-            param_parts = CppTypeConverter._split_parameters(raw_params)
-            
-            for param in param_parts:
-                param = param.strip()
-                param = CppTypeConverter.normalize_cpp_type(param)
-                
-                # Extract parameter type and name
-                param_match = re.match(r'^(.+?)\s+(\w+)\s*$', param)
-                if param_match:
-                    param_type = param_match.group(1).strip()
-                    param_name = param_match.group(2).strip()
-                    params.append({'type': param_type, 'name': param_name})
-                else:
-                    # No name provided, generate one
-                    params.append({'type': param, 'name': 'arg' + str(len(params))})
-            
-            # Rebuild params string with normalized types
-            params_str = ', '.join(CppTypeConverter.normalize_cpp_type(p) for p in param_parts)
-        
-        return {
-            'return_type': return_type,
-            'method_name': method_name,
-            'params_str': params_str,
-            'params': params
-        }
+        return CppTypeConverter.signature_to_dict(parsed)
     
     @staticmethod
-    def _split_parameters(params_str: str) -> List[str]:
-        """Split parameter string handling nested templates"""
-        param_parts = []
-        current_param = ""
-        angle_bracket_count = 0
-        
-        for char in params_str:
-            if char == '<':
-                angle_bracket_count += 1
-            elif char == '>':
-                angle_bracket_count -= 1
-            elif char == ',' and angle_bracket_count == 0:
-                param_parts.append(current_param.strip())
-                current_param = ""
-                continue
-            current_param += char
-        
-        if current_param.strip():
-            param_parts.append(current_param.strip())
-        
-        return param_parts
+    def signature_to_dict(signature) -> Dict:
+        """Flatten a parsed signature into the dict used by the generators"""
+        return {
+            'return_type': str(signature.return_type),
+            'return_cpp_type': signature.return_type,
+            'method_name': CppTypeConverter.to_pascal_case(signature.name),
+            'params_str': signature.params_str,
+            'params': [{'type': str(p.type), 'name': p.name, 'cpp_type': p.type}
+                       for p in signature.params]
+        }
     
     @staticmethod
-    def get_default_return(return_type: str) -> str:
+    def get_default_return(return_type: Union[CppType, str]) -> str:
         """Get default return statement for a type"""
-        if 'vector' in return_type:
+        cpp_type = CppType.of(return_type)
+        if cpp_type.is_vector:
             return 'return {};'
-        elif 'string' in return_type:
+        elif cpp_type.is_string:
             return 'return "";'
-        elif return_type == 'int':
+        elif cpp_type.is_a('int'):
             return 'return 0;'
-        elif return_type == 'bool':
+        elif cpp_type.is_a('bool'):
             return 'return false;'
-        elif return_type in ['double', 'float']:
+        elif cpp_type.is_a('double') or cpp_type.is_a('float'):
             return 'return 0.0;'
-        elif '*' in return_type:
+        elif cpp_type.is_pointer:
             return 'return nullptr;'
-        elif return_type == 'void':
+        elif cpp_type.is_a('void'):
             return '// void return'
         else:
-            return 'return {}; // TODO: check return type'
\ No newline at end of file
+            return 'return {}; // TODO: check return type'
+
+
+# One pass for all STL names (previously one re.sub per name)
+_STL_PATTERN = re.compile(r'\b(?<!::)(' + '|'.join(sorted(STL_TYPES, key=len, reverse=True)) + r')(?=\s*<|\b)')
+
+
+@lru_cache(maxsize=CPP_TYPE_CACHE_SIZE)
+def _normalize_cached(type_str: str) -> str:
+    from cpp_signature import parse_type, SignatureError
+    try:
+        return str(parse_type(type_str))
+    except SignatureError:
+        return CppTypeConverter._normalize_with_regex(type_str)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Example extractor for LeetPlusPlus
+Pulls Input/Output/Explanation records out of problem statement HTML in one pass
+
+The statement is scanned once for example regions (<pre> blocks and
+<div class="example-block">), skipping the prose between them. Each region is
+flattened to text once (line-level tags become newlines, entities are
+decoded) and split on its "Input:", "Output:" and "Explanation:" labels,
+whether they were wrapped in <strong>/<b> or written as plain text. Values
+never need their tags stripped afterwards.
+"""
+
+import html
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+_REGION_RE = re.compile(r'<(pre)\b[^>]*>|<div\b[^>]*\bexample-block\b[^>]*>', re.IGNORECASE)
+_PRE_END_RE = re.compile(r'</pre\s*>', re.IGNORECASE)
+_DIV_RE = re.compile(r'<(/?)div\b[^>]*>', re.IGNORECASE)
+
+# Tags that end a line when the example is written as HTML rather than inside <pre>
+_LINE_BREAK_RE = re.compile(r'<br\b[^>]*>|</(?:p|div|li)\s*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+# A field label at the start of a line, once the region's tags are gone
+_LABEL_RE = re.compile(r'^[ \t]*(Input|Output|Explanation)[ \t]*:', re.MULTILINE | re.IGNORECASE)
+
+# Characters split_arguments has to look at in each state; everything in
+# between (including every comma inside a big array) is skipped in C
+_TOP_LEVEL_RE = re.compile(r'[\[\]{}()",\\]')
+_NESTED_RE = re.compile(r'[\[\]{}()"\\]')
+_STRING_RE = re.compile(r'["\\]')
+
+_NAME_RE = re.compile(r'\s*([A-Za-z_]\w*)\s*=\s*')
+_NAMED_SPLIT_RE = re.compile(r',(?=\s*[A-Za-z_]\w*\s*=)')
+
+
+def _split_scanning(text: str) -> List[str]:
+    """Split on commas outside brackets and string literals"""
+    parts = []
+    start = 0
+    depth = 0
+    position = 0
+    pattern = _TOP_LEVEL_RE
+    while True:
+        match = pattern.search(text, position)
+        if not match:
+            break
+        char = match.group()
+        position = match.end()
+        if char == '\\':
+            position += 1  # Skip the escaped character
+        elif pattern is _STRING_RE:
+            pattern = _TOP_LEVEL_RE if depth == 0 else _NESTED_RE
+        elif char == '"':
+            pattern = _STRING_RE
+        elif char == ',':
+            parts.append(text[start:match.start()])
+            start = position
+        else:
+            depth += 1 if char in '[{(' else -1
+            pattern = _TOP_LEVEL_RE if depth == 0 else _NESTED_RE
+    parts.append(text[start:])
+    return parts
+
+
+def split_arguments(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Split 'nums = [1,2,3], target = 9' into [('nums', '[1,2,3]'), ('target', '9')]
+
+    Commas inside brackets or string literals don't split. Values without a
+    'name =' prefix get None as their name.
+    """
+    if '"' not in text and '\\' not in text and _NAME_RE.match(text):
+        # LeetCode writes every argument as 'name = value', and without string
+        # literals a comma followed by 'name =' can only start the next one
+        parts = _NAMED_SPLIT_RE.split(text)
+    else:
+        parts = _split_scanning(text)
+
+    arguments = []
+    for part in parts:
+        if not part.strip():
+            continue
+        match = _NAME_RE.match(part)
+        if match:
+            arguments.append((match.group(1), part[match.end():].strip()))
+        else:
+            arguments.append((None, part.strip()))
+    return arguments
+
+
+def format_output(output_str: str) -> str:
+    """Convert an example output to C++ initializer syntax"""
+    output_str = output_str.strip()
+
+    # Convert array notation [1,2,3] to {1,2,3}
+    if output_str.startswith('[') and output_str.endswith(']'):
+        # Handle nested arrays
+        if '[[' in output_str:
+            output_str = output_str.replace('[', '{').replace(']', '}')
+        else:
+            # Single array
+            output_str = '{' + output_str[1:-1] + '}'
+
+    # Handle string outputs - ensure they're quoted
+    elif not (output_str.startswith('"') and output_str.endswith('"')) and \
+         not output_str.replace('.', '').replace('-', '').isdigit() and \
+         output_str not in ['true', 'false', 'null', 'nullptr']:
+        # It's likely a string that needs quotes
+        if not any(char in output_str for char in ['{', '}', '[', ']']):
+            output_str = f'"{output_str}"'
+
+    return output_str
+
+
+def _first_line(text: str) -> str:
+    text = text.lstrip()
+    end = text.find('\n')
+    return (text if end < 0 else text[:end]).strip()
+
+
+def _example_regions(content: str) -> Iterator[str]:
+    """Yield the inner HTML of each <pre> block and example-block div, in order"""
+    position = 0
+    while True:
+        match = _REGION_RE.search(content, position)
+        if not match:
+            return
+        if match.group(1):
+            end = _PRE_END_RE.search(content, match.end())
+            if not end:
+                return
+            yield content[match.end():end.start()]
+            position = end.end()
+            continue
+
+        # Example blocks can nest divs (explanations with figures), so match depth
+        depth = 1
+        for tag in _DIV_RE.finditer(content, match.end()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                yield content[match.end():tag.start()]
+                position = tag.end()
+                break
+        else:
+            yield content[match.end():]
+            return
+
+
+def _region_examples(region: str, examples: List[Dict]):
+    """Append the records in one example region (normally there is one) to examples"""
+    text = _TAG_RE.sub('', _LINE_BREAK_RE.sub('\n', region))
+    if '&' in text:
+        text = html.unescape(text)
+
+    # ['before', 'Input', 'text', 'Output', 'text', ...]
+    parts = _LABEL_RE.split(text)
+    fields = {}
+    for index in range(1, len(parts), 2):
+        field = parts[index].lower()
+        if field == 'input' and fields:
+            _add_example(fields, examples)  # Several examples in one block
+            fields = {}
+        fields[field] = parts[index + 1]
+    _add_example(fields, examples)
+
+
+def _add_example(fields: Dict[str, str], examples: List[Dict]):
+    arguments = split_arguments(_first_line(fields.get('input', '')))
+    output = _first_line(fields.get('output', ''))
+    if arguments and output:
+        examples.append({
+            'inputs': [value for _, value in arguments],
+            'names': [name for name, _ in arguments],
+            'output': format_output(output),
+            'explanation': ' '.join(fields.get('explanation', '').split()),
+        })
+
+
+def extract_examples(content: str) -> List[Dict]:
+    """
+    Extract the examples from a problem statement
+
+    Each record has 'inputs' (argument values in order), 'names' (the
+    argument names, None where the example doesn't give one), 'output'
+    (converted to C++ initializer syntax) and 'explanation' ('' if absent).
+    """
+    examples = []
+    for region in _example_regions(content or ''):
+        _region_examples(region, examples)
+    return examples
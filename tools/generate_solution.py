@@ -8,12 +8,13 @@ from datetime import datetime
 from string import Template
 
 sys.path.append(str(Path(__file__).parent))
-from common import ColorPrinter, MetadataManager, ensure_directory, Fore, Style
+from common import ColorPrinter, MetadataManager, ensure_directory, write_if_changed, Fore, Style
 from config import (
-    STL_TYPES, TOPIC_INCLUDES, PROBLEMS_DIR, ALL_PROBLEMS_HEADER,
-    TEMPLATE_FILE, METADATA_FILE, PROJECT_ROOT
+    STL_INCLUDES, TOPIC_INCLUDES, PROBLEMS_DIR, ALL_PROBLEMS_HEADER, PRECOMPILED_HEADER,
+    TEMPLATE_FILE, METADATA_FILE, PROJECT_ROOT, GENERATE_WORKERS, PROBLEM_LAYOUT, TEST_DATA_DIR
 )
 from cpp_types import CppTypeConverter
+from test_data import TestDataWriter
 from test_parser import TestCaseParser
 from ui_style import UIStyle
 
@@ -23,28 +24,23 @@ def parse_signature(signature):
         raise ValueError(f"Invalid signature format: {signature}")
     return sig_data
 
-def get_includes(signature, topics):
+def signature_types(sig_data):
+    """Every type in a parsed signature, including nested template arguments"""
+    roots = [sig_data['return_cpp_type']] + [p['cpp_type'] for p in sig_data['params']]
+    return [t for root in roots for t in root.walk()]
+
+def get_includes(sig_data, topics):
     includes = set(['<iostream>'])
+    type_names = {t.base for t in signature_types(sig_data)}
     
-    if 'ListNode' in signature or 'LinkedList' in str(topics):
+    if 'ListNode' in type_names or 'LinkedList' in str(topics):
         includes.add('"../Common/Structures.h"')
-    if 'TreeNode' in signature or 'Tree' in str(topics):
+    if 'TreeNode' in type_names or 'Tree' in str(topics):
         includes.add('"../Common/Structures.h"')
     
-    if 'vector' in signature:
-        includes.add('<vector>')
-    if 'string' in signature:
-        includes.add('<string>')
-    if 'map' in signature:
-        includes.add('<map>' if 'unordered' not in signature else '<unordered_map>')
-    if 'set' in signature:
-        includes.add('<set>' if 'unordered' not in signature else '<unordered_set>')
-    if 'queue' in signature:
-        includes.add('<queue>')
-    if 'stack' in signature:
-        includes.add('<stack>')
-    if 'pair' in signature:
-        includes.add('<utility>')
+    for name in type_names:
+        if name in STL_INCLUDES:
+            includes.add(STL_INCLUDES[name])
     
     for topic in topics:
         if topic in TOPIC_INCLUDES:
@@ -85,30 +81,80 @@ def regenerate_vs_project():
         # Silently fail if premake5 is not available
         pass
 
-def generate_solution(problem_number, title, signature, difficulty='Medium', topics=None, companies=None, test_cases_data=None, force=False):
+_template_cache = {}
+
+def load_template():
+    """The solution template, re-read only when template.h changes"""
+    if not TEMPLATE_FILE.exists():
+        raise FileNotFoundError(f"Template file not found: {TEMPLATE_FILE}")
+    
+    stamp = TEMPLATE_FILE.stat().st_mtime_ns
+    if stamp not in _template_cache:
+        _template_cache.clear()
+        _template_cache[stamp] = Template(TEMPLATE_FILE.read_text(encoding='utf-8'))
+    return _template_cache[stamp]
+
+PROBLEM_EXTENSIONS = {'header': '.h', 'source': '.cpp'}
+
+INCLUDE_GUARD_RE = re.compile(r'\A\s*#ifndef (PROBLEM_\d+_H)\s*\n#define \1\s*\n(.*?)\n\s*#endif(?: // \1)?\s*\Z', re.DOTALL)
+
+def strip_include_guard(content):
+    """Remove a problem header's include guard so it can be compiled as a .cpp"""
+    match = INCLUDE_GUARD_RE.match(content)
+    if not match:
+        return content
+    return match.group(2).strip('\r\n') + '\n'
+
+def add_include_guard(content, problem_number):
+    """Wrap a problem source in the include guard template.h gives headers"""
+    if INCLUDE_GUARD_RE.match(content):
+        return content
+    guard = f"PROBLEM_{problem_number}_H"
+    body = content.strip('\r\n')
+    return f"#ifndef {guard}\n#define {guard}\n\n{body}\n\n#endif // {guard}\n"
+
+def generate_solution(problem_number, title, signature, difficulty='Medium', topics=None, companies=None, test_cases_data=None, force=False, session=None, constraints=None):
+    filename, content, entry, test_data = render_solution(problem_number, title, signature, difficulty,
+                                                          topics, companies, test_cases_data,
+                                                          constraints=constraints)
+    write_solution(problem_number, filename, content, entry, force=force, session=session, test_data=test_data)
+    return filename
+
+def render_solution(problem_number, title, signature, difficulty='Medium', topics=None, companies=None, test_cases_data=None, layout=None, constraints=None):
+    """
+    Build a problem file without touching the disk
+    
+    Returns (filename, content, metadata entry, test data), where test data
+    is the bytes of src/Problems/Data/<number>.bin, or None if every example
+    value was small enough to stay a literal.
+    """
+    layout = layout or PROBLEM_LAYOUT
+    if layout not in PROBLEM_EXTENSIONS:
+        raise ValueError(f"Unknown problem layout: {layout} (expected 'header' or 'source')")
+    
     sig_data = parse_signature(signature)
     
-    includes = get_includes(signature, topics or [])
+    includes = get_includes(sig_data, topics or [])
     includes_str = '\n'.join(f'#include {inc}' for inc in includes)
     
     class_name = ''.join(word.capitalize() for word in re.findall(r'\w+', title))
     
     title_words = re.findall(r'\w+', title)
-    filename = f"{problem_number}_{'_'.join(word.capitalize() for word in title_words)}.h"
+    filename = f"{problem_number}_{'_'.join(word.capitalize() for word in title_words)}{PROBLEM_EXTENSIONS[layout]}"
     
-    if not TEMPLATE_FILE.exists():
-        raise FileNotFoundError(f"Template file not found: {TEMPLATE_FILE}")
+    template = load_template()
     
-    template = Template(TEMPLATE_FILE.read_text(encoding='utf-8'))
+    # Generate test cases
+    data = TestDataWriter(problem_number)
+    test_cases_code = TestCaseParser.generate_test_code(test_cases_data, sig_data, topics, data=data)
+    scaling_code = TestCaseParser.generate_scaling_code(sig_data, problem_number)
     
+    type_names = {t.base for t in signature_types(sig_data)}
     test_helpers_include = ""
-    if ('Tree' in str(topics) or 'TreeNode' in signature or 
-        'LinkedList' in str(topics) or 'ListNode' in signature):
+    if ('Tree' in str(topics) or 'TreeNode' in type_names or 
+        'LinkedList' in str(topics) or 'ListNode' in type_names or len(data) or scaling_code):
         test_helpers_include = '\n#include "../Common/TestHelpers.h"'
     
-    # Generate test cases
-    test_cases_code = TestCaseParser.generate_test_code(test_cases_data, sig_data, topics)
-    
     # Create a custom template for safe substitution
     template_dict = {
         'number': problem_number,
@@ -121,27 +167,17 @@ def generate_solution(problem_number, title, signature, difficulty='Medium', top
         'return_type': sig_data['return_type'],
         'method_name': sig_data['method_name'],
         'params': sig_data['params_str'],
-        'default_return': CppTypeConverter.get_default_return(sig_data['return_type']),
-        'test_cases': test_cases_code
+        'default_return': CppTypeConverter.get_default_return(sig_data['return_cpp_type']),
+        'test_cases': test_cases_code,
+        'scaling': f"\n{scaling_code}\n" if scaling_code else ''
     }
     
     content = template.safe_substitute(**template_dict)
+    if layout == 'source':
+        # A translation unit of its own, compiled and registered independently
+        content = strip_include_guard(content)
     
-    ensure_directory(PROBLEMS_DIR)
-    
-    file_path = PROBLEMS_DIR / filename
-    if file_path.exists() and not force:
-        raise ValueError(f"Problem {problem_number} already exists")
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    # Update AllProblems.h instead of main.cpp
-    update_all_problems_header(problem_number, filename)
-    
-    metadata_manager = MetadataManager()
-    metadata = metadata_manager.load()
-    metadata[str(problem_number)] = {
+    entry = {
         'title': title,
         'signature': signature,
         'difficulty': difficulty,
@@ -150,74 +186,260 @@ def generate_solution(problem_number, title, signature, difficulty='Medium', top
         'created': datetime.now().isoformat(),
         'filename': filename
     }
-    metadata_manager.save(metadata)
+    if constraints:
+        entry['constraints'] = constraints  # Input ranges for stress_inputs.py (`lpp scale`)
+    return filename, content, entry, data.to_bytes() if len(data) else None
+
+def write_solution(problem_number, filename, content, entry, force=False, session=None, test_data=None):
+    """Write a rendered problem file (and its test data) and record it in the session, returning True if it changed"""
+    ensure_directory(PROBLEMS_DIR)
     
-    # Regenerate VS project files if on Windows
-    regenerate_vs_project()
+    file_path = PROBLEMS_DIR / filename
+    existing = find_problem_files(problem_number)
+    created = file_path not in existing
+    if existing and not force:
+        raise ValueError(f"Problem {problem_number} already exists")
     
-    return filename
+    # Identical output leaves the file (and its mtime) alone, so a forced
+    # regenerate doesn't make the build recompile it
+    changed = write_if_changed(file_path, content)
+    
+    # The data file goes with the problem, so a regenerate that inlines
+    # everything removes the old one
+    data_path = TEST_DATA_DIR / f"{problem_number}.bin"
+    if test_data is not None:
+        changed = write_if_changed(data_path, test_data) or changed
+    elif data_path.exists():
+        data_path.unlink()
+        changed = True
+    
+    # A header and a source for the same problem would both define
+    # TestProblemN, so the file in the other layout (or under an old title) goes
+    for stale in existing:
+        if stale != file_path:
+            stale.unlink()
+            created = True
+    
+    # Metadata, AllProblems.h and the project files are shared by every
+    # problem, so they are written by the session rather than per problem
+    session = session or GenerationSession.active
+    if session is None:
+        with GenerationSession() as session:
+            session.add(problem_number, filename, entry, created)
+    else:
+        session.add(problem_number, filename, entry, created)
+    return changed
 
-def update_all_problems_header(problem_number, problem_filename):
-    """Update AllProblems.h to include the new problem header"""
-    all_problems_path = ALL_PROBLEMS_HEADER
-    
-    # Create the header if it doesn't exist
-    if not all_problems_path.exists():
-        print("Creating AllProblems.h...")
-        all_problems_path.parent.mkdir(parents=True, exist_ok=True)
-        header_content = """#pragma once
+class GenerationSession:
+    """
+    Batches the shared writes of many generate_solution calls
+    
+    Problem headers are written as they are generated, but the metadata store,
+    AllProblems.h, pch.h and the premake project are each written once when
+    the session commits, instead of once per problem. generate_solution joins the
+    active session, so batch callers only need to wrap their loop:
+    
+        with GenerationSession():
+            for problem in problems:
+                generate_solution(...)
+    
+    The session commits on exit even if the block raises, so headers that
+    were already written are never left out of the index.
+    """
+    
+    active = None
+    
+    def __init__(self, rebuild_index=False, regenerate_project=True):
+        self.rebuild_index = rebuild_index  # Rescan src/Problems instead of adding new headers
+        self.regenerate_project = regenerate_project
+        self.entries = {}
+        self.filenames = []
+        self.created = False  # Whether any header is new, so the project's file list changed
+        self.indexed = []  # Headers listed in AllProblems.h after a rebuild
+        self.index_changed = False
+        self.pch_changed = False
+        self._previous = None
+    
+    def __enter__(self):
+        self._previous = GenerationSession.active
+        GenerationSession.active = self
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        GenerationSession.active = self._previous
+        self.commit()
+        return False
+    
+    def add(self, problem_number, filename, entry, created=True):
+        """Record a generated problem to be flushed at commit"""
+        self.entries[str(problem_number)] = entry
+        self.filenames.append(filename)
+        self.created |= created
+    
+    def commit(self):
+        """Flush metadata, the AllProblems.h index, pch.h and project files once"""
+        if self.entries:
+            MetadataManager().merge(self.entries)
+        if self.rebuild_index:
+            self.indexed, self.index_changed = rebuild_all_problems_header()
+            self.pch_changed = rebuild_precompiled_header()
+        elif self.filenames:
+            self.index_changed = update_all_problems_header(self.filenames)
+            self.pch_changed = update_precompiled_header(self.filenames)
+        # Rewriting unchanged project files would rebuild everything, so only
+        # run premake when the set of headers changed (or pch.h first appeared)
+        if self.regenerate_project and (self.created or self.index_changed or self.pch_changed):
+            regenerate_vs_project()
+        self.entries = {}
+        self.filenames = []
+        self.created = False
+
+ALL_PROBLEMS_PREAMBLE = """#pragma once
 
 // This file is automatically generated by LeetPlusPlus
 // It includes all problem solution headers
 
 """
-        all_problems_path.write_text(header_content, encoding='utf-8')
-    
-    # Read current content
-    content = all_problems_path.read_text(encoding='utf-8')
-    
-    # Check if this problem is already included
-    include_line = f'#include "{problem_filename}"'
-    if include_line in content:
-        return
-    
-    # Find all existing includes and sort them
-    lines = content.split('\n')
-    header_lines = []
-    include_lines = []
-    other_lines = []
-    
-    for line in lines:
-        if line.strip().startswith('#pragma') or line.strip().startswith('//'):
-            header_lines.append(line)
-        elif line.strip().startswith('#include') and '_' in line and '.h' in line:
-            # This is a problem include
-            include_lines.append(line)
+
+PROBLEM_HEADER_RE = re.compile(r'^\d+_.*\.h$')
+PROBLEM_FILE_RE = re.compile(r'^(\d+)_.*\.(?:h|cpp)$')
+
+def find_problem_files(problem_number=None):
+    """Problem headers and sources in src/Problems, optionally only those for one problem"""
+    if not PROBLEMS_DIR.exists():
+        return []
+    prefix = f"{problem_number}_" if problem_number is not None else ""
+    return sorted(path for path in PROBLEMS_DIR.glob(f"{prefix}*")
+                  if PROBLEM_FILE_RE.match(path.name))
+
+def get_problem_number(name):
+    """Problem number of a header name or include line (0 if it has none)"""
+    match = re.search(r'(?:^|["/])(\d+)_', name)
+    return int(match.group(1)) if match else 0
+
+def render_all_problems_header(problem_filenames):
+    """AllProblems.h content for a set of headers (premake5.lua writes the same format)"""
+    names = sorted(set(problem_filenames), key=lambda name: (get_problem_number(name), name))
+    return ALL_PROBLEMS_PREAMBLE + ''.join(f'#include "{name}"\n' for name in names)
+
+def read_all_problems_header():
+    """Problem headers currently included by AllProblems.h"""
+    try:
+        content = ALL_PROBLEMS_HEADER.read_text(encoding='utf-8')
+    except OSError:
+        return []
+    # Older premake builds wrote "Problems/<name>"
+    names = (Path(include).name for include in re.findall(r'^\s*#include\s+"([^"]+)"', content, re.MULTILINE))
+    return [name for name in names if PROBLEM_HEADER_RE.match(name)]
+
+def update_all_problems_header(problem_filenames):
+    """Add problem headers to AllProblems.h, returning True if the file changed"""
+    # Headers converted to sources (or replaced) since the last update drop out
+    existing = [name for name in read_all_problems_header() if (PROBLEMS_DIR / name).exists()]
+    added = [name for name in dict.fromkeys(problem_filenames)
+             if PROBLEM_HEADER_RE.match(name) and name not in set(existing)]
+    
+    if not write_if_changed(ALL_PROBLEMS_HEADER, render_all_problems_header(existing + added)):
+        return False
+    if len(added) == 1:
+        ColorPrinter.success(f"Updated AllProblems.h with {added[0]}")
+    elif added:
+        ColorPrinter.success(f"Updated AllProblems.h with {len(added)} problems")
+    return True
+
+def rebuild_all_problems_header():
+    """Rewrite AllProblems.h from the headers in src/Problems, returning (names, whether it changed)"""
+    problem_files = [path.name for path in PROBLEMS_DIR.glob("*.h") if PROBLEM_HEADER_RE.match(path.name)]
+    problem_files.sort(key=lambda name: (get_problem_number(name), name))
+    return problem_files, write_if_changed(ALL_PROBLEMS_HEADER, render_all_problems_header(problem_files))
+
+def convert_layout(layout):
+    """Move every local problem to the header or source layout, returning how many moved"""
+    extension = PROBLEM_EXTENSIONS[layout]
+    converted = []
+    for path in find_problem_files():
+        if path.suffix == extension:
+            continue
+        target = path.with_suffix(extension)
+        if target.exists():
+            ColorPrinter.warning(f"Skipping {path.name}: {target.name} already exists")
+            continue
+        
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        if layout == 'source':
+            content = strip_include_guard(content)
         else:
-            other_lines.append(line)
-    
-    # Add the new include
-    include_lines.append(include_line)
-    
-    # Sort includes by problem number
-    def get_problem_number(include_line):
-        import re
-        match = re.search(r'#include\s+"(\d+)_', include_line)
-        return int(match.group(1)) if match else 0
-    
-    include_lines.sort(key=get_problem_number)
-    
-    # Reconstruct the file
-    new_content = []
-    new_content.extend(header_lines)
-    if header_lines and include_lines:
-        new_content.append('')  # Empty line between header and includes
-    new_content.extend(include_lines)
-    new_content.extend(other_lines)
-    
-    # Write back
-    all_problems_path.write_text('\n'.join(new_content), encoding='utf-8')
-    ColorPrinter.success(f"Updated AllProblems.h with {problem_filename}")
+            content = add_include_guard(content, get_problem_number(path.name))
+        write_if_changed(target, content)
+        path.unlink()
+        converted.append(target.name)
+    
+    # Headers moved in or out of AllProblems.h, and the project's file list changed
+    session = GenerationSession(rebuild_index=True)
+    session.created = bool(converted)
+    session.commit()
+    
+    for name in converted:
+        ColorPrinter.info(f"  {name}")
+    return len(converted)
+
+PCH_PREAMBLE = """#pragma once
+
+// This file is automatically generated by LeetPlusPlus
+// It includes every library and framework header used by the problems,
+// so premake5.lua can precompile them once for all translation units
+
+"""
+
+# Always precompiled, since every problem uses REGISTER_SOLUTION and TestRunner
+PCH_FRAMEWORK_INCLUDES = ('"Base/SolutionRegistry.h"', '"Base/TestUtils.h"')
+
+INCLUDE_RE = re.compile(r'^[ \t]*#[ \t]*include[ \t]*(<[^>\n]+>|"[^"\n]+")', re.MULTILINE)
+FRAMEWORK_INCLUDE_RE = re.compile(r'^"(?:\.\./)?((?:Base|Common)/[^"]+)"$')
+
+def problem_includes(paths):
+    """Library and framework includes used by problem files, spelled relative to src/"""
+    includes = set()
+    for path in paths:
+        try:
+            content = Path(path).read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        for include in INCLUDE_RE.findall(content):
+            if include.startswith('<'):
+                includes.add(include)
+                continue
+            # Headers next to the solution may be edited with it, so they stay out
+            match = FRAMEWORK_INCLUDE_RE.match(include)
+            if match:
+                includes.add(f'"{match.group(1)}"')
+    return includes
+
+def render_precompiled_header(includes):
+    """pch.h content for a set of includes: library headers first, then framework headers"""
+    includes = set(includes) | set(PCH_FRAMEWORK_INCLUDES)
+    system_includes = sorted(inc for inc in includes if inc.startswith('<'))
+    local_includes = sorted(inc for inc in includes if inc.startswith('"'))
+    return PCH_PREAMBLE + ''.join(f'#include {inc}\n' for inc in system_includes + local_includes)
+
+def read_precompiled_header():
+    """Includes currently listed in pch.h"""
+    try:
+        return set(INCLUDE_RE.findall(PRECOMPILED_HEADER.read_text(encoding='utf-8')))
+    except OSError:
+        return set()
+
+def update_precompiled_header(problem_filenames):
+    """Add the includes of new problem files to pch.h, returning True if the file changed"""
+    # Includes are only ever added here; a rebuild drops the ones no longer used
+    includes = read_precompiled_header() | problem_includes(PROBLEMS_DIR / name for name in problem_filenames)
+    return write_if_changed(PRECOMPILED_HEADER, render_precompiled_header(includes))
+
+def rebuild_precompiled_header():
+    """Rewrite pch.h from every problem in src/Problems, returning True if it changed"""
+    includes = problem_includes(find_problem_files())
+    return write_if_changed(PRECOMPILED_HEADER, render_precompiled_header(includes))
 
 def list_problems():
     metadata_manager = MetadataManager()
@@ -326,8 +548,31 @@ def interactive_mode():
         except Exception as e:
             ColorPrinter.error(f"Error: {e}")
 
-def main():
+def generate_from_cache(args):
+    """Regenerate cached problems selected by --all/--ids on a process pool"""
+    from parallel_generate import ParallelGenerator, parse_id_ranges
+    
+    ids = None
+    if args.ids:
+        try:
+            ids = parse_id_ranges(args.ids)
+        except ValueError:
+            ColorPrinter.error(f"Invalid --ids value: {args.ids} (expected e.g. 1-500 or 1,2,10-20)")
+            return 1
+    
+    generator = ParallelGenerator(workers=args.workers, force=args.force)
+    generator.run(ids)
+    return 1 if generator.counts['failed'] else 0
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='LeetCode C++ Solution Generator')
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--all', action='store_true',
+                           help='Regenerate every problem in the response cache')
+    selection.add_argument('--ids', help='Regenerate cached problems by number, e.g. 1-500 or 1,2,10-20')
+    parser.add_argument('-j', '--workers', type=int, default=GENERATE_WORKERS,
+                        help='Worker processes for --all/--ids')
+    parser.add_argument('--force', action='store_true', help='Overwrite existing problem files')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     new_parser = subparsers.add_parser('new', help='Create new problem')
@@ -342,7 +587,14 @@ def main():
     
     subparsers.add_parser('list', help='List all problems')
     
-    args = parser.parse_args()
+    layout_parser = subparsers.add_parser('layout', help='Convert local problems between headers and per-problem sources')
+    layout_parser.add_argument('layout', choices=sorted(PROBLEM_EXTENSIONS),
+                               help="'source' compiles each problem as its own translation unit")
+    
+    args = parser.parse_args(argv)
+    
+    if args.all or args.ids:
+        return generate_from_cache(args)
     
     if args.command == 'new':
         # Use interactive mode if -i flag or if required args are missing
@@ -362,8 +614,15 @@ def main():
     elif args.command == 'list':
         list_problems()
     
+    elif args.command == 'layout':
+        converted = convert_layout(args.layout)
+        ColorPrinter.success(f"Converted {converted} problem(s) to the {args.layout} layout")
+        if args.layout != PROBLEM_LAYOUT:
+            ColorPrinter.info(f"Set LPP_PROBLEM_LAYOUT={args.layout} (or PROBLEM_LAYOUT in tools/config.py) "
+                              "so new problems use it too")
+    
     else:
         parser.print_help()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
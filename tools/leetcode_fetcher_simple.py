@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 """
-LeetCode Problem Fetcher (Simple Version) - Uses built-in urllib instead of requests
+LeetCode Problem Fetcher (Simple Version) - Uses the stdlib HTTP client instead of requests
 Integrates with AlfaLeetCode API to fetch problems
 """
 
 import json
-import re
-import time
 from pathlib import Path
 from typing import Dict, List, Optional
 import sys
@@ -14,32 +12,64 @@ import sys
 sys.path.append(str(Path(__file__).parent))
 from generate_solution import generate_solution
 from common import ColorPrinter, APIServerManager, MetadataManager, HTTPClient
-from config import API_BASE_URL, BATCH_FETCH_DELAY
+from config import API_BASE_URL
+from constraints import parse_constraints
 from cpp_types import CppTypeConverter
+import cpp_signature
+from example_extractor import extract_examples
+from response_cache import ResponseCache
 from ui_style import UIStyle
 
 class LeetCodeAPI:
     """Interface to AlfaLeetCode API"""
     
-    def __init__(self, base_url: str = API_BASE_URL):
+    def __init__(self, base_url: str = API_BASE_URL, offline: bool = False,
+                 refresh: bool = False, cache: Optional[ResponseCache] = None):
         self.base_url = base_url
         self.api_manager = APIServerManager(base_url)
         self.http_client = HTTPClient()
-        
+        self.cache = cache or ResponseCache()
+        self.offline = offline  # Serve only from the response cache
+        self.refresh = refresh  # Ignore cached responses (still stores new ones)
+        self.rate_limiter = None  # Optional TokenBucket applied to network requests only
+    
     def check_api_available(self) -> bool:
         """Check if API server is running"""
         return self.api_manager.check_available()
     
+    def _get(self, endpoint: str, params: Optional[Dict[str, str]] = None):
+        """GET an endpoint through the response cache"""
+        if not self.refresh or self.offline:
+            cached = self.cache.get(endpoint, params, allow_stale=self.offline)
+            if cached is not None:
+                return cached
+        
+        if self.offline:
+            ColorPrinter.warning(f"Offline: no cached response for /{endpoint}"
+                                 f"{' ' + str(params) if params else ''}")
+            return None
+        
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        
+        url = f"{self.base_url}/{endpoint}"
+        data = (self.http_client.get_with_params(url, params) if params
+                else self.http_client.get(url))
+        
+        if data and not (isinstance(data, dict) and ('error' in data or 'errors' in data)):
+            try:
+                self.cache.put(endpoint, params, data)
+            except OSError as e:
+                ColorPrinter.warning(f"Could not cache response: {e}")
+        return data
+    
     def fetch_problem(self, title_slug: str) -> Optional[Dict]:
         """Fetch a specific problem by title slug"""
-        return self.http_client.get_with_params(
-            f"{self.base_url}/select",
-            {"titleSlug": title_slug}
-        )
+        return self._get("select", {"titleSlug": title_slug})
     
     def fetch_daily(self) -> Optional[Dict]:
         """Fetch the daily challenge problem"""
-        return self.http_client.get(f"{self.base_url}/daily")
+        return self._get("daily")
     
     def fetch_problems(self, limit: int = 20, skip: int = 0, 
                       difficulty: Optional[str] = None, 
@@ -51,10 +81,7 @@ class LeetCodeAPI:
         if tags:
             params["tags"] = "+".join(tags)
         
-        return self.http_client.get_with_params(
-            f"{self.base_url}/problems",
-            params
-        )
+        return self._get("problems", params)
 
 # Type conversion functions moved to cpp_types.py
 
@@ -75,79 +102,27 @@ def extract_cpp_signature(problem_data: Dict) -> Optional[str]:
             print("No C++ code snippet found in problem data")
             return None
         
-        # Extract function signature from snippet
-        # Look for class Solution and the public method
-        class_match = re.search(r'class\s+Solution\s*\{[^}]*public:\s*([^}]+)\}', cpp_snippet, re.DOTALL)
-        if class_match:
-            methods_section = class_match.group(1)
-            # Find the first complete function signature
-            # Enhanced regex to handle:
-            # - Multiple pointers/references: **, ***, &
-            # - Type modifiers: const, unsigned, etc.
-            # - Complex templates: vector<pair<int,int>>
-            # - Spaces in various positions
-            
-            # This regex captures:
-            # Group 1: Full return type (including const, templates, etc.)
-            # Group 2: Pointers and references (*, **, &, etc.)
-            # Group 3: Method name
-            # Group 4: Parameters
-            # Enhanced to handle nested templates like vector<pair<int, int>>
-            pattern = r'((?:(?:const|unsigned|signed|long|short|static|virtual)\s+)*\w+(?:\s*::\s*\w+)*(?:\s*<(?:[^<>]|<[^>]*>)*>)?(?:\s+\w+)*?)\s*((?:\*\s*)*(?:&\s*)?)\s*(\w+)\s*\(([^)]*)\)'
-            
-            full_match = re.search(pattern, methods_section)
-            if full_match:
-                return_type = full_match.group(1).strip()
-                pointers_refs = full_match.group(2).strip()
-                method_name = full_match.group(3).strip()
-                params = full_match.group(4).strip()
-                
-                # Normalize the return type
-                return_type = CppTypeConverter.normalize_cpp_type(return_type)
-                
-                # Combine return type with pointers/references
-                if pointers_refs:
-                    # Normalize pointer/reference spacing
-                    pointers_refs = re.sub(r'\s+', '', pointers_refs)
-                    return_type = f"{return_type}{pointers_refs}"
-                
-                # Convert method name to PascalCase
-                method_name = CppTypeConverter.to_pascal_case(method_name)
-                
-                # Normalize parameters
-                if params:
-                    # Split parameters and normalize each
-                    param_list = []
-                    # Simple parameter splitting (doesn't handle nested templates perfectly)
-                    for param in re.split(r',(?![^<>]*>)', params):
-                        param = param.strip()
-                        if param:
-                            param_list.append(CppTypeConverter.normalize_cpp_type(param))
-                    params = ', '.join(param_list)
-                
-                return f"{return_type} {method_name}({params})"
+        # Parse the first public method of class Solution
+        signature = cpp_signature.find_method(cpp_snippet)
+        if signature:
+            return signature.format(CppTypeConverter.to_pascal_case(signature.name))
         
         # Fallback: try to parse from metadata
         if "metaData" in problem_data and problem_data["metaData"]:
             metadata = json.loads(problem_data["metaData"])
-            return_type = parse_leetcode_type_to_cpp(metadata["return"]["type"])
-            method_name = to_pascal_case(metadata["name"])
+            return_type = CppTypeConverter.leetcode_to_cpp(metadata["return"]["type"])
+            method_name = CppTypeConverter.to_pascal_case(metadata["name"])
             
             params = []
             for param in metadata.get("params", []):
-                param_type = parse_leetcode_type_to_cpp(param["type"])
-                param_name = param["name"]
+                param_type = CppTypeConverter.leetcode_to_cpp(param["type"])
                 # Add reference for containers
-                if "vector" in param_type and "**" not in param_type:
+                if "vector" in param_type and "*" not in param_type:
                     param_type += "&"
-                # Normalize the parameter type
-                param_str = normalize_cpp_type(f"{param_type} {param_name}")
-                params.append(param_str)
+                params.append(f"{param_type} {param['name']}")
             
-            # Normalize return type
-            return_type = normalize_cpp_type(return_type)
-            
-            return f"{return_type} {method_name}({', '.join(params)})"
+            # Round-trip through the parser to normalize the types
+            return str(cpp_signature.parse_signature(f"{return_type} {method_name}({', '.join(params)})"))
     
     except Exception as e:
         print(f"Error extracting signature: {e}")
@@ -164,114 +139,7 @@ def extract_test_examples(problem_data: Dict) -> List[Dict]:
     """Extract complete input/output pairs from problem content"""
     # Try different field names where content might be stored
     content = problem_data.get('content', '') or problem_data.get('question', '') or problem_data.get('questionContent', '')
-    examples = []
-    
-    # Find all <pre> blocks which typically contain examples
-    pre_blocks = re.findall(r'<pre>(.*?)</pre>', content, re.DOTALL | re.IGNORECASE)
-    
-    for block in pre_blocks:
-        # Clean the block
-        block = block.strip()
-        
-        # Try to extract Input and Output from the block
-        # Pattern for Input/Output in various formats
-        patterns = [
-            # Pattern 1: <strong>Input:</strong> ... <strong>Output:</strong> ...
-            (r'<strong>Input:</strong>\s*([^<]+?)\s*(?:<br\s*/?>|\n)\s*<strong>Output:</strong>\s*([^<]+?)(?:\s*(?:<br\s*/?>|\n|$))', re.IGNORECASE),
-            # Pattern 2: Input: ... Output: ... (plain text)
-            (r'Input:\s*([^\n]+?)\s*\n\s*Output:\s*([^\n]+?)(?:\s*(?:\n|$))', 0),
-            # Pattern 3: <b>Input:</b> ... <b>Output:</b> ...
-            (r'<b>Input:</b>\s*([^<]+?)\s*(?:<br\s*/?>|\n)\s*<b>Output:</b>\s*([^<]+?)(?:\s*(?:<br\s*/?>|\n|$))', re.IGNORECASE),
-        ]
-        
-        for pattern, flags in patterns:
-            match = re.search(pattern, block, flags)
-            if match:
-                input_str = match.group(1).strip()
-                output_str = match.group(2).strip()
-                
-                # Parse the input string to separate multiple inputs
-                inputs = parse_input_string(input_str)
-                
-                # Parse output and convert to C++ format if needed
-                output = parse_output_string(output_str)
-                
-                if inputs and output:
-                    examples.append({
-                        'inputs': inputs,
-                        'output': output
-                    })
-                break
-    
-    return examples
-
-def parse_input_string(input_str: str) -> List[str]:
-    """Parse input string into individual parameter values"""
-    # Remove any HTML tags
-    input_str = re.sub(r'<[^>]+>', '', input_str)
-    
-    # Split by common separators
-    # Handle cases like: "nums = [1,2,3], target = 9"
-    parts = []
-    
-    # First try to split by commas that are not inside brackets
-    current = ''
-    bracket_depth = 0
-    in_quotes = False
-    
-    for char in input_str:
-        if char == '"' and (not current or current[-1] != '\\'):
-            in_quotes = not in_quotes
-        elif not in_quotes:
-            if char in '[{(':
-                bracket_depth += 1
-            elif char in ']})':
-                bracket_depth -= 1
-            elif char == ',' and bracket_depth == 0:
-                if current.strip():
-                    parts.append(current.strip())
-                current = ''
-                continue
-        current += char
-    
-    if current.strip():
-        parts.append(current.strip())
-    
-    # Extract just the values from "name = value" format
-    values = []
-    for part in parts:
-        if '=' in part:
-            value = part.split('=', 1)[1].strip()
-            values.append(value)
-        else:
-            values.append(part)
-    
-    return values
-
-def parse_output_string(output_str: str) -> str:
-    """Parse output string and convert to C++ format"""
-    # Remove any HTML tags
-    output_str = re.sub(r'<[^>]+>', '', output_str)
-    output_str = output_str.strip()
-    
-    # Convert array notation [1,2,3] to {1,2,3}
-    if output_str.startswith('[') and output_str.endswith(']'):
-        # Handle nested arrays
-        if '[[' in output_str:
-            output_str = output_str.replace('[', '{').replace(']', '}')
-        else:
-            # Single array
-            output_str = '{' + output_str[1:-1] + '}'
-    
-    # Handle string outputs - ensure they're quoted
-    elif not (output_str.startswith('"') and output_str.endswith('"')) and \
-         not output_str.replace('.', '').replace('-', '').isdigit() and \
-         output_str not in ['true', 'false', 'null', 'nullptr']:
-        # It's likely a string that needs quotes
-        if not any(char in output_str for char in ['{', '}', '[', ']']):
-            output_str = f'"{output_str}"'
-    
-    return output_str
+    return extract_examples(content)
 
 def extract_expected_outputs(problem_data: Dict) -> List[str]:
     """Legacy function - now extracts from complete examples"""
@@ -405,29 +273,37 @@ def batch_import_problems(api: LeetCodeAPI):
     if UIStyle.bordered_input("Generate all? (y/n):").lower() != 'y':
         return
     
-    success_count = 0
-    skipped_paid = 0
-    for i, problem in enumerate(problems):
-        # Skip paid problems in batch import
-        if problem.get("isPaidOnly", False):
-            skipped_paid += 1
-            continue
-            
-        print(f"\n[{i+1}/{len(problems)}] Processing: {problem.get('title', 'Unknown')}...")
-        try:
-            # Fetch full problem details
-            if "titleSlug" in problem:
-                full_problem = api.fetch_problem(problem["titleSlug"])
-                if full_problem:
-                    if generate_from_api_data(full_problem, interactive_mode=True):
-                        success_count += 1
-                    time.sleep(BATCH_FETCH_DELAY)  # Be nice to the API
-        except Exception as e:
-            print(f"Error processing problem: {e}")
-    
-    print(f"\nSuccessfully generated {success_count}/{len(problems)} problems!")
-    if skipped_paid > 0:
-        print(f"Skipped {skipped_paid} paid-only problems")
+    from batch_import import BatchImporter
+    BatchImporter(api).run(problems)
+
+def build_test_cases_data(problem_data: Dict, signature: str) -> Dict:
+    """Collect the example data the test code generator needs"""
+    test_examples = extract_test_examples(problem_data)
+    return {
+        'exampleTestcases': problem_data.get('exampleTestcases', ''),
+        'signature': signature,  # Pass signature for parameter parsing
+        'expectedOutputs': [ex['output'] for ex in test_examples],
+        'testExamples': test_examples  # Pass complete examples
+    }
+
+def extract_constraints(problem_data: Dict, signature: str) -> Dict:
+    """Parse the statement's Constraints list into per-parameter ranges ({} if there are none)"""
+    content = problem_data.get('content', '') or problem_data.get('question', '') or problem_data.get('questionContent', '')
+    sig_data = CppTypeConverter.parse_signature(signature)
+    return parse_constraints(content, sig_data) if sig_data else {}
+
+def parse_problem_data(problem_data: Dict) -> Dict:
+    """Extract generator inputs from API data (signature is None if it can't be parsed)"""
+    signature = extract_cpp_signature(problem_data)
+    return {
+        'problem_id': problem_data.get("questionFrontendId", problem_data.get("questionId", "0")),
+        'title': problem_data.get("title", problem_data.get("questionTitle", "Unknown Problem")),
+        'difficulty': problem_data.get("difficulty", "Medium"),
+        'topics': parse_topics_from_api(problem_data.get("topicTags", [])),
+        'signature': signature,
+        'test_cases_data': build_test_cases_data(problem_data, signature) if signature else None,
+        'constraints': extract_constraints(problem_data, signature) if signature else {},
+    }
 
 def generate_from_api_data(problem_data: Dict, interactive_mode: bool = True, force: bool = False) -> bool:
     """Generate a problem file from API data"""
@@ -444,13 +320,13 @@ def generate_from_api_data(problem_data: Dict, interactive_mode: bool = True, fo
         from generate_solution import generate_solution
         
         # Extract problem details
-        problem_id = problem_data.get("questionFrontendId", problem_data.get("questionId", "0"))
-        title = problem_data.get("title", problem_data.get("questionTitle", "Unknown Problem"))
-        difficulty = problem_data.get("difficulty", "Medium")
-        topics = parse_topics_from_api(problem_data.get("topicTags", []))
+        parsed = parse_problem_data(problem_data)
+        problem_id = parsed['problem_id']
+        title = parsed['title']
+        difficulty = parsed['difficulty']
+        topics = parsed['topics']
+        signature = parsed['signature']
         
-        # Extract signature
-        signature = extract_cpp_signature(problem_data)
         if not signature:
             ColorPrinter.error(f"Could not extract C++ signature for problem #{problem_id}: {title}")
             if interactive_mode:
@@ -471,13 +347,7 @@ def generate_from_api_data(problem_data: Dict, interactive_mode: bool = True, fo
         print(f"  Signature: {signature}")
         
         # Prepare test case data
-        test_examples = extract_test_examples(problem_data)
-        test_cases_data = {
-            'exampleTestcases': problem_data.get('exampleTestcases', ''),
-            'signature': signature,  # Pass signature for parameter parsing
-            'expectedOutputs': [ex['output'] for ex in test_examples],
-            'testExamples': test_examples  # Pass complete examples
-        }
+        test_cases_data = parsed['test_cases_data'] or build_test_cases_data(problem_data, signature)
         
         # Generate the solution file
         filename = generate_solution(
@@ -488,13 +358,14 @@ def generate_from_api_data(problem_data: Dict, interactive_mode: bool = True, fo
             topics=topics,
             companies=[],  # API doesn't provide company info
             test_cases_data=test_cases_data,
-            force=force
+            force=force,
+            constraints=parsed['constraints'] or extract_constraints(problem_data, signature)
         )
         
         print(UIStyle.success_banner(f"Successfully generated: {filename}"))
         
         return True
-        
+    
     except ValueError as e:
         if "already exists" in str(e):
             ColorPrinter.warning(str(e))
@@ -512,7 +383,7 @@ def generate_from_api_data(problem_data: Dict, interactive_mode: bool = True, fo
         traceback.print_exc()
         return False
 
-def fetch_by_number(api: LeetCodeAPI, problem_number: str):
+def fetch_by_number(api: LeetCodeAPI, problem_number: str, force: bool = False):
     """Fetch a problem by number using metadata"""
     metadata_manager = MetadataManager()
     problem_info = metadata_manager.get_problem_by_id(problem_number)
@@ -535,7 +406,7 @@ def fetch_by_number(api: LeetCodeAPI, problem_number: str):
     problem_data = api.fetch_problem(slug)
     
     if problem_data:
-        generate_from_api_data(problem_data, interactive_mode=False)
+        generate_from_api_data(problem_data, interactive_mode=False, force=force)
 
 # Server auto-start functionality moved to common.py
 
@@ -544,30 +415,33 @@ def main():
     if len(sys.argv) > 1:
         # Command line mode
         command = sys.argv[1]
-        api = LeetCodeAPI()
+        flags = set(arg for arg in sys.argv[2:] if arg.startswith('--'))
+        positional = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+        force = '--force' in flags
+        api = LeetCodeAPI(offline='--offline' in flags, refresh='--refresh' in flags)
         
         # Auto-start server if needed for commands that require it
-        if command in ["fetch", "daily"]:
+        if command in ["fetch", "daily"] and not api.offline:
             api.api_manager.ensure_running()
         
         if command == "fetch":
-            if len(sys.argv) < 3:
-                print("Usage: leetcode_fetcher_simple.py fetch <title-slug>")
+            if not positional:
+                print("Usage: leetcode_fetcher_simple.py fetch <title-slug> [--force] [--offline] [--refresh]")
                 sys.exit(1)
             
-            slug = sys.argv[2]
+            slug = positional[0]
             # Check if it's a number
             if slug.isdigit():
-                fetch_by_number(api, slug)
+                fetch_by_number(api, slug, force=force)
             else:
                 problem_data = api.fetch_problem(slug)
                 if problem_data:
-                    generate_from_api_data(problem_data)
+                    generate_from_api_data(problem_data, force=force)
         
         elif command == "daily":
             problem_data = api.fetch_daily()
             if problem_data:
-                generate_from_api_data(problem_data)
+                generate_from_api_data(problem_data, force=force)
         
         else:
             print(f"Unknown command: {command}")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Metadata storage backends for LeetPlusPlus
+Provides the legacy JSON document store and an indexed SQLite store
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+try:
+    import sqlite3
+    HAS_SQLITE = True
+except ImportError:
+    HAS_SQLITE = False
+
+
+def _sort_key(problem_id) -> int:
+    """Numeric sort key for problem IDs stored as strings"""
+    try:
+        return int(problem_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _topics_of(problem_data: Dict[str, Any]) -> List[str]:
+    """Topic list for an entry (updater uses 'topicTags', generator uses 'topics')"""
+    topics = problem_data.get('topicTags') or problem_data.get('topics') or []
+    return [t for t in topics if isinstance(t, str) and t]
+
+
+class JsonMetadataStore:
+    """Stores all metadata in a single JSON document (metadata.json)"""
+
+    name = "json"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @property
+    def storage_path(self) -> Path:
+        return self.path
+
+    def load_all(self) -> Dict[str, Any]:
+        """Read the whole document"""
+        if not self.path.exists():
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def save_all(self, metadata: Dict[str, Any]):
+        """Replace the whole document, sorted by problem number"""
+        sorted_metadata = dict(sorted(metadata.items(), key=lambda x: _sort_key(x[0])))
+        with open(self.path, 'w') as f:
+            json.dump(sorted_metadata, f, indent=2)
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        return self.load_all().get(str(problem_id))
+
+    def get_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        for problem_id, problem_data in self.load_all().items():
+            if problem_data.get('titleSlug') == slug:
+                return dict(problem_data, id=problem_id)
+        return None
+
+    def query(self, difficulty: Optional[str] = None, topic: Optional[str] = None) -> List[Dict[str, Any]]:
+        results = []
+        for problem_id, problem_data in self.load_all().items():
+            if difficulty and problem_data.get('difficulty', '').lower() != difficulty.lower():
+                continue
+            if topic and topic.lower() not in (t.lower() for t in _topics_of(problem_data)):
+                continue
+            results.append(dict(problem_data, id=problem_id))
+        results.sort(key=lambda p: _sort_key(p['id']))
+        return results
+
+    def upsert(self, problem_id: str, problem_data: Dict[str, Any]):
+        self.upsert_many({str(problem_id): problem_data})
+
+    def upsert_many(self, entries: Dict[str, Dict[str, Any]]):
+        metadata = self.load_all()
+        metadata.update(entries)
+        self.save_all(metadata)
+
+    def count(self) -> int:
+        return len(self.load_all())
+
+    @property
+    def state_path(self) -> Path:
+        return self.path.with_suffix('.state.json')
+
+    def get_state(self, key: str) -> Optional[Any]:
+        """Read a value from the sidecar state file"""
+        if not self.state_path.exists():
+            return None
+        with open(self.state_path, 'r') as f:
+            return json.load(f).get(key)
+
+    def set_state(self, key: str, value: Any):
+        """Write a value to the sidecar state file"""
+        state = {}
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        state[key] = value
+        with open(self.state_path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    def close(self):
+        pass
+
+
+class SqliteMetadataStore:
+    """
+    Stores metadata in an indexed SQLite database
+
+    Each entry is kept as a JSON blob next to indexed id, slug and difficulty
+    columns, with topics in a separate indexed table. Point lookups use the
+    primary key or an index instead of re-reading the whole corpus.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS problems (
+            id          INTEGER PRIMARY KEY,
+            slug        TEXT,
+            title       TEXT,
+            difficulty  TEXT COLLATE NOCASE,
+            data        TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_problems_slug ON problems(slug);
+        CREATE INDEX IF NOT EXISTS idx_problems_difficulty ON problems(difficulty);
+        CREATE TABLE IF NOT EXISTS problem_topics (
+            topic       TEXT NOT NULL COLLATE NOCASE,
+            problem_id  INTEGER NOT NULL,
+            PRIMARY KEY (topic, problem_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_problem_topics_problem ON problem_topics(problem_id);
+        CREATE TABLE IF NOT EXISTS store_state (
+            key         TEXT PRIMARY KEY,
+            value       TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path, json_path: Optional[Path] = None):
+        if not HAS_SQLITE:
+            raise RuntimeError("sqlite3 module is not available")
+        self.path = Path(path)
+        self.json_path = Path(json_path) if json_path else None
+        self._conn = None
+
+    @property
+    def storage_path(self) -> Path:
+        return self.path
+
+    def _connect(self):
+        """Open the database lazily, importing metadata.json if it is newer"""
+        if self._conn is not None:
+            return self._conn
+
+        needs_import = False
+        if self.json_path and self.json_path.exists():
+            needs_import = (not self.path.exists() or
+                            self.json_path.stat().st_mtime > self.path.stat().st_mtime)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(self.SCHEMA)
+
+        if needs_import:
+            self.import_json(self.json_path)
+        return self._conn
+
+    @staticmethod
+    def _row_values(problem_id: str, problem_data: Dict[str, Any]) -> tuple:
+        return (
+            int(problem_id),
+            problem_data.get('titleSlug'),
+            problem_data.get('title'),
+            problem_data.get('difficulty'),
+            json.dumps(problem_data),
+        )
+
+    def _write(self, conn, problem_id: str, problem_data: Dict[str, Any]):
+        conn.execute(
+            "INSERT OR REPLACE INTO problems (id, slug, title, difficulty, data) VALUES (?, ?, ?, ?, ?)",
+            self._row_values(problem_id, problem_data)
+        )
+        conn.execute("DELETE FROM problem_topics WHERE problem_id = ?", (int(problem_id),))
+        conn.executemany(
+            "INSERT OR IGNORE INTO problem_topics (topic, problem_id) VALUES (?, ?)",
+            [(topic, int(problem_id)) for topic in _topics_of(problem_data)]
+        )
+
+    def load_all(self) -> Dict[str, Any]:
+        conn = self._connect()
+        rows = conn.execute("SELECT id, data FROM problems ORDER BY id")
+        return {str(problem_id): json.loads(data) for problem_id, data in rows}
+
+    def save_all(self, metadata: Dict[str, Any]):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM problem_topics")
+            conn.execute("DELETE FROM problems")
+            for problem_id, problem_data in metadata.items():
+                self._write(conn, problem_id, problem_data)
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            key = int(problem_id)
+        except (TypeError, ValueError):
+            return None
+        row = self._connect().execute("SELECT data FROM problems WHERE id = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(
+            "SELECT id, data FROM problems WHERE slug = ? LIMIT 1", (slug,)
+        ).fetchone()
+        return dict(json.loads(row[1]), id=str(row[0])) if row else None
+
+    def query(self, difficulty: Optional[str] = None, topic: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT p.id, p.data FROM problems p"
+        clauses = []
+        args = []
+        if topic:
+            sql += " JOIN problem_topics t ON t.problem_id = p.id"
+            clauses.append("t.topic = ?")
+            args.append(topic)
+        if difficulty:
+            clauses.append("p.difficulty = ?")
+            args.append(difficulty)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.id"
+
+        rows = self._connect().execute(sql, args)
+        return [dict(json.loads(data), id=str(problem_id)) for problem_id, data in rows]
+
+    def upsert(self, problem_id: str, problem_data: Dict[str, Any]):
+        self.upsert_many({str(problem_id): problem_data})
+
+    def upsert_many(self, entries: Dict[str, Dict[str, Any]]):
+        conn = self._connect()
+        with conn:
+            for problem_id, problem_data in entries.items():
+                self._write(conn, problem_id, problem_data)
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def get_state(self, key: str) -> Optional[Any]:
+        row = self._connect().execute("SELECT value FROM store_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_state(self, key: str, value: Any):
+        conn = self._connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO store_state (key, value) VALUES (?, ?)",
+                         (key, json.dumps(value)))
+
+    def import_json(self, json_path: Path) -> int:
+        """Replace the database contents with a metadata.json document"""
+        metadata = JsonMetadataStore(json_path).load_all()
+        self.save_all(metadata)
+        return len(metadata)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_store(backend: str, json_path: Path, db_path: Path):
+    """Create a metadata store for the configured backend"""
+    if backend == "sqlite" and HAS_SQLITE:
+        return SqliteMetadataStore(db_path, json_path)
+    return JsonMetadataStore(json_path)
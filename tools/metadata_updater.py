@@ -5,61 +5,207 @@ Fetches problem list from LeetCode API and creates/updates metadata.json
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent))
 from common import ColorPrinter, APIServerManager, MetadataManager, HTTPClient, Fore, Style
-from config import API_BASE_URL, METADATA_FILE, BATCH_FETCH_LIMIT
+from config import (
+    API_BASE_URL, METADATA_FILE, BATCH_FETCH_LIMIT, BATCH_FETCH_WORKERS, BATCH_FETCH_RETRIES
+)
 from ui_style import UIStyle
 
+SYNC_STATE_KEY = "sync"
+
+
+class FetchedProblems(list):
+    """
+    Problem list from the API that knows whether it is complete
+    
+    missing holds the offsets of pages that failed after their retries;
+    truncated is set when any part of the list could not be fetched.
+    """
+    
+    def __init__(self, problems=(), missing=None):
+        super().__init__(problems)
+        self.missing = list(missing or [])
+        self.truncated = bool(self.missing)
+    
+    @property
+    def complete(self) -> bool:
+        return not self.truncated and not self.missing
+
+
 class MetadataUpdater:
-    def __init__(self):
-        self.api_base = API_BASE_URL
+    def __init__(self, max_workers: int = BATCH_FETCH_WORKERS, base_url: str = API_BASE_URL):
+        self.api_base = base_url
+        self.max_workers = max(1, max_workers)
         self.api_manager = APIServerManager(self.api_base)
         self.metadata_manager = MetadataManager(METADATA_FILE)
         self.http_client = HTTPClient()
+        self.last_total = None
+    
+    def _fetch_page(self, skip: int, limit: int):
+        """Fetch one page of the problem list, returning (problems, total) or None"""
+        data = self.http_client.get_with_params(
+            f"{self.api_base}/problems",
+            {"limit": str(limit), "skip": str(skip)},
+            retries=BATCH_FETCH_RETRIES
+        )
+        
+        if not data:
+            return None
+        
+        # The API returns an object with problemsetQuestionList
+        if 'problemsetQuestionList' in data:
+            return data['problemsetQuestionList'] or [], data.get('totalQuestions')
         
-    def fetch_all_problems(self):
-        """Fetch all problems from the API"""
+        # Might be a different format
+        if isinstance(data, list):
+            return data, None
+        
+        ColorPrinter.warning("Unexpected API response format")
+        return None
+    
+    def _show_progress(self, fetched: int, total: int):
+        print(f"\r  {UIStyle.progress(fetched, total, 'Fetched')}", end='', flush=True)
+    
+    def _fetch_pages(self, offsets, limit: int, pages: dict, fetched: int = 0, expected: int = 0):
+        """Fetch page offsets concurrently into pages, returning the offsets that failed"""
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_page, offset, limit): offset
+                       for offset in offsets}
+            for future in as_completed(futures):
+                offset = futures[future]
+                page = future.result()
+                if page is None:
+                    failed.append(offset)
+                    continue
+                pages[offset] = page[0]
+                fetched += len(page[0])
+                if expected:
+                    self._show_progress(fetched, expected)
+        return sorted(failed)
+    
+    def fetch_all_problems(self, skip: int = 0, first_page=None):
+        """
+        Fetch all problems from the API, starting at an offset
+        
+        The first page reveals the total count, after which the remaining
+        page offsets are fetched concurrently and reassembled in order.
+        Returns None if the first page fails. If later pages still fail
+        after their retries, the problems that were fetched are returned as
+        a truncated FetchedProblems listing the missing page offsets.
+        """
         ColorPrinter.info("Fetching problem list from API...")
-        all_problems = []
-        skip = 0
         limit = BATCH_FETCH_LIMIT
         
-        while True:
-            data = self.http_client.get_with_params(
-                f"{self.api_base}/problems",
-                {"limit": str(limit), "skip": str(skip)}
-            )
-            
-            if not data:
+        page = first_page or self._fetch_page(skip, limit)
+        if page is None:
+            return None
+        
+        problems, total = page
+        self.last_total = total
+        if total is None:
+            # No total reported, so the page count is unknown up front
+            return self._fetch_serially(skip, limit, problems)
+        
+        offsets = list(range(skip + limit, total, limit))
+        pages = {skip: problems}
+        self._show_progress(len(problems), total - skip)
+        failed = self._fetch_pages(offsets, limit, pages, len(problems), total - skip)
+        print()  # New line after progress
+        
+        if failed:
+            ColorPrinter.warning(f"Failed to fetch {len(failed)} page(s) starting at: "
+                                 f"{', '.join(str(o) for o in failed)}")
+        
+        all_problems = FetchedProblems(missing=failed)
+        for offset in sorted(pages):
+            all_problems.extend(pages[offset])
+        return all_problems
+    
+    def fetch_missing_pages(self, offsets):
+        """Retry pages that failed in an earlier sync"""
+        ColorPrinter.info(f"Fetching {len(offsets)} page(s) missing from the last sync...")
+        pages = {}
+        failed = self._fetch_pages(offsets, BATCH_FETCH_LIMIT, pages)
+        problems = FetchedProblems(missing=failed)
+        for offset in sorted(pages):
+            problems.extend(pages[offset])
+        return problems
+    
+    def _fetch_serially(self, skip: int, limit: int, problems):
+        """Fetch pages one after another until an empty page is returned"""
+        all_problems = FetchedProblems(problems)
+        while problems:
+            skip += limit
+            print(f"\r  Fetched {len(all_problems)} problems...", end='', flush=True)
+            page = self._fetch_page(skip, limit)
+            if page is None:
+                # A failed page is not the end of the list
+                all_problems.truncated = True
+                ColorPrinter.warning(f"Stopped at offset {skip} after a failed page")
                 break
-            
-            # The API returns an object with problemsetQuestionList
-            if 'problemsetQuestionList' in data:
-                problems = data['problemsetQuestionList']
-                if not problems:
-                    break
-                all_problems.extend(problems)
-                skip += limit
-                # Show count instead of progress bar since we don't know total
-                print(f"\r  Fetched {len(all_problems)} problems...", end='', flush=True)
-            else:
-                # Might be a different format
-                if isinstance(data, list):
-                    if not data:
-                        break
-                    all_problems.extend(data)
-                    skip += limit
-                    # Show count instead of progress bar since we don't know total
-                    print(f"\r  Fetched {len(all_problems)} problems...", end='', flush=True)
-                else:
-                    ColorPrinter.warning("Unexpected API response format")
-                    break
+            problems = page[0]
+            all_problems.extend(problems)
         
         print()  # New line after progress
         return all_problems
     
+    def fetch_new_problems(self, sync_state):
+        """
+        Fetch only the tail of the problem list added since the last sync
+        
+        The list is ordered by frontend ID, so new problems are appended after
+        the last-seen total. The page starting at the last-seen problem is
+        fetched first; if it no longer begins with that problem the ordering
+        has shifted and None is returned so the caller can fall back to a
+        full sync. Pages recorded as missing by a truncated sync are fetched
+        as well.
+        """
+        last_total = sync_state.get('total') or 0
+        last_id = str(sync_state.get('maxFrontendId') or '')
+        if last_total <= 0 or not last_id:
+            return None
+        
+        result = FetchedProblems()
+        pending = sync_state.get('missingPages') or []
+        if pending:
+            # The last sync was truncated; the missing pages may include the end of the list
+            missed = self.fetch_missing_pages(pending)
+            result.extend(missed)
+            result.missing.extend(missed.missing)
+            ids = [int(p['questionFrontendId']) for p in missed
+                   if str(p.get('questionFrontendId', '')).isdigit()]
+            if ids and max(ids) > int(last_id or 0):
+                last_id = str(max(ids))
+        
+        ColorPrinter.info(f"Checking for problems added since #{last_id}...")
+        skip = last_total - 1
+        page = self._fetch_page(skip, BATCH_FETCH_LIMIT)
+        if page is None:
+            return None
+        
+        problems, total = page
+        if not problems or str(problems[0].get('questionFrontendId', '')) != last_id:
+            ColorPrinter.warning("Problem list has shifted since the last sync")
+            return None
+        
+        if total is not None and total <= last_total:
+            self.last_total = total
+            return result
+        
+        tail = self.fetch_all_problems(skip=skip, first_page=page)
+        if tail is None:
+            return None
+        result.extend(tail[1:])
+        result.missing.extend(tail.missing)
+        result.truncated = result.truncated or tail.truncated
+        return result
+    
     def build_metadata(self, problems):
         """Build metadata dictionary from problem list"""
         ColorPrinter.info("Building metadata...")
@@ -105,15 +251,41 @@ class MetadataUpdater:
         ColorPrinter.info("Saving metadata...")
         
         if self.metadata_manager.save(metadata):
-            ColorPrinter.success(f"Metadata saved successfully to: {METADATA_FILE}")
+            ColorPrinter.success(f"Metadata saved successfully to: {self.metadata_manager.store.storage_path}")
+        else:
+            ColorPrinter.error("Failed to save metadata")
+    
+    def merge_metadata(self, metadata):
+        """Merge new entries into the existing metadata, keeping local fields"""
+        ColorPrinter.info("Merging metadata...")
+        
+        existing = self.metadata_manager.load()
+        merged = {problem_id: dict(existing.get(problem_id, {}), **entry)
+                  for problem_id, entry in metadata.items()}
+        
+        if self.metadata_manager.merge(merged):
+            ColorPrinter.success(f"Merged {len(merged)} problems into: {self.metadata_manager.store.storage_path}")
         else:
             ColorPrinter.error("Failed to save metadata")
     
+    def save_sync_state(self, problems, previous=None):
+        """Record the list size, highest frontend ID and any missing pages for the next delta sync"""
+        previous = previous or {}
+        ids = [int(p['questionFrontendId']) for p in problems
+               if str(p.get('questionFrontendId', '')).isdigit()]
+        ids.append(int(previous.get('maxFrontendId') or 0))
+        self.metadata_manager.set_state(SYNC_STATE_KEY, {
+            'total': self.last_total if self.last_total is not None else previous.get('total', len(problems)),
+            'maxFrontendId': max(ids),
+            'missingPages': sorted(set(getattr(problems, 'missing', []))),
+            'syncedAt': datetime.now().isoformat(),
+        })
+    
     def _check_and_start_api(self):
         """Check if API is running and start it if needed"""
         return self.api_manager.ensure_running()
     
-    def run(self):
+    def run(self, full: bool = False):
         """Main update process"""
         print(UIStyle.header("LeetPlusPlus Metadata Updater", "Fetching problem data from LeetCode API"))
         
@@ -121,18 +293,38 @@ class MetadataUpdater:
         if not self._check_and_start_api():
             return 1
         
-        # Fetch all problems
-        problems = self.fetch_all_problems()
-        if problems is None:
-            return 1
-        
-        if not problems:
-            ColorPrinter.error("No problems fetched!")
-            return 1
+        sync_state = self.metadata_manager.get_state(SYNC_STATE_KEY)
+        problems = None
+        if not full and sync_state and self.metadata_manager.load():
+            problems = self.fetch_new_problems(sync_state)
+            if problems is not None:
+                if problems:
+                    self.merge_metadata(self.build_metadata(problems))
+                elif problems.complete:
+                    ColorPrinter.success("Metadata is already up to date")
+                self.save_sync_state(problems, previous=sync_state)
+                metadata = self.metadata_manager.load()
+            else:
+                ColorPrinter.info("Falling back to a full sync")
         
-        # Build and save metadata
-        metadata = self.build_metadata(problems)
-        self.save_metadata(metadata)
+        if problems is None:
+            # Fetch all problems
+            problems = self.fetch_all_problems()
+            
+            if not problems:
+                ColorPrinter.error("No problems fetched!")
+                return 1
+            
+            # Build and save metadata
+            metadata = self.build_metadata(problems)
+            if problems.complete:
+                self.save_metadata(metadata)
+            else:
+                # Keep what was fetched without dropping entries from the missing pages
+                self.merge_metadata(metadata)
+                metadata = self.metadata_manager.load()
+            if problems.missing or not problems.truncated:
+                self.save_sync_state(problems)
         
         # Show some statistics
         print(UIStyle.section_header("Statistics"))
@@ -147,13 +339,17 @@ class MetadataUpdater:
         print(f"  {Fore.RED}Hard{Style.RESET_ALL}:   {difficulties['Hard']:>4}")
         print(f"  {Fore.CYAN}Total{Style.RESET_ALL}:  {len(metadata):>4} (free problems only)")
         
-        print(UIStyle.footer("Metadata update completed successfully!"))
+        if problems.complete:
+            print(UIStyle.footer("Metadata update completed successfully!"))
+        else:
+            print(UIStyle.footer("Metadata update incomplete: some pages could not be fetched. "
+                                 "Run 'update' again to fetch just those"))
         
         return 0
 
 def main():
     updater = MetadataUpdater()
-    sys.exit(updater.run())
+    sys.exit(updater.run(full='--full' in sys.argv[1:]))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Parallel code generation for LeetPlusPlus
+Rebuilds problem headers from cached API payloads on a process pool
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Optional, Set
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from common import ColorPrinter
+from config import CACHE_DIR, GENERATE_WORKERS, GENERATE_CHUNK_SIZE
+from generate_solution import GenerationSession, find_problem_files, get_problem_number, render_solution, write_solution
+from leetcode_fetcher_simple import parse_problem_data
+from ui_style import UIStyle
+
+
+def parse_id_ranges(text: str) -> Set[int]:
+    """Parse '1-500' or '1,4,10-20' into a set of problem numbers (ValueError if malformed)"""
+    ids = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = part.split('-', 1)
+            ids.update(range(int(low), int(high) + 1))
+        else:
+            ids.add(int(part))
+    return ids
+
+
+def existing_problem_numbers() -> frozenset:
+    """Numbers of the problems that already have a header or source in src/Problems"""
+    return frozenset(get_problem_number(path.name) for path in find_problem_files())
+
+
+def render_cached(path: str, ids: Optional[frozenset] = None,
+                  existing: frozenset = frozenset()) -> Optional[Dict]:
+    """
+    Render the header for one cached /select payload (runs in a worker process)
+    
+    Returns None for cache entries that aren't selected problems. Otherwise
+    returns the rendered file, or the reason it was skipped or couldn't be
+    rendered, along with the worker's pid and the CPU time spent. Problems in
+    `existing` are skipped before any work is done.
+    """
+    start = time.process_time()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        # Entries start with their endpoint, so problem lists are skipped unparsed
+        if '"endpoint": "select"' not in text[:64]:
+            return None
+        payload = json.loads(text).get('payload') or {}
+    except (OSError, ValueError):
+        return None
+    
+    problem_id = str(payload.get('questionFrontendId') or '')
+    if not problem_id.isdigit() or (ids is not None and int(problem_id) not in ids):
+        return None
+    
+    result = {'pid': os.getpid(), 'id': problem_id,
+              'title': payload.get('title') or payload.get('questionTitle') or payload.get('titleSlug')}
+    if payload.get('isPaidOnly'):
+        result['skipped'] = 'paid'
+    elif int(problem_id) in existing:
+        result['skipped'] = 'existing'
+    else:
+        try:
+            parsed = parse_problem_data(payload)
+            if not parsed['signature']:
+                raise ValueError("could not extract C++ signature")
+            result['filename'], result['content'], result['entry'], result['test_data'] = render_solution(
+                problem_number=int(parsed['problem_id']),
+                title=parsed['title'],
+                signature=parsed['signature'],
+                difficulty=parsed['difficulty'],
+                topics=parsed['topics'],
+                companies=[],  # API doesn't provide company info
+                test_cases_data=parsed['test_cases_data'],
+                constraints=parsed['constraints']
+            )
+        except Exception as e:
+            result['error'] = str(e)
+    result['time'] = time.process_time() - start  # CPU time, so the pool size doesn't skew it
+    return result
+
+
+class ParallelGenerator:
+    """
+    Regenerates problem headers from the response cache on a process pool
+    
+    Signature parsing, example extraction, test generation and template
+    substitution are CPU-bound and independent per problem, so they run in
+    worker processes. Workers never touch the outputs: the calling process
+    is the single writer, applying files as results arrive and flushing
+    metadata and AllProblems.h once through a GenerationSession.
+    """
+    
+    def __init__(self, workers: int = GENERATE_WORKERS, chunk_size: int = GENERATE_CHUNK_SIZE,
+                 force: bool = False, cache_dir: Path = CACHE_DIR):
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.force = force
+        self.cache_dir = Path(cache_dir)
+        self.counts = {'generated': 0, 'unchanged': 0, 'existing': 0, 'paid': 0, 'failed': 0}
+        self.worker_stats = {}  # pid -> [problems, CPU seconds]
+        self.write_time = 0.0
+    
+    def _results(self, paths, ids):
+        existing = frozenset() if self.force else existing_problem_numbers()
+        render = partial(render_cached, ids=frozenset(ids) if ids is not None else None,
+                         existing=existing)
+        if self.workers == 1:
+            yield from map(render, paths)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield from executor.map(render, paths, chunksize=self.chunk_size)
+    
+    def run(self, ids: Optional[Set[int]] = None) -> int:
+        """Regenerate every cached problem (or those in ids), returning the number written"""
+        paths = [str(p) for p in self.cache_dir.glob("*/*.json")] if self.cache_dir.exists() else []
+        if not paths:
+            ColorPrinter.warning(f"No cached API responses in {self.cache_dir}")
+            ColorPrinter.info("Fetch problems first (e.g. 'lpp fetch two-sum' or a batch import)")
+            return 0
+        
+        started = time.perf_counter()
+        with GenerationSession():
+            for result in self._results(paths, ids):
+                if result is not None:
+                    self._apply(result)
+        
+        self.print_summary(time.perf_counter() - started, ids)
+        return self.counts['generated']
+    
+    def _apply(self, result: Dict):
+        """Write one rendered header (runs in the calling process only)"""
+        stats = self.worker_stats.setdefault(result['pid'], [0, 0.0])
+        stats[0] += 1
+        stats[1] += result['time']
+        label = f"#{result['id']} {result['title']}"
+        
+        if 'skipped' in result:
+            self.counts[result['skipped']] += 1
+            return
+        if 'error' in result:
+            self.counts['failed'] += 1
+            ColorPrinter.error(f"{label}: {result['error']}")
+            return
+        
+        start = time.perf_counter()
+        try:
+            if write_solution(int(result['id']), result['filename'], result['content'],
+                              result['entry'], force=self.force, test_data=result['test_data']):
+                self.counts['generated'] += 1
+            else:
+                self.counts['unchanged'] += 1
+        except ValueError as e:
+            if "already exists" not in str(e):
+                raise
+            self.counts['existing'] += 1
+        except OSError as e:
+            self.counts['failed'] += 1
+            ColorPrinter.error(f"{label}: {e}")
+        finally:
+            self.write_time += time.perf_counter() - start
+    
+    def print_summary(self, wall_time: float, ids: Optional[Set[int]] = None):
+        """Print counts, overall throughput and throughput per worker process"""
+        processed = sum(self.counts.values())
+        throughput = processed / wall_time if wall_time > 0 else 0
+        
+        print(UIStyle.section_header("Generation Summary"))
+        print(f"  Generated: {self.counts['generated']}"
+              f"  Unchanged: {self.counts['unchanged']}"
+              f"  Existing: {self.counts['existing']}"
+              f"  Failed: {self.counts['failed']}"
+              f"  Paid-only skipped: {self.counts['paid']}")
+        if ids is not None and processed < len(ids):
+            print(f"  Not in the response cache: {len(ids) - processed} of {len(ids)} requested")
+        if self.counts['existing'] and not self.force:
+            print("  Existing headers were kept (use --force to overwrite them)")
+        print(f"  Wall time: {wall_time:.2f}s  Throughput: {throughput:.1f} problems/s"
+              f"  Writer: {self.write_time:.2f}s")
+        
+        print(UIStyle.section_header(f"Workers ({self.workers})"))
+        cpu_total = 0.0
+        for index, (pid, (count, cpu)) in enumerate(sorted(self.worker_stats.items()), 1):
+            cpu_total += cpu
+            rate = count / cpu if cpu > 0 else 0
+            print(f"  worker {index:<3} pid {pid:<8} {count:>6} problems  {cpu:>7.2f}s cpu  {rate:>8.1f} problems/cpu-s")
+        if wall_time > 0 and cpu_total:
+            print(f"  Parallel speedup: {cpu_total / wall_time:.1f}x (worker CPU time / wall time)"
+                  f" on {os.cpu_count() or 1} core(s)")
+
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Replay server for LeetPlusPlus
+Stand-in for the AlfaLeetCode API that serves recorded or synthetic data
+
+Serves /, /problems, /select and /daily with the same response shapes as
+vendor/AlfaLeetCode, so the fetcher, updater and batch importer can be run
+and benchmarked without Node or network access. Responses come from
+recorded fixtures (response cache entries, see response_cache.py) or from
+a deterministic synthetic corpus, with optional latency, error and
+dropped-connection injection.
+
+Usage:
+    python replay_server.py [--port N] [--fixtures DIR | --synthetic N]
+                            [--latency MS] [--jitter MS] [--error-rate R]
+                            [--drop-rate R] [--seed N]
+    python replay_server.py bench [--requests N] [--workers N] [options above]
+
+Set API_BACKEND = "replay" in config.py (or LPP_API_BACKEND=replay) to have
+the tools start this server instead of the Node one.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(str(Path(__file__).parent))
+from config import (
+    REPLAY_FIXTURES_DIR, REPLAY_SYNTHETIC_COUNT, REPLAY_LATENCY_MS, REPLAY_JITTER_MS,
+    REPLAY_ERROR_RATE, REPLAY_DROP_RATE, REPLAY_SEED
+)
+
+
+# (C++ snippet, example inputs, example output) used by synthetic problems
+SYNTHETIC_SIGNATURES = [
+    ("vector<int> twoSum(vector<int>& nums, int target)",
+     "nums = [2,7,11,15], target = 9", "[0,1]"),
+    ("int lengthOfLongestSubstring(string s)",
+     's = "abcabcbb"', "3"),
+    ("bool isPalindrome(int x)",
+     "x = 121", "true"),
+    ("int maxProfit(vector<int>& prices)",
+     "prices = [7,1,5,3,6,4]", "5"),
+    ("string longestCommonPrefix(vector<string>& strs)",
+     'strs = ["flower","flow","flight"]', '"fl"'),
+    ("vector<vector<int>> merge(vector<vector<int>>& intervals)",
+     "intervals = [[1,3],[2,6],[8,10]]", "[[1,6],[8,10]]"),
+    ("double findMedianSortedArrays(vector<int>& nums1, vector<int>& nums2)",
+     "nums1 = [1,3], nums2 = [2]", "2.00000"),
+]
+
+SYNTHETIC_TOPICS = [
+    ("Array", "array"), ("String", "string"), ("Hash Table", "hash-table"),
+    ("Dynamic Programming", "dynamic-programming"), ("Math", "math"),
+    ("Sorting", "sorting"), ("Greedy", "greedy"), ("Two Pointers", "two-pointers"),
+    ("Binary Search", "binary-search"), ("Tree", "tree"), ("Graph", "graph"),
+]
+
+
+class ReplayData:
+    """Problem list, per-problem payloads and the daily problem served by the replay server"""
+
+    def __init__(self, problems: List[Dict[str, Any]], questions: Dict[str, Dict[str, Any]],
+                 daily: Optional[Dict[str, Any]] = None, total: Optional[int] = None,
+                 synthetic_seed: Optional[int] = None):
+        self.problems = sorted(problems, key=lambda p: int(p.get('questionFrontendId') or 0))
+        self.questions = questions
+        self.daily = daily
+        self.total = total if total is not None else len(self.problems)
+        self._seed = synthetic_seed
+        self._by_slug = {p.get('titleSlug'): p for p in self.problems}
+
+    @classmethod
+    def synthetic(cls, count: int = REPLAY_SYNTHETIC_COUNT, seed: int = REPLAY_SEED) -> 'ReplayData':
+        """Deterministic corpus of count problems (question pages are built on demand)"""
+        problems = [cls._synthetic_entry(i, seed) for i in range(1, count + 1)]
+        return cls(problems, {}, synthetic_seed=seed)
+
+    @classmethod
+    def from_fixtures(cls, fixtures_dir: Path) -> 'ReplayData':
+        """Load recorded responses (response cache entry files) from a directory"""
+        problems: Dict[str, Dict[str, Any]] = {}
+        questions: Dict[str, Dict[str, Any]] = {}
+        daily = None
+        total = None
+
+        for path in sorted(Path(fixtures_dir).rglob("*.json")):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(entry, dict) or 'payload' not in entry:
+                continue
+
+            endpoint = entry.get('endpoint')
+            payload = entry['payload']
+            if endpoint == 'select' and isinstance(payload, dict):
+                slug = (entry.get('params') or {}).get('titleSlug') or payload.get('titleSlug')
+                if slug:
+                    questions[slug] = payload
+            elif endpoint == 'problems' and isinstance(payload, dict):
+                for problem in payload.get('problemsetQuestionList') or []:
+                    problems[str(problem.get('questionFrontendId'))] = problem
+                total = max(total or 0, payload.get('totalQuestions') or 0)
+            elif endpoint == 'daily' and isinstance(payload, dict):
+                daily = payload
+
+        # Problems only recorded through /select still belong in the list
+        for slug, question in questions.items():
+            problem_id = str(question.get('questionFrontendId'))
+            if problem_id not in problems:
+                problems[problem_id] = {
+                    'questionFrontendId': problem_id,
+                    'title': question.get('questionTitle') or question.get('title'),
+                    'titleSlug': slug,
+                    'difficulty': question.get('difficulty'),
+                    'isPaidOnly': question.get('isPaidOnly', False),
+                    'topicTags': question.get('topicTags') or [],
+                }
+
+        data = cls(list(problems.values()), questions, daily)
+        data.total = max(total or 0, len(data.problems))
+        return data
+
+    @staticmethod
+    def _synthetic_entry(problem_id: int, seed: int) -> Dict[str, Any]:
+        rng = random.Random(seed * 1000003 + problem_id)
+        topics = rng.sample(SYNTHETIC_TOPICS, rng.randint(1, 3))
+        return {
+            'acRate': round(rng.uniform(15, 85), 4),
+            'difficulty': rng.choice(['Easy', 'Medium', 'Medium', 'Hard']),
+            'freqBar': None,
+            'questionFrontendId': str(problem_id),
+            'isFavor': False,
+            'isPaidOnly': rng.random() < 0.05,
+            'status': None,
+            'title': f"Synthetic Problem {problem_id}",
+            'titleSlug': f"synthetic-problem-{problem_id}",
+            'topicTags': [{'name': name, 'id': str(i), 'slug': slug}
+                          for i, (name, slug) in enumerate(topics)],
+            'hasSolution': False,
+            'hasVideoSolution': False,
+        }
+
+    def _synthetic_question(self, problem: Dict[str, Any]) -> Dict[str, Any]:
+        problem_id = int(problem['questionFrontendId'])
+        rng = random.Random(self._seed * 1000003 + problem_id)
+        signature, inputs, output = rng.choice(SYNTHETIC_SIGNATURES)
+        examples = "".join(
+            f'<p><strong class="example">Example {n}:</strong></p>\n'
+            f"<pre>\n<strong>Input:</strong> {inputs}\n<strong>Output:</strong> {output}\n</pre>\n\n"
+            for n in range(1, 3)
+        )
+        content = (f"<p>Synthetic problem {problem_id} used for offline benchmarks.</p>\n\n"
+                   + "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>\n" * 8
+                   + "\n" + examples
+                   + "<p><strong>Constraints:</strong></p>\n<ul>\n"
+                   "\t<li><code>1 &lt;= n &lt;= 10<sup>5</sup></code></li>\n</ul>\n")
+        snippet = f"class Solution {{\npublic:\n    {signature} {{\n        \n    }}\n}};"
+        return {
+            'link': f"https://leetcode.com/problems/{problem['titleSlug']}",
+            'questionId': str(problem_id),
+            'questionFrontendId': str(problem_id),
+            'questionTitle': problem['title'],
+            'titleSlug': problem['titleSlug'],
+            'difficulty': problem['difficulty'],
+            'isPaidOnly': problem['isPaidOnly'],
+            'question': content,
+            'exampleTestcases': "",
+            'topicTags': problem['topicTags'],
+            'hints': [],
+            'solution': None,
+            'companyTagStats': None,
+            'likes': rng.randint(0, 50000),
+            'dislikes': rng.randint(0, 5000),
+            'similarQuestions': "[]",
+            'codeSnippets': [{'lang': 'C++', 'langSlug': 'cpp', 'code': snippet}],
+            'title': problem['title'],
+        }
+
+    def question(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Payload for /select?titleSlug=slug"""
+        if slug in self.questions:
+            return self.questions[slug]
+        problem = self._by_slug.get(slug)
+        if problem is None or self._seed is None:
+            return None
+        return self._synthetic_question(problem)
+
+    def problem_list(self, skip: int, limit: int, difficulty: Optional[str] = None,
+                     tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Payload for /problems with the Node server's paging and filters"""
+        problems = self.problems
+        total = self.total
+        if difficulty or tags:
+            problems = [
+                p for p in problems
+                if (not difficulty or (p.get('difficulty') or '').upper() == difficulty.upper())
+                and (not tags or set(tags) <= {t.get('slug') for t in p.get('topicTags') or []})
+            ]
+            total = len(problems)
+        page = problems[skip:skip + limit]
+        return {'totalQuestions': total, 'count': len(page), 'problemsetQuestionList': page}
+
+    def daily_problem(self) -> Optional[Dict[str, Any]]:
+        """Payload for /daily (recorded, or a question picked by the current date)"""
+        if self.daily is not None or not self.problems:
+            return self.daily
+        problem = self.problems[time.gmtime().tm_yday % len(self.problems)]
+        question = self.question(problem['titleSlug'])
+        if question is None:
+            return None
+        daily = {key: value for key, value in question.items() if key not in ('codeSnippets', 'title', 'link')}
+        daily['questionLink'] = question.get('link')
+        daily['date'] = time.strftime("%Y-%m-%d", time.gmtime())
+        return daily
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's ReplayData, applying fault injection"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Express
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        fault = server.inject_fault()
+        if fault == 'drop':
+            self.close_connection = True
+            return
+        if fault == 'error':
+            self._send_json(503, {'error': 'Injected failure'})
+            return
+
+        route = parts.path.rstrip('/') or '/'
+        if route == '/':
+            self._send_json(200, {'apiOverview': 'LeetPlusPlus replay server', 'problems': server.data.total})
+        elif route == '/problems':
+            skip = self._int_param(params, 'skip', 0)
+            limit = self._int_param(params, 'limit', 1 if 'skip' in params else 20)
+            tags = params['tags'].split() if params.get('tags') else None
+            self._send_json(200, server.data.problem_list(skip, limit, params.get('difficulty'), tags))
+        elif route == '/select':
+            slug = params.get('titleSlug')
+            if not slug:
+                self._send_json(400, {'error': 'Missing or invalid query parameter: titleSlug'})
+                return
+            question = server.data.question(slug)
+            if question is None:
+                self._send_json(404, {'error': f"No recorded problem for {slug}"})
+            else:
+                self._send_json(200, question)
+        elif route == '/daily':
+            daily = server.data.daily_problem()
+            if daily is None:
+                self._send_json(404, {'error': 'No daily problem recorded'})
+            else:
+                self._send_json(200, daily)
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint {parts.path}"})
+
+    @staticmethod
+    def _int_param(params: Dict[str, str], key: str, default: int) -> int:
+        try:
+            return max(0, int(params[key]))
+        except (KeyError, ValueError):
+            return default
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(status)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server replaying ReplayData
+
+    Every request first sleeps latency_ms plus up to jitter_ms, then fails
+    with a 503 with probability error_rate or has its connection closed
+    without a response with probability drop_rate.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, data: ReplayData, host: str = "127.0.0.1", port: int = 3000,
+                 latency_ms: float = REPLAY_LATENCY_MS, jitter_ms: float = REPLAY_JITTER_MS,
+                 error_rate: float = REPLAY_ERROR_RATE, drop_rate: float = REPLAY_DROP_RATE,
+                 seed: int = REPLAY_SEED, verbose: bool = False):
+        super().__init__((host, port), ReplayRequestHandler)
+        self.data = data
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.verbose = verbose
+        self.stats = {'requests': 0, 'errors': 0, 'dropped': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_fault(self) -> Optional[str]:
+        """Apply latency and decide whether this request fails ('error', 'drop' or None)"""
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            roll = self._rng.random()
+            fault = None
+            if roll < self.drop_rate:
+                fault = 'drop'
+                self.stats['dropped'] += 1
+            elif roll < self.drop_rate + self.error_rate:
+                fault = 'error'
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fault
+
+    def count(self, status: int):
+        with self._lock:
+            self.stats['requests'] += 1
+            if status >= 500:
+                self.stats['errors'] += 1
+
+    def start(self) -> 'ReplayServer':
+        """Serve on a background thread (for benchmarks and scripts)"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def load_data(fixtures: Optional[Path] = REPLAY_FIXTURES_DIR,
+              synthetic_count: int = REPLAY_SYNTHETIC_COUNT, seed: int = REPLAY_SEED) -> ReplayData:
+    """Recorded fixtures if any exist, otherwise the synthetic corpus"""
+    if fixtures is not None and Path(fixtures).exists():
+        data = ReplayData.from_fixtures(fixtures)
+        if data.problems:
+            return data
+    return ReplayData.synthetic(synthetic_count, seed)
+
+
+def run_benchmark(server: ReplayServer, requests: int, workers: int):
+    """Measure fetch and metadata update throughput against a running replay server"""
+    import tempfile
+    from metadata_updater import MetadataUpdater
+    from leetcode_fetcher_simple import LeetCodeAPI, parse_problem_data
+    from response_cache import ResponseCache
+    from ui_style import UIStyle
+
+    print(UIStyle.section_header("Replay Benchmark"))
+    print(f"  Server: {server.url}  Problems: {server.data.total}  Workers: {workers}")
+    print(f"  Latency: {server.latency_ms:g}+{server.jitter_ms:g} ms  "
+          f"Error rate: {server.error_rate:g}  Drop rate: {server.drop_rate:g}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # update: the full problem list through the paged, concurrent updater
+        updater = MetadataUpdater(max_workers=workers, base_url=server.url)
+        start = time.perf_counter()
+        problems = updater.fetch_all_problems()
+        elapsed = time.perf_counter() - start
+        fetched = len(problems) if problems else 0
+        print(f"  update  {fetched:>6} problems  {elapsed:>7.2f}s  {fetched / elapsed:>9.1f} problems/s")
+
+        # fetch + parse: individual problem pages, bypassing the response cache
+        api = LeetCodeAPI(base_url=server.url, refresh=True, cache=ResponseCache(Path(tmp)))
+        slugs = [p['titleSlug'] for p in server.data.problems[:requests]]
+
+        def fetch_and_parse(slug):
+            data = api.fetch_problem(slug)
+            return data is not None and parse_problem_data(data)['signature'] is not None
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            ok = sum(1 for result in executor.map(fetch_and_parse, slugs) if result)
+        elapsed = time.perf_counter() - start
+        print(f"  fetch   {ok:>6}/{len(slugs):<6}        {elapsed:>7.2f}s  {len(slugs) / elapsed:>9.1f} problems/s")
+
+    print(f"  Server stats: {server.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AlfaLeetCode API replay server')
+    parser.add_argument('command', nargs='?', choices=['serve', 'bench'], default='serve')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000, help='port (0 picks a free one)')
+    parser.add_argument('--fixtures', type=Path, default=REPLAY_FIXTURES_DIR,
+                        help='directory of recorded responses (default: the response cache)')
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='serve N synthetic problems instead of fixtures')
+    parser.add_argument('--latency', type=float, default=REPLAY_LATENCY_MS, help='added latency in ms')
+    parser.add_argument('--jitter', type=float, default=REPLAY_JITTER_MS, help='random extra latency in ms')
+    parser.add_argument('--error-rate', type=float, default=REPLAY_ERROR_RATE, help='fraction of 503 responses')
+    parser.add_argument('--drop-rate', type=float, default=REPLAY_DROP_RATE, help='fraction of dropped connections')
+    parser.add_argument('--seed', type=int, default=REPLAY_SEED)
+    parser.add_argument('--requests', type=int, default=500, help='bench: problem pages to fetch')
+    parser.add_argument('--workers', type=int, default=8, help='bench: concurrent requests')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        data = ReplayData.synthetic(args.synthetic, args.seed)
+    else:
+        data = load_data(args.fixtures, seed=args.seed)
+
+    port = 0 if args.command == 'bench' and args.port == 3000 else args.port
+    server = ReplayServer(data, args.host, port, args.latency, args.jitter,
+                          args.error_rate, args.drop_rate, args.seed, args.verbose)
+
+    if args.command == 'bench':
+        server.start()
+        try:
+            run_benchmark(server, args.requests, args.workers)
+        finally:
+            server.stop()
+        return 0
+
+    print(f"Replaying {data.total} problems on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Response cache for LeetPlusPlus
+Stores API payloads on disk so repeated fetches skip the network
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_TTLS
+
+
+class ResponseCache:
+    """
+    On-disk cache of API responses keyed by endpoint and parameters
+
+    Each entry lives in a file named by the SHA-256 of its request, so the
+    same request always maps to the same file. Entries expire after a
+    per-endpoint TTL, and the least recently used ones are evicted once the
+    cache grows past its size budget (a hit refreshes the file's mtime).
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict[str, str]] = None) -> str:
+        """Stable hash of an endpoint and its query parameters"""
+        request = json.dumps([endpoint.strip('/'), params or {}], sort_keys=True)
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def get(self, endpoint: str, params: Optional[Dict[str, str]] = None,
+            allow_stale: bool = False) -> Optional[Any]:
+        """Return a cached payload, or None if missing or expired"""
+        path = self._path(self.key(endpoint, params))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        ttl = self.ttls.get(endpoint.strip('/'))
+        if not allow_stale and ttl is not None and time.time() - entry.get('stored', 0) > ttl:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get('payload')
+
+    def put(self, endpoint: str, params: Optional[Dict[str, str]], payload: Any):
+        """Store a payload and evict old entries if over budget"""
+        path = self._path(self.key(endpoint, params))
+        entry = {
+            'endpoint': endpoint.strip('/'),
+            'params': params or {},
+            'stored': time.time(),
+            'payload': payload,
+        }
+        data = json.dumps(entry).encode('utf-8')
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        old_size = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._entries())
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until under the size budget"""
+        entries = []
+        for p in self._entries():
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self, endpoint: Optional[str] = None) -> int:
+        """
+        Delete all entries (or those for one endpoint), returning the count
+
+        An entry that can't be read can't be told apart by endpoint, so only
+        a full clear removes it.
+        """
+        removed = 0
+        for p in self._entries():
+            if endpoint:
+                try:
+                    with open(p, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(entry, dict) or entry.get('endpoint') != endpoint.strip('/'):
+                    continue
+            try:
+                p.unlink()
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._total_bytes = None
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and sizes per endpoint, plus this session's hit rate"""
+        endpoints: Dict[str, Dict[str, int]] = {}
+        total_bytes = 0
+        expired = 0
+        now = time.time()
+
+        for p in self._entries():
+            try:
+                size = p.stat().st_size
+                with open(p, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            endpoint = entry.get('endpoint', '?')
+            bucket = endpoints.setdefault(endpoint, {'entries': 0, 'bytes': 0})
+            bucket['entries'] += 1
+            bucket['bytes'] += size
+            total_bytes += size
+            ttl = self.ttls.get(endpoint)
+            if ttl is not None and now - entry.get('stored', 0) > ttl:
+                expired += 1
+
+        return {
+            'directory': str(self.cache_dir),
+            'entries': sum(b['entries'] for b in endpoints.values()),
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'expired': expired,
+            'endpoints': endpoints,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Stress inputs for LeetPlusPlus
+Generates seeded random arguments sized from a problem's constraints
+
+For every scaling size n, each vector, string, list and tree argument gets
+about n elements (2D vectors get about n cells, as close to square as the
+constraints allow), clamped to the lengths the constraints permit. Scalars
+are drawn from their range, which may depend on a generated length
+("1 <= k <= nums.length"). A signature with only scalars scales its first
+integer argument instead. The inputs for every size are written to
+src/Problems/Data/<number>.scale.bin, which the generated ScaleProblemN
+loads and times (`lpp scale <number>`).
+"""
+
+import math
+import random
+import string
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import SCALING_SIZES, STRESS_MAX_SIZE, STRESS_VALUE_RANGE, TEST_DATA_DIR
+from common import MetadataManager, write_if_changed
+from constraints import evaluate
+from cpp_types import CppType, CppTypeConverter
+from test_data import TestDataWriter, storage_layout
+
+
+def _is_sized(cpp_type: CppType) -> bool:
+    return cpp_type.is_vector or cpp_type.is_string or cpp_type.is_list_node or cpp_type.is_tree_node
+
+
+def _is_2d(cpp_type: CppType) -> bool:
+    if not (cpp_type.is_vector and cpp_type.args):
+        return False
+    inner = cpp_type.args[0]
+    return inner.is_vector or inner.is_string
+
+
+def _element_type(cpp_type: CppType) -> CppType:
+    """The scalar type a sized argument is filled with"""
+    while cpp_type.is_vector and cpp_type.args:
+        cpp_type = cpp_type.args[0]
+    if cpp_type.is_string:
+        return CppType.of('char')
+    if cpp_type.is_list_node or cpp_type.is_tree_node:
+        return CppType.of('int')
+    return cpp_type.value_type()
+
+
+class StressInputGenerator:
+    """
+    Random arguments for one signature
+
+    constraints is the spec from constraints.parse_constraints (stored in the
+    problem's metadata); missing bounds fall back to STRESS_MAX_SIZE lengths
+    and STRESS_VALUE_RANGE values.
+    """
+
+    def __init__(self, sig_data: Dict, constraints: Optional[Dict] = None, seed: int = 0):
+        self.params = [(p['name'], CppType.of(p.get('cpp_type') or p['type'])) for p in sig_data['params']]
+        self.constraints = constraints or {}
+        self.seed = seed
+        sized = [name for name, cpp_type in self.params if _is_sized(cpp_type)]
+        integers = [name for name, cpp_type in self.params
+                    if cpp_type.value_type().is_a('int') or cpp_type.value_type().is_a('long long')]
+        self.sized = sized
+        # With nothing to size, n is the value of the first integer argument
+        self.driver = integers[0] if not sized and integers else None
+
+    @staticmethod
+    def supports(sig_data: Dict) -> bool:
+        """True if every argument can be generated and stored in a data file"""
+        params = [CppType.of(p.get('cpp_type') or p['type']) for p in sig_data['params']]
+        return bool(params) and all(storage_layout(t) is not None for t in params)
+
+    def _range(self, name: str, field: str, default: Tuple[float, float], env: Optional[Dict] = None) -> Tuple:
+        bounds = self.constraints.get(name, {}).get(field) or [None, None]
+        lo = evaluate(bounds[0], env) if bounds[0] is not None else None
+        hi = evaluate(bounds[1], env) if bounds[1] is not None else None
+        lo = default[0] if lo is None else lo
+        hi = default[1] if hi is None else hi
+        return (lo, max(lo, hi))
+
+    def _shape(self, name: str, cpp_type: CppType, n: int) -> Tuple[int, int]:
+        """(outer length, inner length) closest to n elements in total; inner is 0 for flat arguments"""
+        outer_range = self._range(name, 'length', (0, STRESS_MAX_SIZE))
+        if not _is_2d(cpp_type):
+            return int(min(max(n, outer_range[0]), outer_range[1])), 0
+        inner_range = self._range(name, 'inner_length', (1, STRESS_MAX_SIZE))
+        inner = int(min(max(math.isqrt(n), inner_range[0]), inner_range[1]))
+        outer = int(min(max(n // max(inner, 1), outer_range[0]), outer_range[1]))
+        return outer, inner
+
+    def max_size(self, cap: Optional[int] = STRESS_MAX_SIZE) -> int:
+        """The largest n every argument can reach within its constraints, at most cap (None for no cap)"""
+        if self.driver:
+            limit = int(self._range(self.driver, 'value', (0, STRESS_MAX_SIZE))[1])
+            return limit if cap is None else min(limit, cap)
+        limits = []
+        for name, cpp_type in self.params:
+            if name in self.sized:
+                outer, inner = self._shape(name, cpp_type, 10 ** 18)
+                limits.append(outer * inner if inner else outer)
+        if cap is not None:
+            limits.append(cap)
+        return int(min(limits)) if limits and self.sized else 0
+
+    def sizes(self, candidates: Optional[List[int]] = None) -> List[int]:
+        """The scaling sizes within max_size(); small limits get a few fractions of the limit instead"""
+        limit = self.max_size()
+        chosen = [n for n in (candidates or SCALING_SIZES) if n <= limit]
+        if not chosen and limit > 0:
+            chosen = sorted({max(1, limit // 8), max(1, limit // 4), max(1, limit // 2), limit})
+        return chosen
+
+    def generate(self, n: int) -> List[Any]:
+        """Arguments for size n, in signature order (the same n and seed always give the same values)"""
+        rng = random.Random(f"{self.seed}:{n}")
+        values = {}
+        env = {}
+        for name, cpp_type in self.params:
+            if name in self.sized:
+                values[name] = self._sized_value(rng, name, cpp_type, n, env)
+        for name, cpp_type in self.params:
+            if name in values:
+                continue
+            if name == self.driver:
+                lo, hi = self._range(name, 'value', (0, STRESS_MAX_SIZE))
+                values[name] = int(min(max(n, lo), hi))
+            else:
+                values[name] = self._scalar(rng, name, cpp_type.value_type(), env)
+        return [values[name] for name, _ in self.params]
+
+    def _sized_value(self, rng: random.Random, name: str, cpp_type: CppType, n: int, env: Dict) -> Any:
+        outer, inner = self._shape(name, cpp_type, n)
+        env[f'{name}.length'] = outer
+        element = _element_type(cpp_type)
+        if not inner:
+            items = self._elements(rng, name, element, outer, env)
+            return ''.join(items) if cpp_type.is_string else items
+        env[f'{name}[i].length'] = inner
+        rows = [self._elements(rng, name, element, inner, env) for _ in range(outer)]
+        return [''.join(row) for row in rows] if cpp_type.args[0].is_string else rows
+
+    def _elements(self, rng: random.Random, name: str, element: CppType, count: int, env: Dict) -> List[Any]:
+        spec = self.constraints.get(name, {})
+        if element.is_a('char'):
+            charset = spec.get('charset') or string.ascii_lowercase
+            return rng.choices(charset, k=count)
+
+        lo, hi = self._range(name, 'value', STRESS_VALUE_RANGE, env)
+        if element.is_a('double'):
+            items = [rng.uniform(lo, hi) for _ in range(count)]
+        elif spec.get('distinct') and hi - lo + 1 >= count:
+            items = rng.sample(range(int(lo), int(hi) + 1), count)
+        else:
+            items = [rng.randint(int(lo), int(hi)) for _ in range(count)]
+        if spec.get('sorted'):
+            items.sort(reverse=spec['sorted'] == 'desc')
+        return items
+
+    def _scalar(self, rng: random.Random, name: str, cpp_type: CppType, env: Dict) -> Any:
+        if cpp_type.is_a('char'):
+            return rng.choice(self.constraints.get(name, {}).get('charset') or string.ascii_lowercase)
+        if cpp_type.is_string:
+            return ''.join(self._elements(rng, name, CppType.of('char'), 8, env))
+        lo, hi = self._range(name, 'value', STRESS_VALUE_RANGE, env)
+        if cpp_type.is_a('double'):
+            return rng.uniform(lo, hi)
+        return rng.randint(int(lo), int(hi))
+
+
+def write_scaling_data(problem_number: int, sig_data: Dict, constraints: Optional[Dict] = None,
+                       sizes: Optional[List[int]] = None, seed: int = 0,
+                       directory: Path = TEST_DATA_DIR) -> Tuple[Path, List[int]]:
+    """
+    Write the scaling inputs of a problem, returning (path, sizes)
+
+    Each size is stored as its n (a long long) followed by the arguments in
+    signature order, which is the layout ScaleProblemN reads.
+    """
+    generator = StressInputGenerator(sig_data, constraints, seed)
+    sizes = generator.sizes(sizes)
+    writer = TestDataWriter(problem_number, suffix='.scale')
+    for n in sizes:
+        writer.add_value(n, 'long long')
+        for value, (_, cpp_type) in zip(generator.generate(n), generator.params):
+            writer.add_value(value, cpp_type)
+    path = Path(directory) / writer.filename
+    write_if_changed(path, writer.to_bytes())
+    return path, sizes
+
+
+def load_problem_spec(problem_number: int) -> Tuple[Dict, Optional[Dict]]:
+    """
+    The parsed signature and recorded constraints of a local problem
+
+    Raises ValueError if the problem has no signature whose inputs can be
+    generated.
+    """
+    entry = MetadataManager().get_problem_by_id(str(problem_number)) or {}
+    signature = entry.get('signature')
+    if not signature:
+        raise ValueError(f"Problem {problem_number} has no signature in the metadata; generate it first")
+    sig_data = CppTypeConverter.parse_signature(signature)
+    if not sig_data or not StressInputGenerator.supports(sig_data):
+        raise ValueError(f"Inputs for '{signature}' can't be generated (bool and custom types aren't supported)")
+    return sig_data, entry.get('constraints')
+
+
+def write_problem_scaling_data(problem_number: int, sizes: Optional[List[int]] = None,
+                               seed: int = 0) -> Tuple[Path, List[int], bool]:
+    """
+    Write the scaling inputs of a local problem from its metadata entry
+
+    Returns (path, sizes, whether constraints were recorded). Raises
+    ValueError if the problem has no usable signature.
+    """
+    sig_data, constraints = load_problem_spec(problem_number)
+    path, sizes = write_scaling_data(problem_number, sig_data, constraints, sizes, seed)
+    return path, sizes, bool(constraints)
@@ -32,5 +32,5 @@ void TestProblem${number}()
 }
 
 REGISTER_SOLUTION(${number}, "${title}", TestProblem${number});
-
+${scaling}
 #endif // PROBLEM_${number}_H
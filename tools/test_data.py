@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Binary test data for LeetPlusPlus
+Moves example values too large to compile out of generated problems
+
+A literal with 10^5 elements costs the compiler far more than the test that
+uses it, so values whose text is longer than TEST_DATA_INLINE_LIMIT are
+written to src/Problems/Data/<number>.bin instead and loaded at runtime by
+TestHelpers::TestData, which memory-maps the file. The format is documented
+next to the loader in src/Common/TestHelpers.h.
+"""
+
+import json
+import struct
+from typing import Any, List, Optional, Tuple
+
+from config import TEST_DATA_INLINE_LIMIT
+from cpp_types import CppType
+
+
+MAGIC = b'LPPD'
+VERSION = 1
+
+# Element types, matching TestHelpers::Data::Type
+INT32 = 1
+INT64 = 2
+FLOAT64 = 3
+CHAR = 4
+STRING = 5
+
+_SCALAR_TYPES = {'int': INT32, 'long long': INT64, 'double': FLOAT64, 'char': CHAR}
+_PACK_FORMATS = {INT32: 'i', INT64: 'q', FLOAT64: 'd'}
+
+# Trees are stored in level order with INT_MIN for missing nodes, as CreateBinaryTree expects
+_NULL_NODE = -2 ** 31
+
+
+def storage_layout(cpp_type: CppType) -> Optional[Tuple[int, int]]:
+    """(element type, rank) a value is stored as, or None if the format can't hold it"""
+    if cpp_type.is_list_node or cpp_type.is_tree_node:
+        return INT32, 1
+    if cpp_type.is_pointer:
+        return None
+    if cpp_type.is_vector and cpp_type.args:
+        inner = storage_layout(cpp_type.args[0])
+        return (inner[0], inner[1] + 1) if inner else None
+    if cpp_type.is_string:
+        return STRING, 0
+    if cpp_type.args is None and cpp_type.name in _SCALAR_TYPES:
+        return _SCALAR_TYPES[cpp_type.name], 0
+    return None
+
+
+def parse_value(text: str) -> Any:
+    """Parse an example value as JSON, accepting the {...} form used for C++ initializers"""
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    return json.loads(text.replace('{', '[').replace('}', ']'))
+
+
+def _encode(value: Any, element_type: int, rank: int, out: List[bytes]):
+    """Append the payload of one value (see TestHelpers::Data::Value)"""
+    if rank == 0:
+        if element_type == STRING:
+            encoded = value.encode('utf-8')
+            out.append(struct.pack('<Q', len(encoded)))
+            out.append(encoded)
+        elif element_type == CHAR:
+            out.append(_encode_chars([value]))
+        else:
+            out.append(struct.pack('<' + _PACK_FORMATS[element_type], value))
+        return
+
+    out.append(struct.pack('<Q', len(value)))
+    if rank > 1 or element_type == STRING:
+        for item in value:
+            _encode(item, element_type, rank - 1, out)
+    elif element_type == CHAR:
+        out.append(_encode_chars(value))
+    else:
+        # Flat arrays are packed, so the loader copies them in one go
+        out.append(struct.pack(f'<{len(value)}{_PACK_FORMATS[element_type]}', *value))
+
+
+def _encode_chars(values: List[str]) -> bytes:
+    # LeetCode writes characters as one-letter strings
+    if not all(isinstance(c, str) and len(c) == 1 for c in values):
+        raise ValueError("expected single characters")
+    return ''.join(values).encode('latin-1')
+
+
+class TestDataWriter:
+    """
+    Collects the values spilled out of one problem's tests
+
+    The test generator offers every value to add(); it keeps the ones whose
+    literal fits inline and returns an index for the rest, which the
+    generated code passes to TestData::Get. to_bytes() renders the file.
+    """
+
+    def __init__(self, problem_number: int, limit: int = TEST_DATA_INLINE_LIMIT, suffix: str = ''):
+        self.filename = f"{problem_number}{suffix}.bin"
+        self.limit = limit
+        self.records = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def should_spill(self, text: str) -> bool:
+        return len(text) > self.limit
+
+    def add(self, text: str, cpp_type: CppType) -> Optional[int]:
+        """Store a value if its literal is too long to inline, returning its index (None to inline it)"""
+        if not self.should_spill(text) or storage_layout(CppType.of(cpp_type)) is None:
+            return None
+        try:
+            return self.add_value(parse_value(text), cpp_type)
+        except ValueError:
+            return None  # Not in the shape the type says, so it stays a literal
+
+    def add_value(self, value: Any, cpp_type: CppType) -> int:
+        """Store a parsed value (lists for vectors, None for missing tree nodes), returning its index"""
+        cpp_type = CppType.of(cpp_type)
+        layout = storage_layout(cpp_type)
+        if layout is None:
+            raise ValueError(f"{cpp_type} can't be stored in a test data file")
+        element_type, rank = layout
+
+        try:
+            if cpp_type.is_tree_node:
+                value = [_NULL_NODE if item is None else item for item in value]
+            out = [struct.pack('<BBH', element_type, rank, 0)]
+            _encode(value, element_type, rank, out)
+        except (TypeError, AttributeError, struct.error) as e:
+            raise ValueError(f"value doesn't fit {cpp_type}: {e}") from e
+
+        self.records.append(b''.join(out))
+        return len(self.records) - 1
+
+    def to_bytes(self) -> bytes:
+        """The data file: header, offset table, then the records"""
+        count = len(self.records)
+        offset = len(MAGIC) + 8 + 8 * count
+        offsets = []
+        for record in self.records:
+            offsets.append(offset)
+            offset += len(record)
+        return (MAGIC + struct.pack('<II', VERSION, count) + struct.pack(f'<{count}Q', *offsets)
+                + b''.join(self.records))
@@ -5,41 +5,44 @@ Simplifies the generation of C++ test code from LeetCode examples
 """
 
 import re
-from typing import List, Dict, Optional, Any
-from cpp_types import CppTypeConverter
+from typing import List, Dict, Optional, Any, Union
+from config import TEST_CASE_STYLE
+from cpp_types import CppType
+from test_data import TestDataWriter, storage_layout
 
 
 class TestCaseParser:
     """Handles parsing and generation of test cases"""
     
     @staticmethod
-    def parse_value(value_str: str, param_type: str) -> str:
+    def parse_value(value_str: str, param_type: Union[CppType, str]) -> str:
         """Convert a string representation of a value to C++ code"""
         value_str = value_str.strip()
+        cpp_type = CppType.of(param_type)
         
         # Special handling for pointer types
-        if 'ListNode' in param_type or 'TreeNode' in param_type:
+        if cpp_type.is_list_node or cpp_type.is_tree_node:
             return value_str  # Return as-is, will be handled in code generation
         
         # Handle vector types
-        if 'vector' in param_type:
+        if cpp_type.is_vector:
             if value_str.startswith('[') and value_str.endswith(']'):
                 # Convert [1,2,3] to {1,2,3}
                 return value_str.replace('[', '{').replace(']', '}')
             return value_str
         
         # Handle string types
-        if 'string' in param_type:
+        if cpp_type.is_string:
             if not (value_str.startswith('"') and value_str.endswith('"')):
                 return f'"{value_str}"'
             return value_str
         
         # Handle boolean
-        if param_type == 'bool':
+        if cpp_type.is_a('bool'):
             return 'true' if value_str.lower() == 'true' else 'false'
         
         # Handle char
-        if param_type == 'char':
+        if cpp_type.is_a('char'):
             if not (value_str.startswith("'") and value_str.endswith("'")):
                 return f"'{value_str}'"
             return value_str
@@ -48,8 +51,20 @@ class TestCaseParser:
         return value_str
     
     @staticmethod
-    def generate_test_code(test_cases_data: Dict, sig_data: Dict, topics: List[str] = None) -> str:
-        """Generate C++ test code from test case data"""
+    def generate_test_code(test_cases_data: Dict, sig_data: Dict, topics: List[str] = None,
+                           style: Optional[str] = None, data: Optional[TestDataWriter] = None) -> str:
+        """
+        Generate C++ test code from test case data
+        
+        The 'unrolled' style declares variables, a call and an assertion per
+        example. The 'table' style emits one row per example and a single
+        TestRunner::RunCases loop, so compile time barely grows with the
+        number of cases; signatures it can't express fall back to unrolled.
+        
+        With a data writer, values whose literals are too long to compile are
+        stored in it and loaded through TestHelpers::TestData instead. Tables
+        only hold literals, so examples with such values are unrolled.
+        """
         if not test_cases_data:
             return TestCaseParser._generate_default_test_comment(sig_data)
         
@@ -58,17 +73,33 @@ class TestCaseParser:
         if not test_cases:
             return TestCaseParser._generate_default_test_comment(sig_data)
         
+        if ((style or TEST_CASE_STYLE) == 'table' and TestCaseParser._supports_table(test_cases, sig_data)
+                and not TestCaseParser._needs_data_file(test_cases, data)):
+            return TestCaseParser._generate_table(test_cases, sig_data)
+        
         # Generate code
         code_lines = []
         for test in test_cases:
-            TestCaseParser._generate_single_test(test, sig_data, code_lines, topics)
+            TestCaseParser._generate_single_test(test, sig_data, code_lines, topics, data)
         
         # Remove last empty line if present
         if code_lines and code_lines[-1] == '':
             code_lines.pop()
         
+        if data is not None and len(data):
+            # template.h already indents the first line
+            code_lines[:0] = [f'TestHelpers::TestData testData(__FILE__, "{data.filename}");', '']
+        
         return '\n'.join(code_lines)
     
+    @staticmethod
+    def _needs_data_file(test_cases: List[Dict], data: Optional[TestDataWriter]) -> bool:
+        """True if any input or expected value is too long to stay a literal"""
+        if data is None:
+            return False
+        return any(data.should_spill(inp['value']) for test in test_cases for inp in test['inputs']) or \
+            any(data.should_spill(test.get('expected') or '') for test in test_cases)
+    
     @staticmethod
     def _parse_test_cases(test_cases_data: Dict, sig_data: Dict) -> List[Dict]:
         """Parse test cases from various formats"""
@@ -108,10 +139,11 @@ class TestCaseParser:
             params = sig_data['params']
             for j, param in enumerate(params):
                 if j < len(inputs):
-                    value = TestCaseParser.parse_value(inputs[j], param['type'])
+                    value = TestCaseParser.parse_value(inputs[j], param.get('cpp_type') or param['type'])
                     test_case['inputs'].append({
                         'name': param['name'],
                         'type': param['type'],
+                        'cpp_type': param.get('cpp_type'),
                         'value': value,
                         'var_name': f"{param['name']}{i + 1}"
                     })
@@ -144,10 +176,11 @@ class TestCaseParser:
             
             # Parse each parameter
             for j, param in enumerate(params):
-                value = TestCaseParser.parse_value(lines[i + j], param['type'])
+                value = TestCaseParser.parse_value(lines[i + j], param.get('cpp_type') or param['type'])
                 test_case['inputs'].append({
                     'name': param['name'],
                     'type': param['type'],
+                    'cpp_type': param.get('cpp_type'),
                     'value': value,
                     'var_name': f"{param['name']}{case_num}"
                 })
@@ -163,14 +196,15 @@ class TestCaseParser:
         return test_cases
     
     @staticmethod
-    def _generate_single_test(test: Dict, sig_data: Dict, code_lines: List[str], topics: List[str]):
+    def _generate_single_test(test: Dict, sig_data: Dict, code_lines: List[str], topics: List[str],
+                              data: Optional[TestDataWriter] = None):
         """Generate code for a single test case"""
         # Add test case label
         code_lines.append(f'    TEST_CASE("Example {test["case_num"]}");')
         
         # Declare input variables
         for input_data in test['inputs']:
-            TestCaseParser._generate_variable_declaration(input_data, code_lines)
+            TestCaseParser._generate_variable_declaration(input_data, code_lines, data)
         
         # Build the function call
         param_names = [inp['var_name'] for inp in test['inputs']]
@@ -178,7 +212,7 @@ class TestCaseParser:
         
         # Generate assertion
         if 'expected' in test and test['expected']:
-            TestCaseParser._generate_assertion(test, sig_data, call, code_lines, topics)
+            TestCaseParser._generate_assertion(test, sig_data, call, code_lines, topics, data)
         else:
             code_lines.append(f'    auto result{test["case_num"]} = {call};')
             code_lines.append(f'    // TODO: Add expected result for example {test["case_num"]}')
@@ -189,55 +223,83 @@ class TestCaseParser:
         code_lines.append('')  # Empty line between test cases
     
     @staticmethod
-    def _generate_variable_declaration(input_data: Dict, code_lines: List[str]):
+    def _generate_variable_declaration(input_data: Dict, code_lines: List[str],
+                                       data: Optional[TestDataWriter] = None):
         """Generate variable declaration for an input"""
-        var_type = input_data['type']
+        var_type = CppType.of(input_data.get('cpp_type') or input_data['type'])
         var_name = input_data['var_name']
         var_value = input_data['value']
         
+        loaded = TestCaseParser._load_from_data(var_value, var_type, data)
+        if loaded:
+            code_lines.append(f'    {var_type.value_type()} {var_name} = {loaded};')
         # Handle special types
-        if 'ListNode' in var_type:
+        elif var_type.is_list_node:
             if var_value.startswith('[') and var_value.endswith(']'):
                 vector_value = var_value.replace('[', '{').replace(']', '}')
                 code_lines.append(f'    ListNode* {var_name} = TestHelpers::CreateLinkedList({vector_value});')
             else:
                 code_lines.append(f'    ListNode* {var_name} = nullptr;')
-        elif 'TreeNode' in var_type:
+        elif var_type.is_tree_node:
             if var_value.startswith('[') and var_value.endswith(']'):
                 tree_value = var_value[1:-1].replace('null', 'INT_MIN')
                 code_lines.append(f'    TreeNode* {var_name} = TestHelpers::CreateBinaryTree({{{tree_value}}});')
             else:
                 code_lines.append(f'    TreeNode* {var_name} = nullptr;')
         else:
-            # Regular types - normalize the type
-            decl_type = CppTypeConverter.normalize_cpp_type(var_type.replace('&', '').strip())
+            # Regular types - declared by value
+            decl_type = var_type.value_type()
             code_lines.append(f'    {decl_type} {var_name} = {var_value};')
     
     @staticmethod
-    def _generate_assertion(test: Dict, sig_data: Dict, call: str, code_lines: List[str], topics: List[str]):
+    def _generate_assertion(test: Dict, sig_data: Dict, call: str, code_lines: List[str], topics: List[str],
+                            data: Optional[TestDataWriter] = None):
         """Generate assertion for test result"""
         expected_val = test['expected']
-        return_type = sig_data['return_type']
+        return_type = CppType.of(sig_data.get('return_cpp_type') or sig_data['return_type'])
         case_num = test['case_num']
         
+        loaded = TestCaseParser._load_from_data(expected_val, return_type, data)
+        if loaded:
+            expected_val = loaded
+        
         # Handle different return types
-        if 'ListNode' in return_type:
+        if loaded and (return_type.is_list_node or return_type.is_tree_node):
+            assertion, delete = (('ASSERT_LINKED_LISTS_EQ', 'DeleteLinkedList') if return_type.is_list_node
+                                 else ('ASSERT_TREES_EQ', 'DeleteTree'))
+            code_lines.append(f'    {return_type} expected{case_num} = {loaded};')
+            code_lines.append(f'    auto result{case_num} = {call};')
+            code_lines.append(f'    {assertion}(result{case_num}, expected{case_num});')
+            code_lines.append(f'    TestHelpers::{delete}(expected{case_num});')
+            code_lines.append(f'    TestHelpers::{delete}(result{case_num});')
+        elif return_type.is_list_node:
             TestCaseParser._generate_list_assertion(expected_val, case_num, call, code_lines)
-        elif 'TreeNode' in return_type:
+        elif return_type.is_tree_node:
             TestCaseParser._generate_tree_assertion(expected_val, case_num, call, code_lines)
-        elif return_type in ['int', 'bool', 'double', 'float', 'char']:
+        elif return_type.is_scalar:
             code_lines.append(f'    ASSERT_EQ({call}, {expected_val});')
         else:
             # Complex types like vectors
-            norm_type = CppTypeConverter.normalize_cpp_type(return_type)
-            code_lines.append(f'    {norm_type} expected{case_num} = {expected_val};')
+            code_lines.append(f'    {return_type} expected{case_num} = {expected_val};')
             
             # Add comment for unordered comparisons
-            if 'vector' in return_type and topics and any(t in ['Hash Table', 'Set'] for t in topics):
+            if return_type.is_vector and topics and any(t in ['Hash Table', 'Set'] for t in topics):
                 code_lines.append(f'    // Note: If order doesn\'t matter, use ASSERT_UNORDERED_EQ instead')
             
             code_lines.append(f'    ASSERT_EQ({call}, expected{case_num});')
     
+    @staticmethod
+    def _load_from_data(value: str, cpp_type: CppType, data: Optional[TestDataWriter]) -> Optional[str]:
+        """An expression loading a value from the data file, or None if it stays a literal"""
+        index = data.add(value, cpp_type) if data is not None else None
+        if index is None:
+            return None
+        if cpp_type.is_list_node:
+            return f'TestHelpers::CreateLinkedList(testData.Get<std::vector<int>>({index}))'
+        if cpp_type.is_tree_node:
+            return f'TestHelpers::CreateBinaryTree(testData.Get<std::vector<int>>({index}))'
+        return f'testData.Get<{cpp_type.value_type()}>({index})'
+    
     @staticmethod
     def _generate_list_assertion(expected_val: str, case_num: int, call: str, code_lines: List[str]):
         """Generate assertion for linked list return type"""
@@ -273,11 +335,212 @@ class TestCaseParser:
     def _generate_cleanup(test: Dict, code_lines: List[str]):
         """Generate cleanup code for allocated resources"""
         for input_data in test['inputs']:
-            if 'ListNode' in input_data['type']:
+            cpp_type = CppType.of(input_data.get('cpp_type') or input_data['type'])
+            if cpp_type.is_list_node:
                 code_lines.append(f'    TestHelpers::DeleteLinkedList({input_data["var_name"]});')
-            elif 'TreeNode' in input_data['type']:
+            elif cpp_type.is_tree_node:
                 code_lines.append(f'    TestHelpers::DeleteTree({input_data["var_name"]});')
     
+    @staticmethod
+    def _table_storage(cpp_type: CppType) -> Optional[str]:
+        """
+        The type a table row stores a value as, or None if it can't be stored
+        
+        Rows only hold literal types (std::initializer_list, const char* and
+        scalars), so the whole table is constant data that costs the compiler
+        next to nothing per row. TestRunner::Load builds the real argument.
+        """
+        if cpp_type.is_list_node or cpp_type.is_tree_node:
+            return 'std::initializer_list<int>'
+        if cpp_type.is_pointer:
+            return None
+        if cpp_type.is_vector and cpp_type.args:
+            element = TestCaseParser._table_storage(cpp_type.args[0])
+            return f'std::initializer_list<{element}>' if element else None
+        if cpp_type.is_string:
+            return 'const char*'
+        value_type = cpp_type.value_type()
+        return str(value_type) if value_type.is_scalar else None
+    
+    @staticmethod
+    def _supports_table(test_cases: List[Dict], sig_data: Dict) -> bool:
+        """True if every parameter and the result can be stored in a row and every example has a readable output"""
+        return_type = CppType.of(sig_data.get('return_cpp_type') or sig_data['return_type'])
+        types = [return_type] + [CppType.of(p.get('cpp_type') or p['type']) for p in sig_data['params']]
+        if return_type.is_a('void') or not all(TestCaseParser._table_storage(t) for t in types):
+            return False
+        if not all(test.get('expected') and len(test['inputs']) == len(sig_data['params'])
+                   for test in test_cases):
+            return False
+        # A list or tree that can't be read would become an empty row, which
+        # a stub returning nullptr passes
+        params = types[1:]
+        return all(TestCaseParser._table_value(test['expected'], return_type) is not None and
+                   all(TestCaseParser._table_value(inp['value'], cpp_type) is not None
+                       for inp, cpp_type in zip(test['inputs'], params))
+                   for test in test_cases)
+    
+    @staticmethod
+    def _table_value(value: str, cpp_type: CppType) -> Optional[str]:
+        """
+        A value as a row initializer; lists and trees are stored as their level-order values
+        
+        Lists and trees may be written [1,2] (as in the statement) or {1,2}
+        (as example_extractor.format_output leaves expected outputs). None if
+        a list or tree is in neither form.
+        """
+        value = value.strip()
+        if cpp_type.is_list_node or cpp_type.is_tree_node:
+            if len(value) < 2 or value[0] + value[-1] not in ('[]', '{}'):
+                return None
+            values = value[1:-1]
+            if cpp_type.is_tree_node:
+                values = values.replace('null', 'INT_MIN')
+            return f'{{{values}}}'
+        if cpp_type.contains('char'):
+            # LeetCode writes characters as one-letter strings ("a", ["1","0"])
+            value = re.sub(r'"(\\?[^"\\])"', r"'\1'", value)
+        return value
+    
+    @staticmethod
+    def _generate_table(test_cases: List[Dict], sig_data: Dict) -> str:
+        """Generate a Case struct, a constant table with one row per example and a single RunCases loop"""
+        return_type = CppType.of(sig_data.get('return_cpp_type') or sig_data['return_type'])
+        params = [(p['name'], CppType.of(p.get('cpp_type') or p['type'])) for p in sig_data['params']]
+        
+        # RunCases compares against the 'expected' member, and the call's locals
+        # must not shadow the lambda's own names
+        fields = [name if name != 'expected' else 'expected_' for name, _ in params]
+        locals_ = [name if name not in ('test', 'solution', 'result', 'values') else f'{name}_'
+                   for name, _ in params]
+        
+        code_lines = ['    struct Case', '    {']
+        for field, (_, cpp_type) in zip(fields, params):
+            code_lines.append(f'        {TestCaseParser._table_storage(cpp_type)} {field};')
+        code_lines.append(f'        {TestCaseParser._table_storage(return_type)} expected;')
+        code_lines.append('    };')
+        code_lines.append('')
+        
+        code_lines.append('    // One row per example: arguments in order, then the expected result')
+        code_lines.append(f'    static const std::array<Case, {len(test_cases)}> cases = {{{{')
+        for test in test_cases:
+            row = [TestCaseParser._table_value(inp['value'], cpp_type)
+                   for inp, (_, cpp_type) in zip(test['inputs'], params)]
+            row.append(TestCaseParser._table_value(test['expected'], return_type))
+            code_lines.append(f'        {{{", ".join(row)}}},')
+        code_lines.append('    }};')
+        code_lines.append('')
+        
+        # Everything but by-value scalars becomes a local, since solutions take
+        # their arguments by non-const reference
+        sources = [(f'test.{field}', cpp_type.is_scalar or cpp_type.is_list_node or cpp_type.is_tree_node)
+                   for field, (_, cpp_type) in zip(fields, params)]
+        body = TestCaseParser._call_body(sig_data, sources, locals_)
+        
+        expression = f"{sig_data['method_name']}({', '.join(name for name, _ in params)})"
+        code_lines.append('    TestRunner::RunCases(cases, [&solution](const Case& test)')
+        code_lines.append('    {')
+        code_lines.extend(f'        {line}' for line in body)
+        code_lines.append(f'    }}, "{expression}", __LINE__);')
+        # template.h already indents the first line
+        return '\n'.join(code_lines).lstrip()
+    
+    @staticmethod
+    def _call_body(sig_data: Dict, sources: List[tuple], locals_: List[str]) -> List[str]:
+        """
+        Statements that call the solution with the given arguments and return its result
+        
+        sources holds (expression, direct) per parameter. Lists and trees are
+        built from their level-order values for the call, direct arguments are
+        passed as they are and the rest are converted with TestRunner::Load
+        into locals first. ListNode/TreeNode results are returned as level-order
+        values and freed, along with the inputs they can't share nodes with.
+        """
+        return_type = CppType.of(sig_data.get('return_cpp_type') or sig_data['return_type'])
+        params = [CppType.of(p.get('cpp_type') or p['type']) for p in sig_data['params']]
+        
+        body = []
+        arguments = []
+        owned = []
+        for (source, direct), local, cpp_type in zip(sources, locals_, params):
+            if cpp_type.is_list_node:
+                body.append(f'ListNode* {local} = TestHelpers::CreateLinkedList({source});')
+                owned.append((cpp_type, f'TestHelpers::DeleteLinkedList({local});'))
+            elif cpp_type.is_tree_node:
+                body.append(f'TreeNode* {local} = TestHelpers::CreateBinaryTree({source});')
+                owned.append((cpp_type, f'TestHelpers::DeleteTree({local});'))
+            elif direct:
+                arguments.append(source)
+                continue
+            else:
+                body.append(f'auto {local} = TestRunner::Load<{cpp_type.value_type()}>({source});')
+            arguments.append(local)
+        call = f"solution.{sig_data['method_name']}({', '.join(arguments)})"
+        
+        if return_type.is_list_node or return_type.is_tree_node:
+            to_vector = 'LinkedListToVector' if return_type.is_list_node else 'TreeToVector'
+            delete = 'DeleteLinkedList' if return_type.is_list_node else 'DeleteTree'
+            body.append(f'{return_type} result = {call};')
+            body.append(f'std::vector<int> values = TestHelpers::{to_vector}(result);')
+            body.append(f'TestHelpers::{delete}(result);')
+            # The result may reuse the input's nodes, so only other inputs are freed
+            body.extend(line for cpp_type, line in owned if cpp_type.base != return_type.base)
+            body.append('return values;')
+        elif return_type.is_a('void'):
+            body.append(f'{call};')
+            body.extend(line for _, line in owned)
+        elif owned:
+            body.append(f'auto result = {call};')
+            body.extend(line for _, line in owned)
+            body.append('return result;')
+        else:
+            body.append(f'return {call};')
+        return body
+    
+    @staticmethod
+    def generate_scaling_code(sig_data: Dict, problem_number: int) -> str:
+        """
+        Generate ScaleProblemN, which times the solution on every input size in
+        src/Problems/Data/N.scale.bin (see stress_inputs.py), or '' if the
+        arguments can't be stored in a data file
+        
+        Each record of the file is n followed by the arguments. The arguments
+        are loaded once per size and copied for every call outside the timing.
+        Lists and trees are rebuilt inside it, so those calls include O(n) setup.
+        """
+        params = [(p['name'], CppType.of(p.get('cpp_type') or p['type'])) for p in sig_data['params']]
+        if not params or not all(storage_layout(cpp_type) for _, cpp_type in params):
+            return ''
+        
+        stored = [('std::vector<int>' if cpp_type.is_list_node or cpp_type.is_tree_node
+                   else str(cpp_type.value_type())) for _, cpp_type in params]
+        locals_ = [name if name not in ('args', 'solution', 'result', 'values', 'run', 'data', 'input', 'record')
+                   else f'{name}_' for name, _ in params]
+        sources = [(f'std::get<{i}>(args)', True) for i in range(len(params))]
+        body = TestCaseParser._call_body(sig_data, sources, locals_)
+        record_size = len(params) + 1
+        loads = ', '.join(f'data.Get<{t}>(record + {i + 1})' for i, t in enumerate(stored))
+        
+        code_lines = [
+            f'// Times the solution at growing input sizes (`lpp scale {problem_number}` writes the inputs)',
+            f'void ScaleProblem{problem_number}(ScalingRun& run)',
+            '{',
+            f'    Solution{problem_number} solution;',
+            f'    TestHelpers::TestData data(__FILE__, "{problem_number}.scale.bin");',
+            f'    for (size_t record = 0; record + {record_size} <= data.Count(); record += {record_size})',
+            '    {',
+            f'        std::tuple<{", ".join(stored)}> input{{{loads}}};',
+            '        run.Measure(data.Get<long long>(record), [&]() { return input; }, [&](auto& args)',
+            '        {',
+        ]
+        code_lines.extend(f'            {line}' for line in body)
+        code_lines.append('        });')
+        code_lines.append('    }')
+        code_lines.append('}')
+        code_lines.append('')
+        code_lines.append(f'REGISTER_SCALING({problem_number}, ScaleProblem{problem_number});')
+        return '\n'.join(code_lines)
+    
     @staticmethod
     def _generate_default_test_comment(sig_data: Dict) -> str:
         """Generate default test case comments when no data available"""
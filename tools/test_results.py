@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test results for LeetPlusPlus
+Reads the JSON records the binary prints with --format json
+
+The binary prints one JSON object per line: an "assertion" record for every
+check, a "problem" record after each problem and a "summary" record at the
+end (see src/Base/TestReport.h).
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from common import ColorPrinter, Fore, Style
+
+
+@dataclass
+class ProblemResult:
+    number: int
+    name: str
+    passed: int
+    total: int
+    duration_ns: int
+    error: Optional[str] = None
+    failures: List[Dict] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and self.passed == self.total
+
+
+def read_results(lines: Iterable[str]) -> List[ProblemResult]:
+    """
+    The problems in a stream of records, with their failed assertions
+
+    Raises ValueError on a line that isn't a JSON record: the binary keeps
+    solution output off stdout, so anything else there means the stream is
+    corrupt and records may be missing.
+    """
+    results = []
+    failures = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        if not isinstance(record, dict) or 'type' not in record:
+            raise ValueError(f"Line {number} of the test output isn't a JSON record: {line[:80]}")
+        if record['type'] == 'assertion' and not record['passed']:
+            failures.append(record)
+        elif record['type'] == 'problem':
+            results.append(ProblemResult(record['problem'], record['name'], record['passed'], record['total'],
+                                         record['durationNs'], record.get('error'), failures))
+            failures = []
+    return results
+
+
+def _format_ns(ns: float) -> str:
+    for unit, size in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if ns >= size:
+            return f"{ns / size:.1f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def print_results(results: List[ProblemResult]):
+    """One line per problem, the details of every failure, then the totals"""
+    for result in results:
+        counts = f"{result.passed}/{result.total}"
+        line = f"#{result.number} {result.name}  {counts}  ({_format_ns(result.duration_ns)})"
+        if result.succeeded:
+            ColorPrinter.success(line)
+            continue
+        ColorPrinter.error(line)
+        if result.error:
+            print(f"    threw: {result.error}")
+        for failure in result.failures:
+            where = f"Line {failure['line']}" if failure['line'] else "Assertion"
+            case = f" [{failure['case']}]" if failure['case'] else ""
+            print(f"    {where}{case}: {failure['expression']}")
+            if failure.get('expected') or failure.get('actual'):
+                print(f"      {Fore.GREEN}Expected: {failure['expected']}{Style.RESET_ALL}")
+                print(f"      {Fore.RED}Actual:   {failure['actual']}{Style.RESET_ALL}")
+
+    passed = sum(r.passed for r in results)
+    total = sum(r.total for r in results)
+    failed = [r for r in results if not r.succeeded]
+    print()
+    summary = f"{passed}/{total} tests passed in {len(results)} problems"
+    if failed:
+        ColorPrinter.error(f"{summary}; failed: {', '.join(f'#{r.number}' for r in failed)}")
+    else:
+        ColorPrinter.success(summary)